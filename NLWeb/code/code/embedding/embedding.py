@@ -13,6 +13,7 @@ import asyncio
 import threading
 
 from config.config import CONFIG
+from embedding.embedding_cache import get_embedding_cache
 from utils.logging_config_helper import get_configured_logger, LogLevel
 
 logger = get_configured_logger("embedding_wrapper")
@@ -68,6 +69,23 @@ async def get_embedding(
     
     logger.debug(f"Using embedding model: {model_id}")
 
+    cache = get_embedding_cache()
+    if cache.enabled:
+        return await cache.get_or_compute(
+            provider, model_id, text,
+            lambda: _compute_embedding(text, provider, model_id, timeout)
+        )
+    return await _compute_embedding(text, provider, model_id, timeout)
+
+async def _compute_embedding(
+    text: str,
+    provider: str,
+    model_id: str,
+    timeout: int
+) -> List[float]:
+    """
+    Call the embedding provider directly, bypassing the cache.
+    """
     try:
         # Use a timeout wrapper for all embedding calls
         if provider == "openai":
@@ -0,0 +1,397 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""
+Cache for query embeddings.
+
+Embeddings are keyed by (provider, model, normalized text) and kept in a
+bounded in-memory LRU. An optional on-disk tier stores vectors in an
+append-only float32 file that is read through mmap, so cached embeddings
+survive restarts. Concurrent requests for the same key share a single
+in-flight provider call.
+
+Several processes may share the disk tier: appends are serialized with an
+exclusive flock on the vector file, and entries appended by other processes
+are picked up from the index file on a miss. Disk writes from async callers
+run on a background thread so they never block the event loop.
+
+Configuration (environment variables):
+    NLWEB_EMBEDDING_CACHE_SIZE: max in-memory entries (default 10000, 0 disables the cache)
+    NLWEB_EMBEDDING_CACHE_DIR: directory for the on-disk tier (unset disables it)
+    NLWEB_EMBEDDING_CACHE_DISK_MAX_MB: size of the vector file per model after which
+        no new vectors are written to disk (default 1024, 0 for no limit)
+    NLWEB_EMBEDDING_CACHE_PER_WORKER: give each pre-fork worker its own disk directory,
+        for filesystems where flock is not honored, e.g. some network mounts (default 0)
+
+WARNING: This code is under development and may undergo changes in future releases.
+Backwards compatibility is not guaranteed at this time.
+"""
+
+import array
+import asyncio
+import hashlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, and no pre-fork workers sharing the directory either
+    fcntl = None
+
+from utils.logging_config_helper import get_configured_logger, LogLevel
+
+logger = get_configured_logger("embedding_cache")
+
+DEFAULT_CACHE_SIZE = 10000
+DEFAULT_DISK_MAX_MB = 1024
+
+CacheKey = Tuple[str, str, str]
+
+
+def normalize_text(text: str) -> str:
+    """Collapse runs of whitespace so trivially different queries share an entry."""
+    return " ".join(text.split())
+
+
+class _DiskTier:
+    """
+    Append-only on-disk store for one (provider, model) pair.
+
+    Vectors are written as raw float32 to a .vec file and located through an
+    index file of "<key hash>\\t<offset>\\t<dimension>" lines. Reads go through
+    an mmap of the .vec file, which is remapped when the file has grown.
+
+    Args:
+        directory: Directory holding the files
+        provider: Embedding provider name
+        model: Embedding model name
+        max_bytes: Size of the .vec file after which nothing more is appended (0 for no limit)
+    """
+
+    def __init__(self, directory: str, provider: str, model: str, max_bytes: int = 0):
+        name = hashlib.sha1(f"{provider}|{model}".encode("utf-8")).hexdigest()[:16]
+        self.vec_path = os.path.join(directory, f"{name}.vec")
+        self.idx_path = os.path.join(directory, f"{name}.idx")
+        self.max_bytes = max_bytes
+        self.full = False
+        self._lock = threading.Lock()
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._index_pos = 0
+        self._mmap: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+        self._load_index()
+
+    def _load_index(self):
+        """Read index lines appended since the last call, by this or another process."""
+        try:
+            if os.path.getsize(self.idx_path) <= self._index_pos:
+                return
+        except OSError:
+            return
+        vec_size = os.path.getsize(self.vec_path) if os.path.exists(self.vec_path) else 0
+        with open(self.idx_path, "rb") as f:
+            f.seek(self._index_pos)
+            data = f.read()
+        # Only consume complete lines; a partial last line is read again next time
+        complete = data.rfind(b"\n") + 1
+        for line in data[:complete].decode("utf-8", errors="replace").splitlines():
+            parts = line.split("\t")
+            if len(parts) != 3:
+                continue
+            try:
+                key_hash, offset, dim = parts[0], int(parts[1]), int(parts[2])
+            except ValueError:
+                continue
+            # Skip entries whose vector bytes never made it to disk
+            if offset + dim * 4 <= vec_size:
+                self._index.setdefault(key_hash, (offset, dim))
+        self._index_pos += complete
+
+    def _ensure_mapped(self, end: int) -> bool:
+        if self._mmap is not None and end <= self._mapped_size:
+            return True
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        size = os.path.getsize(self.vec_path)
+        if size == 0 or end > size:
+            return False
+        with open(self.vec_path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapped_size = size
+        return True
+
+    def get(self, key_hash: str) -> Optional[List[float]]:
+        with self._lock:
+            entry = self._index.get(key_hash)
+            if entry is None:
+                self._load_index()
+                entry = self._index.get(key_hash)
+            if entry is None:
+                return None
+            offset, dim = entry
+            end = offset + dim * 4
+            if not self._ensure_mapped(end):
+                return None
+            values = array.array("f")
+            values.frombytes(self._mmap[offset:end])
+        return values.tolist()
+
+    def put(self, key_hash: str, embedding: List[float]):
+        data = array.array("f", embedding).tobytes()
+        with self._lock:
+            if key_hash in self._index or self.full:
+                return
+            with open(self.vec_path, "ab") as vec:
+                # The lock serializes appends between processes sharing the
+                # directory, so the offset read here is where our bytes land
+                if fcntl is not None:
+                    fcntl.flock(vec.fileno(), fcntl.LOCK_EX)
+                try:
+                    offset = os.fstat(vec.fileno()).st_size
+                    if self.max_bytes and offset + len(data) > self.max_bytes:
+                        self.full = True
+                        logger.warning(f"Embedding disk cache {self.vec_path} reached its size limit, "
+                                       f"new embeddings are only cached in memory")
+                        return
+                    # Write the vector before its index line so a crash never leaves
+                    # an index entry pointing at missing bytes
+                    vec.write(data)
+                    vec.flush()
+                    with open(self.idx_path, "a", encoding="utf-8") as idx:
+                        idx.write(f"{key_hash}\t{offset}\t{len(embedding)}\n")
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(vec.fileno(), fcntl.LOCK_UN)
+            self._index[key_hash] = (offset, len(embedding))
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+class EmbeddingCache:
+    """
+    LRU cache of embeddings with an optional disk tier and single-flight
+    deduplication of concurrent misses.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE, disk_dir: Optional[str] = None,
+                 disk_max_bytes: int = DEFAULT_DISK_MAX_MB * 1024 * 1024):
+        self.max_size = max_size
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._disk_writer: Optional[ThreadPoolExecutor] = None
+        self._entries: "OrderedDict[CacheKey, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_tiers: Dict[Tuple[str, str], _DiskTier] = {}
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.inflight_waits = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def _disk_tier(self, provider: str, model: str) -> Optional[_DiskTier]:
+        if not self.disk_dir:
+            return None
+        with self._lock:
+            tier = self._disk_tiers.get((provider, model))
+            if tier is None:
+                tier = _DiskTier(self.disk_dir, provider, model, self.disk_max_bytes)
+                self._disk_tiers[(provider, model)] = tier
+            return tier
+
+    @staticmethod
+    def _hash_text(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _remember(self, key: CacheKey, embedding: List[float]):
+        with self._lock:
+            self._entries[key] = embedding
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, provider: str, model: str, text: str) -> Optional[List[float]]:
+        """Look up an embedding in memory, then on disk. Returns None on a miss."""
+        key = (provider, model, normalize_text(text))
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(embedding)
+
+        tier = self._disk_tier(provider, model)
+        if tier is not None:
+            try:
+                embedding = tier.get(self._hash_text(key[2]))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Embedding disk cache read failed: {e}")
+                embedding = None
+            if embedding is not None:
+                self._remember(key, embedding)
+                with self._lock:
+                    self.disk_hits += 1
+                return list(embedding)
+        return None
+
+    def put(self, provider: str, model: str, text: str, embedding: List[float], background: bool = False):
+        """
+        Store an embedding in memory and, if configured, on disk.
+
+        Args:
+            background: Write to disk on the cache's writer thread instead of blocking the caller
+        """
+        key = (provider, model, normalize_text(text))
+        self._remember(key, list(embedding))
+        tier = self._disk_tier(provider, model)
+        if tier is None:
+            return
+        if background:
+            with self._lock:
+                if self._disk_writer is None:
+                    # One thread keeps appends ordered and off the event loop
+                    self._disk_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nlweb-embedding-cache")
+                writer = self._disk_writer
+            writer.submit(self._write_to_disk, tier, self._hash_text(key[2]), list(embedding))
+        else:
+            self._write_to_disk(tier, self._hash_text(key[2]), embedding)
+
+    @staticmethod
+    def _write_to_disk(tier: _DiskTier, key_hash: str, embedding: List[float]):
+        try:
+            tier.put(key_hash, embedding)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Embedding disk cache write failed: {e}")
+
+    def flush(self):
+        """Wait for background disk writes queued so far to finish."""
+        with self._lock:
+            writer = self._disk_writer
+        if writer is not None:
+            writer.submit(lambda: None).result()
+
+    async def get_or_compute(self, provider: str, model: str, text: str,
+                             compute: Callable[[], Awaitable[List[float]]]) -> List[float]:
+        """
+        Return the cached embedding or compute it, sharing one in-flight call
+        between concurrent requests for the same key.
+        """
+        cached = self.get(provider, model, text)
+        if cached is not None:
+            return cached
+
+        key = (provider, model, normalize_text(text))
+        loop = asyncio.get_running_loop()
+        future = self._inflight.get(key)
+        if future is not None and future.get_loop() is loop:
+            with self._lock:
+                self.inflight_waits += 1
+            try:
+                return list(await asyncio.shield(future))
+            except asyncio.CancelledError:
+                # The leading call was cancelled, not us; compute on our own
+                if not future.cancelled():
+                    raise
+
+        with self._lock:
+            self.misses += 1
+        future = loop.create_future()
+        self._inflight[key] = future
+        try:
+            embedding = await compute()
+        except BaseException as e:
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark retrieved so an exception nobody waited on is not logged
+                future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        # Release waiters before caching so a failure while storing can't leave them hanging
+        future.set_result(embedding)
+        try:
+            self.put(provider, model, text, embedding, background=True)
+        except Exception as e:
+            logger.warning(f"Failed to cache embedding: {e}")
+        return embedding
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current sizes."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "inflight_waits": self.inflight_waits,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "disk_entries": sum(len(t) for t in self._disk_tiers.values()),
+            }
+
+    def clear(self):
+        """Drop all in-memory entries. The disk tier is left untouched."""
+        with self._lock:
+            self._entries.clear()
+
+
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def use_worker_disk_dir(worker_number: int):
+    """
+    Prepare the disk tier for a pre-fork worker, before the cache is first used.
+
+    Workers share NLWEB_EMBEDDING_CACHE_DIR when appends can be locked. Without
+    flock, or when NLWEB_EMBEDDING_CACHE_PER_WORKER is set, each worker gets its
+    own subdirectory instead, named by worker number so it is reused after restarts.
+
+    Args:
+        worker_number: Index of the worker process
+    """
+    disk_dir = os.getenv("NLWEB_EMBEDDING_CACHE_DIR")
+    if not disk_dir:
+        return
+    per_worker = os.getenv("NLWEB_EMBEDDING_CACHE_PER_WORKER", "0").strip().lower() in ("1", "true", "yes", "on")
+    if fcntl is None or per_worker:
+        os.environ["NLWEB_EMBEDDING_CACHE_DIR"] = os.path.join(disk_dir, f"worker-{worker_number}")
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    """Return the process-wide embedding cache, creating it from the environment on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    max_size = int(os.getenv("NLWEB_EMBEDDING_CACHE_SIZE", DEFAULT_CACHE_SIZE))
+                except ValueError:
+                    max_size = DEFAULT_CACHE_SIZE
+                disk_dir = os.getenv("NLWEB_EMBEDDING_CACHE_DIR") or None
+                try:
+                    disk_max_mb = float(os.getenv("NLWEB_EMBEDDING_CACHE_DISK_MAX_MB", DEFAULT_DISK_MAX_MB))
+                except ValueError:
+                    disk_max_mb = DEFAULT_DISK_MAX_MB
+                _cache = EmbeddingCache(max_size=max_size, disk_dir=disk_dir,
+                                        disk_max_bytes=int(max(0, disk_max_mb) * 1024 * 1024))
+                logger.log_with_context(
+                    LogLevel.INFO,
+                    "Embedding cache initialized",
+                    {"max_size": max_size, "disk_dir": disk_dir}
+                )
+    return _cache
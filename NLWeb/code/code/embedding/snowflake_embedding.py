@@ -14,7 +14,6 @@ Backwards compatibility is not guaranteed at this time.
 """
 
 import logging
-import httpx
 from typing import List
 
 from config.config import CONFIG
@@ -29,21 +28,28 @@ async def cortex_embed(text: str, model: str|None = None) -> List[float]:
 
     See: https://docs.snowflake.com/en/user-guide/snowflake-cortex/cortex-llm-rest-api#label-cortex-llm-embed-function
     """
+    return (await get_snowflake_batch_embeddings([text], model=model))[0]
+
+
+async def get_snowflake_batch_embeddings(texts: List[str], model: str|None = None) -> List[List[float]]:
+    """
+    Embed several texts with one snowflake.cortex.embed request.
+
+    Returns:
+        One embedding per text, in input order
+    """
     cfg = CONFIG.get_embedding_provider("snowflake")
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            snowflake.get_account_url(cfg) + "/api/v2/cortex/inference:embed",
-            json={
-                "text": [text], 
-                "model": model or "snowflake-arctic-embed-m-v1.5"
-            },
-            headers={
-                    "Authorization": f"Bearer {snowflake.get_pat(cfg)}",
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-            },
-        )
-        if response.status_code == 400:
-            raise Exception(response.json())
-        response.raise_for_status()
-        return response.json().get("data")[0].get("embedding")[0]
+    client = snowflake.get_http_client(cfg)
+    response = await client.post(
+        snowflake.get_account_url(cfg) + "/api/v2/cortex/inference:embed",
+        json={
+            "text": texts, 
+            "model": model or "snowflake-arctic-embed-m-v1.5"
+        },
+        headers=snowflake.get_headers(cfg),
+    )
+    if response.status_code == 400:
+        raise Exception(response.json())
+    response.raise_for_status()
+    data = sorted(response.json().get("data"), key=lambda item: item.get("index", 0))
+    return [item.get("embedding")[0] for item in data]
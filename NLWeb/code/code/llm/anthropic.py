@@ -20,6 +20,7 @@ from config.config import CONFIG
 import threading
 
 from llm.llm_provider import LLMProvider
+from utils import fast_json
 
 logger = logging.getLogger(__name__)
 
@@ -85,7 +86,7 @@ class AnthropicProvider(LLMProvider):
         if not match:
             logger.error("Failed to parse JSON from content: %r", content)
             raise ValueError("No JSON object found in response")
-        return json.loads(match.group(1))
+        return fast_json.loads(match.group(1))
 
     async def get_completion(
         self,
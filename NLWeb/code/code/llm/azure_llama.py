@@ -19,6 +19,7 @@ import re
 from typing import Dict, Any, Optional
 
 from llm.llm_provider import LLMProvider
+from utils import fast_json
 from utils.logging_config_helper import get_configured_logger
 logger = get_configured_logger("llama_azure")
 
@@ -115,7 +116,7 @@ class LlamaAzureProvider(LLMProvider):
         json_str = response_text[start_idx:end_idx]
         
         try:
-            result = json.loads(json_str)
+            result = fast_json.loads(json_str)
             logger.debug("Successfully parsed JSON response")
             return result
         except json.JSONDecodeError as e:
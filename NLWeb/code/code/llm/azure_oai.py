@@ -16,6 +16,7 @@ import threading
 from typing import Dict, Any, Optional
 
 from llm.llm_provider import LLMProvider
+from utils import fast_json
 from utils.logging_config_helper import get_configured_logger, LogLevel
 logger = get_configured_logger("azure_oai")
 
@@ -141,7 +142,7 @@ class AzureOpenAIProvider(LLMProvider):
         json_str = response_text[start_idx:end_idx]
                 
         try:
-            result = json.loads(json_str)
+            result = fast_json.loads(json_str)
             return result
         except json.JSONDecodeError as e:
             error_msg = f"Failed to parse response as JSON: {e}"
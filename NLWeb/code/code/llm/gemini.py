@@ -21,6 +21,7 @@ from config.config import CONFIG
 import threading
 
 from llm.llm_provider import LLMProvider
+from utils import fast_json
 from utils.logging_config_helper import get_configured_logger, LogLevel
 logger = get_configured_logger("gemini")
 
@@ -105,7 +106,7 @@ class GeminiProvider(LLMProvider):
         json_str = response_text[start_idx:end_idx]
                 
         try:
-            result = json.loads(json_str)
+            result = fast_json.loads(json_str)
 
             # check if the value is a integer number, convert it to int
             for key, value in result.items():
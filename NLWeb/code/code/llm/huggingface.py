@@ -19,6 +19,7 @@ from utils.logging_config_helper import get_configured_logger
 
 from huggingface_hub import AsyncInferenceClient
 from llm.llm_provider import LLMProvider
+from utils import fast_json
 
 
 logger = get_configured_logger("llm")
@@ -82,7 +83,7 @@ class HuggingFaceProvider(LLMProvider):
         if not match:
             logger.error("Failed to parse JSON from content: %r", content)
             raise ValueError("No JSON object found in response")
-        return json.loads(match.group(1))
+        return fast_json.loads(match.group(1))
 
     async def get_completion(
         self,
@@ -18,6 +18,7 @@ import threading
 from typing import Dict, Any, Optional
 
 from llm.llm_provider import LLMProvider
+from utils import fast_json
 
 
 class ConfigurationError(RuntimeError):
@@ -60,7 +61,7 @@ class InceptionProvider(LLMProvider):
         match = re.search(r"(\{.*\})", cleaned, re.S)
         if not match:
             return {}
-        return json.loads(match.group(1))
+        return fast_json.loads(match.group(1))
 
     async def get_completion(
         self,
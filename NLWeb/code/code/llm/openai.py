@@ -23,6 +23,7 @@ from utils.logger import LogLevel
 
 
 from llm.llm_provider import LLMProvider
+from utils import fast_json
 
 from utils.logging_config_helper import get_configured_logger, LogLevel
 logger = get_configured_logger("llm")
@@ -89,7 +90,7 @@ class OpenAIProvider(LLMProvider):
         if not match:
             logger.error("Failed to parse JSON from content: %r", content)
             return {}
-        return json.loads(match.group(1))
+        return fast_json.loads(match.group(1))
 
     async def get_completion(
         self,
@@ -16,12 +16,12 @@ Backwards compatibility is not guaranteed at this time.
 import json
 import re
 import logging
-import httpx
 from typing import Dict, Any, List, Optional
 
 from config.config import CONFIG
 from llm.llm_provider import LLMProvider
 from utils import snowflake
+from utils import fast_json
 
 logger = logging.getLogger(__name__)
 
@@ -31,8 +31,8 @@ class SnowflakeProvider(LLMProvider):
 
     @classmethod
     def get_client(cls):
-        """No-op since no persistent client is needed."""
-        return None
+        """Return the pooled HTTP client shared with the other Snowflake integrations."""
+        return snowflake.get_http_client(CONFIG.llm_endpoints.get("snowflake"))
 
     @classmethod
     def clean_response(cls, content: str) -> Dict[str, Any]:
@@ -44,7 +44,7 @@ class SnowflakeProvider(LLMProvider):
         if not match:
             logger.error("Failed to parse JSON from content: %r", content)
             return {}
-        return json.loads(match.group(1))
+        return fast_json.loads(match.group(1))
 
     async def get_completion(
         self,
@@ -124,24 +124,20 @@ async def cortex_complete(
 
 async def post(api: str, request: dict, timeout: float) -> dict:
     cfg = CONFIG.llm_endpoints.get("snowflake")
-    async with httpx.AsyncClient() as client:
-        response =  await client.post(
-            snowflake.get_account_url(cfg) + api,
-            json=request,
-            headers={
-                    "Authorization": f"Bearer {snowflake.get_pat(cfg)}",
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-            },
-            timeout=timeout,
-        )
-        if response.status_code == 400:
-            logger.error(f"Snowflake API error: {response.json()}")
-            return {}
-        try:
-            response.raise_for_status()
-        except Exception as e:
-            logger.error(f"Snowflake API request failed: {e}")
-            return {}
-        return response.json()
+    client = snowflake.get_http_client(cfg)
+    response =  await client.post(
+        snowflake.get_account_url(cfg) + api,
+        json=request,
+        headers=snowflake.get_headers(cfg),
+        timeout=timeout,
+    )
+    if response.status_code == 400:
+        logger.error(f"Snowflake API error: {response.json()}")
+        return {}
+    try:
+        response.raise_for_status()
+    except Exception as e:
+        logger.error(f"Snowflake API request failed: {e}")
+        return {}
+    return response.json()
 
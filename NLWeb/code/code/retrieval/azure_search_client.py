@@ -30,11 +30,35 @@ from azure.search.documents.indexes.models import (
 
 from config.config import CONFIG
 from embedding.embedding import get_embedding
+from retrieval.executor_pool import get_executor
 from utils.logging_config_helper import get_configured_logger
 from utils.logger import LogLevel
 
+# The async SDK client needs aiohttp as its transport
+try:
+    import aiohttp  # noqa: F401
+    from azure.search.documents.aio import SearchClient as AsyncSearchClient
+    _ASYNC_SDK_AVAILABLE = True
+except ImportError:
+    AsyncSearchClient = None
+    _ASYNC_SDK_AVAILABLE = False
+
 logger = get_configured_logger("azure_search_client")
 
+# Maximum number of URLs per lookup query ($top is capped at 1000)
+URL_LOOKUP_BATCH_SIZE = 1000
+# Candidate delimiters for search.in(); the first one no URL contains is used
+_SEARCH_IN_DELIMITERS = ("|", ",", " ", "\t")
+
+
+def _url_filter(urls: List[str]) -> str:
+    """Build an OData filter matching any of the given URLs."""
+    for delimiter in _SEARCH_IN_DELIMITERS:
+        if not any(delimiter in url for url in urls):
+            values = delimiter.join(urls).replace("'", "''")
+            return f"search.in(url, '{values}', '{delimiter}')"
+    return " or ".join("url eq '{}'".format(url.replace("'", "''")) for url in urls)
+
 class AzureSearchClient:
     """
     Client for Azure AI Search operations, providing a unified interface for 
@@ -65,8 +89,14 @@ class AzureSearchClient:
         self.api_endpoint = self.endpoint_config.api_endpoint.strip('"')
         self.api_key = self.endpoint_config.api_key.strip('"')
         self.default_index_name = self.endpoint_config.index_name or "embeddings1536"
+        
+        # Prefer the native async SDK; otherwise run the sync SDK on a dedicated pool
+        # so calls never compete for the event loop's default executor
+        self.use_async_sdk = _ASYNC_SDK_AVAILABLE and getattr(self.endpoint_config, 'use_async_sdk', True) is not False
+        self._async_search_clients = {}  # Cache for async search clients
+        self._executor = get_executor(self.endpoint_name, getattr(self.endpoint_config, 'executor_threads', None))
 
-        logger.info(f"Initialized AzureSearchClient for endpoint: {self.endpoint_name}")
+        logger.info(f"Initialized AzureSearchClient for endpoint: {self.endpoint_name}, async SDK: {self.use_async_sdk}")
     
     def _get_endpoint_config(self):
         """Get the Azure Search endpoint configuration from CONFIG"""
@@ -122,6 +152,90 @@ class AzureSearchClient:
         
         return self._search_clients[index_name]
     
+    def _get_async_search_client(self, index_name: Optional[str] = None) -> "AsyncSearchClient":
+        """
+        Get the async Azure AI Search client for a specific index
+        
+        Args:
+            index_name: Name of the index (defaults to the configured index name)
+            
+        Returns:
+            AsyncSearchClient: The async Azure Search client for the specified index
+        """
+        index_name = index_name or self.default_index_name
+        
+        with self._client_lock:
+            if index_name not in self._async_search_clients:
+                logger.debug(f"Creating async search client for index: {index_name}")
+                credential = AzureKeyCredential(self.api_key)
+                self._async_search_clients[index_name] = AsyncSearchClient(
+                    endpoint=self.api_endpoint,
+                    index_name=index_name,
+                    credential=credential
+                )
+        
+        return self._async_search_clients[index_name]
+    
+    async def _run_search(self, index_name: Optional[str] = None,
+                          **search_options) -> Tuple[List[Dict[str, Any]], Optional[int], Optional[Dict[str, Any]]]:
+        """
+        Run a search and read all result pages without blocking the event loop.
+        
+        Args:
+            index_name: Optional index name (defaults to configured index name)
+            **search_options: Arguments passed to SearchClient.search
+            
+        Returns:
+            Tuple of (result documents, total count if include_total_count was set, facets if requested)
+        """
+        want_count = bool(search_options.get("include_total_count"))
+        want_facets = bool(search_options.get("facets"))
+        
+        if self.use_async_sdk:
+            search_client = self._get_async_search_client(index_name)
+            results = await search_client.search(**search_options)
+            documents = [result async for result in results]
+            count = await results.get_count() if want_count else None
+            facets = await results.get_facets() if want_facets else None
+            return documents, count, facets
+        
+        search_client = self._get_search_client(index_name)
+        
+        def search_sync():
+            # Results are paged lazily, so consume them here rather than on the event loop
+            results = search_client.search(**search_options)
+            documents = list(results)
+            count = results.get_count() if want_count else None
+            facets = results.get_facets() if want_facets else None
+            return documents, count, facets
+        
+        return await self._executor.run(search_sync)
+    
+    async def _run_document_action(self, action: str, documents: List[Dict[str, Any]],
+                                   index_name: Optional[str] = None):
+        """
+        Upload or delete a batch of documents without blocking the event loop.
+        
+        Args:
+            action: Name of the SearchClient method, "upload_documents" or "delete_documents"
+            documents: Documents (or {"id": ...} keys for deletes)
+            index_name: Optional index name (defaults to configured index name)
+        """
+        if self.use_async_sdk:
+            search_client = self._get_async_search_client(index_name)
+            return await getattr(search_client, action)(documents=documents)
+        
+        search_client = self._get_search_client(index_name)
+        return await self._executor.run(getattr(search_client, action), documents=documents)
+    
+    async def close(self):
+        """Close cached async search clients and their HTTP sessions."""
+        with self._client_lock:
+            clients = list(self._async_search_clients.values())
+            self._async_search_clients.clear()
+        for client in clients:
+            await client.close()
+    
     def _create_vector_search_config(self, algorithm_name: str = "hnsw_config", 
                                    profile_name: str = "vector_config") -> VectorSearch:
         """Create and return a vector search configuration"""
@@ -281,24 +395,18 @@ class AzureSearchClient:
         index_name = index_name or self.default_index_name
         
         # Ensure the index exists
-        self.ensure_index_exists(index_name)
-        
-        # Get a search client for the index
-        search_client = self._get_search_client(index_name)
+        await self._executor.run(self.ensure_index_exists, index_name)
         
         try:
             # Find all documents with the specified site value
             filter_expression = f"site eq '{site_value}'"
             
-            # Execute the search asynchronously
-            def search_sync():
-                return search_client.search("*", filter=filter_expression, 
-                                           select="id", include_total_count=True)
-            
-            search_results = await asyncio.get_event_loop().run_in_executor(None, search_sync)
+            search_results, total_matching, _ = await self._run_search(
+                index_name, search_text="*", filter=filter_expression,
+                select="id", include_total_count=True
+            )
             
             # Get the total count of matching documents
-            total_matching = search_results.get_count()
             logger.info(f"Found {total_matching} documents in '{index_name}' with site = '{site_value}'")
             
             # If there are matching documents, delete them
@@ -315,11 +423,7 @@ class AzureSearchClient:
                 for i in range(0, len(doc_ids_to_delete), batch_size):
                     batch = doc_ids_to_delete[i:i+batch_size]
                     
-                    # Execute delete asynchronously
-                    def delete_sync():
-                        return search_client.delete_documents(batch)
-                    
-                    await asyncio.get_event_loop().run_in_executor(None, delete_sync)
+                    await self._run_document_action("delete_documents", batch, index_name)
                     deleted_count += len(batch)
                     logger.info(f"Deleted batch of {len(batch)} documents")
                 
@@ -364,17 +468,10 @@ class AzureSearchClient:
             embedding_size = 1536  # Default
         
         # Ensure the index exists
-        self.ensure_index_exists(index_name, embedding_size)
-        
-        # Get a search client for the index
-        search_client = self._get_search_client(index_name)
+        await self._executor.run(self.ensure_index_exists, index_name, embedding_size)
         
         try:
-            # Upload the documents asynchronously
-            def upload_sync():
-                return search_client.upload_documents(documents)
-            
-            await asyncio.get_event_loop().run_in_executor(None, upload_sync)
+            await self._run_document_action("upload_documents", documents, index_name)
             logger.info(f"Successfully uploaded {len(documents)} documents to index '{index_name}'")
             return len(documents)
         except Exception as e:
@@ -403,22 +500,51 @@ class AzureSearchClient:
         
         # Get embedding for the query
         start_embed = time.time()
-        embedding = await get_embedding(query)
+        embedding = await get_embedding(
+            query,
+            provider=getattr(self.endpoint_config, 'embedding_provider', None),
+            model=getattr(self.endpoint_config, 'embedding_model', None)
+        )
         embed_time = time.time() - start_embed
         logger.debug(f"Embedding generated in {embed_time:.2f}s, dimension: {len(embedding)}")
         
+        return await self.search_by_vector(embedding, site, num_results, index_name, query_params)
+    
+    async def search_by_vector(self, embedding: List[float], site: Union[str, List[str]],
+                               num_results: int = 50, index_name: Optional[str] = None,
+                               query_params: Optional[Dict[str, Any]] = None,
+                               include_schema: bool = True) -> List[List[str]]:
+        """
+        Search the Azure AI Search index using a precomputed query embedding
+        
+        Args:
+            embedding: The query embedding vector
+            site: Site to filter by (string or list of strings), or "all"
+            num_results: Maximum number of results to return
+            index_name: Optional index name (defaults to configured index name)
+            query_params: Additional query parameters
+            include_schema: If False, schema_json is not fetched and is returned
+                as None (see fetch_schema_json)
+            
+        Returns:
+            List[List[str]]: List of search results
+        """
+        index_name = index_name or self.default_index_name
+        
         # Perform the search
         start_retrieve = time.time()
-        results = await self._retrieve_by_site_and_vector(site, embedding, num_results, index_name)
+        if site == "all":
+            results = await self._retrieve_by_vector(embedding, num_results, index_name, include_schema)
+        else:
+            results = await self._retrieve_by_site_and_vector(site, embedding, num_results, index_name,
+                                                              include_schema)
         retrieve_time = time.time() - start_retrieve
         
         logger.log_with_context(
             LogLevel.INFO,
             "Azure Search completed",
             {
-                "embedding_time": f"{embed_time:.2f}s",
                 "retrieval_time": f"{retrieve_time:.2f}s",
-                "total_time": f"{embed_time + retrieve_time:.2f}s",
                 "results_count": len(results)
             }
         )
@@ -427,7 +553,8 @@ class AzureSearchClient:
     async def _retrieve_by_site_and_vector(self, sites: Union[str, List[str]], 
                                          vector_embedding: List[float], 
                                          top_n: int = 10, 
-                                         index_name: Optional[str] = None) -> List[List[str]]:
+                                         index_name: Optional[str] = None,
+                                         include_schema: bool = True) -> List[List[str]]:
         """
         Internal method to retrieve top n records filtered by site and ranked by vector similarity
         
@@ -436,6 +563,7 @@ class AzureSearchClient:
             vector_embedding: The embedding vector to search with
             top_n: Maximum number of results to return
             index_name: Optional index name (defaults to configured index name)
+            include_schema: If False, schema_json is not fetched and is returned as None
             
         Returns:
             List[List[str]]: List of search results
@@ -449,8 +577,6 @@ class AzureSearchClient:
             logger.error(error_msg)
             raise ValueError(error_msg)
         
-        search_client = self._get_search_client(index_name)
-        
         # Handle both single site and multiple sites
         if isinstance(sites, str):
             sites = [sites]
@@ -475,20 +601,17 @@ class AzureSearchClient:
                 }
             ],
             "top": top_n,
-            "select": "url,name,site,schema_json"
+            "select": "url,name,site,schema_json" if include_schema else "url,name,site"
         }
         
         try:
-            # Execute the search asynchronously
-            def search_sync():
-                return search_client.search(search_text=None, **search_options)
-            
-            results = await asyncio.get_event_loop().run_in_executor(None, search_sync)
+            results, _, _ = await self._run_search(index_name, search_text=None, **search_options)
             
             # Process results into a more convenient format
             processed_results = []
             for result in results:
-                processed_result = [result["url"], result["schema_json"], result["name"], result["site"]]
+                processed_result = [result["url"], result["schema_json"] if include_schema else None,
+                                    result["name"], result["site"], result.get("@search.score")]
                 processed_results.append(processed_result)
             
             logger.debug(f"Retrieved {len(processed_results)} results")
@@ -508,6 +631,29 @@ class AzureSearchClient:
             )
             raise
     
+    async def fetch_schema_json(self, urls: List[str], index_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch schema_json for a set of URLs with one search.in() filter query per
+        URL_LOOKUP_BATCH_SIZE URLs, used to hydrate results searched with include_schema=False.
+        
+        Args:
+            urls: URLs to fetch
+            index_name: Optional index name (defaults to configured index name)
+            
+        Returns:
+            Dict[str, Any]: Mapping of URL to schema_json for the URLs that were found
+        """
+        if not urls:
+            return {}
+        urls = list(dict.fromkeys(urls))
+        batches = [urls[i:i + URL_LOOKUP_BATCH_SIZE] for i in range(0, len(urls), URL_LOOKUP_BATCH_SIZE)]
+        responses = await asyncio.gather(*(
+            self._run_search(index_name, search_text=None, filter=_url_filter(batch),
+                             top=len(batch), select="url,schema_json")
+            for batch in batches
+        ))
+        return {result["url"]: result["schema_json"] for results, _, _ in responses for result in results}
+    
     async def search_by_url(self, url: str, index_name: Optional[str] = None, 
                           top_n: int = 1) -> Optional[List[str]]:
         """
@@ -524,8 +670,6 @@ class AzureSearchClient:
         index_name = index_name or self.default_index_name
         logger.info(f"Retrieving item by URL: {url} from index: {index_name}")
         
-        search_client = self._get_search_client(index_name)
-        
         # Create the search options with URL filter
         search_options = {
             "filter": f"url eq '{url}'",
@@ -534,11 +678,7 @@ class AzureSearchClient:
         }
         
         try:
-            # Execute the search asynchronously
-            def search_sync():
-                return search_client.search(search_text=None, **search_options)
-            
-            results = await asyncio.get_event_loop().run_in_executor(None, search_sync)
+            results, _, _ = await self._run_search(index_name, search_text=None, **search_options)
             
             for result in results:
                 logger.info(f"Successfully retrieved item for URL: {url}")
@@ -560,6 +700,36 @@ class AzureSearchClient:
             )
             raise
     
+    async def search_by_urls(self, urls: List[str], index_name: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Retrieve several records by exact URL.
+        
+        Document keys are not derived from the URL, so instead of get_document
+        calls this runs one search.in() filter query per URL_LOOKUP_BATCH_SIZE URLs.
+        
+        Args:
+            urls: URLs to look up
+            index_name: Optional index name (defaults to configured index name)
+            
+        Returns:
+            Dict[str, List[str]]: Mapping of URL to [url, schema_json, name, site] for the URLs that were found
+        """
+        if not urls:
+            return {}
+        urls = list(dict.fromkeys(urls))
+        batches = [urls[i:i + URL_LOOKUP_BATCH_SIZE] for i in range(0, len(urls), URL_LOOKUP_BATCH_SIZE)]
+        responses = await asyncio.gather(*(
+            self._run_search(index_name, search_text=None, filter=_url_filter(batch),
+                             top=len(batch), select="url,name,site,schema_json")
+            for batch in batches
+        ))
+        
+        found = {}
+        for results, _, _ in responses:
+            for result in results:
+                found[result["url"]] = [result["url"], result["schema_json"], result["name"], result["site"]]
+        return found
+    
     async def search_all_sites(self, query: str, num_results: int = 50, 
                              index_name: Optional[str] = None,
                              query_params: Optional[Dict[str, Any]] = None) -> List[List[str]]:
@@ -575,50 +745,17 @@ class AzureSearchClient:
         Returns:
             List[List[str]]: List of search results
         """
-        index_name = index_name or self.default_index_name
-        logger.info(f"Starting global Azure Search (all sites) - index: {index_name}, num_results: {num_results}")
         logger.debug(f"Query: {query}")
         
         try:
-            query_embedding = await get_embedding(query)
+            query_embedding = await get_embedding(
+                query,
+                provider=getattr(self.endpoint_config, 'embedding_provider', None),
+                model=getattr(self.endpoint_config, 'embedding_model', None)
+            )
             logger.debug(f"Generated embedding with dimension: {len(query_embedding)}")
             
-            # Validate embedding dimension
-            if len(query_embedding) != 1536:
-                error_msg = f"Unsupported embedding size: {len(query_embedding)}. Must be 1536."
-                logger.error(error_msg)
-                raise ValueError(error_msg)
-            
-            search_client = self._get_search_client(index_name)
-            
-            # Create the search options with vector search only (no site filter)
-            search_options = {
-                "vector_queries": [
-                    {
-                        "kind": "vector",
-                        "vector": query_embedding,
-                        "fields": "embedding",
-                        "k": num_results
-                    }
-                ],
-                "top": num_results,
-                "select": "url,name,site,schema_json"
-            }
-            
-            # Execute the search asynchronously
-            def search_sync():
-                return search_client.search(search_text=None, **search_options)
-            
-            results = await asyncio.get_event_loop().run_in_executor(None, search_sync)
-            
-            # Process results into a more convenient format
-            processed_results = []
-            for result in results:
-                processed_result = [result["url"], result["schema_json"], result["name"], result["site"]]
-                processed_results.append(processed_result)
-            
-            logger.info(f"Global search completed, found {len(processed_results)} results")
-            return processed_results
+            return await self._retrieve_by_vector(query_embedding, num_results, index_name)
         
         except Exception as e:
             logger.exception(f"Error in search_all_sites")
@@ -633,6 +770,56 @@ class AzureSearchClient:
             )
             raise
     
+    async def _retrieve_by_vector(self, query_embedding: List[float], top_n: int = 10,
+                                  index_name: Optional[str] = None,
+                                  include_schema: bool = True) -> List[List[str]]:
+        """
+        Internal method to retrieve top n records across all sites ranked by vector similarity
+        
+        Args:
+            query_embedding: The embedding vector to search with
+            top_n: Maximum number of results to return
+            index_name: Optional index name (defaults to configured index name)
+            include_schema: If False, schema_json is not fetched and is returned as None
+            
+        Returns:
+            List[List[str]]: List of search results
+        """
+        index_name = index_name or self.default_index_name
+        logger.info(f"Starting global Azure Search (all sites) - index: {index_name}, num_results: {top_n}")
+        
+        # Validate embedding dimension
+        if len(query_embedding) != 1536:
+            error_msg = f"Unsupported embedding size: {len(query_embedding)}. Must be 1536."
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        
+        # Create the search options with vector search only (no site filter)
+        search_options = {
+            "vector_queries": [
+                {
+                    "kind": "vector",
+                    "vector": query_embedding,
+                    "fields": "embedding",
+                    "k": top_n
+                }
+            ],
+            "top": top_n,
+            "select": "url,name,site,schema_json" if include_schema else "url,name,site"
+        }
+        
+        results, _, _ = await self._run_search(index_name, search_text=None, **search_options)
+        
+        # Process results into a more convenient format
+        processed_results = []
+        for result in results:
+            processed_result = [result["url"], result["schema_json"] if include_schema else None,
+                                result["name"], result["site"], result.get("@search.score")]
+            processed_results.append(processed_result)
+        
+        logger.info(f"Global search completed, found {len(processed_results)} results")
+        return processed_results
+    
     async def get_sites(self, index_name: Optional[str] = None) -> List[str]:
         """
         Get list of all unique sites in the database.
@@ -646,8 +833,6 @@ class AzureSearchClient:
         index_name = index_name or self.default_index_name
         logger.info(f"Retrieving list of sites from index: {index_name}")
         
-        search_client = self._get_search_client(index_name)
-        
         try:
             # Use a facet query to get distinct sites
             search_options = {
@@ -656,16 +841,12 @@ class AzureSearchClient:
                 "top": 0  # We only want facets, not actual documents
             }
             
-            # Execute the search asynchronously
-            def search_sync():
-                return search_client.search(**search_options)
-            
-            results = await asyncio.get_event_loop().run_in_executor(None, search_sync)
+            _, _, facets = await self._run_search(index_name, **search_options)
             
             # Extract unique sites from facets
             sites = []
-            if hasattr(results, 'get_facets') and results.get_facets():
-                site_facets = results.get_facets().get('site', [])
+            if facets:
+                site_facets = facets.get('site', [])
                 sites = [facet['value'] for facet in site_facets]
             
             logger.info(f"Retrieved {len(sites)} unique sites")
@@ -0,0 +1,156 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""
+Streaming bulk writer shared by the Elasticsearch and OpenSearch clients.
+
+Documents are serialized to ndjson one at a time and cut into chunks bounded
+by both document count and request size, so a large load never materializes
+one huge request body. Several chunks are sent concurrently and per-item
+failures from each bulk response are collected with the URL they belong to.
+
+WARNING: This code is under development and may undergo changes in future releases.
+Backwards compatibility is not guaranteed at this time.
+"""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Set, Tuple
+
+from utils.logging_config_helper import get_configured_logger
+
+logger = get_configured_logger("bulk_writer")
+
+DEFAULT_CHUNK_DOCS = 500
+DEFAULT_CHUNK_BYTES = 10 * 1024 * 1024
+DEFAULT_CONCURRENCY = 4
+
+# Number of item failures kept in logs and errors
+MAX_REPORTED_FAILURES = 20
+
+# One chunk: the ndjson lines (action and source per document) and the document URLs in order
+BulkChunk = Tuple[List[bytes], List[str]]
+SendChunk = Callable[[BulkChunk], Awaitable[Dict[str, Any]]]
+
+
+def iter_bulk_chunks(documents: Iterable[Tuple[str, Dict[str, Any], Dict[str, Any]]],
+                     max_docs: int = DEFAULT_CHUNK_DOCS,
+                     max_bytes: int = DEFAULT_CHUNK_BYTES) -> Iterator[BulkChunk]:
+    """
+    Serialize documents to ndjson and group them into bounded chunks.
+
+    Args:
+        documents: (url, action, source) triples, consumed lazily
+        max_docs: Maximum number of documents per chunk
+        max_bytes: Maximum serialized size of a chunk; a single larger document gets a chunk of its own
+
+    Yields:
+        (lines, urls) chunks
+    """
+    lines: List[bytes] = []
+    urls: List[str] = []
+    size = 0
+    for url, action, source in documents:
+        doc_lines = [json.dumps(action).encode("utf-8"), json.dumps(source).encode("utf-8")]
+        doc_size = sum(len(line) + 1 for line in doc_lines)
+        if urls and (len(urls) >= max_docs or size + doc_size > max_bytes):
+            yield lines, urls
+            lines, urls, size = [], [], 0
+        lines.extend(doc_lines)
+        urls.append(url)
+        size += doc_size
+    if urls:
+        yield lines, urls
+
+
+def parse_bulk_response(result: Dict[str, Any], urls: List[str]) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Count successes and collect per-item failures from a bulk API response.
+
+    Args:
+        result: Decoded bulk response
+        urls: URLs of the documents in the request, in request order
+
+    Returns:
+        (succeeded, failures) where each failure has url, status and error
+    """
+    succeeded = 0
+    failures = []
+    for position, item in enumerate(result.get("items", [])):
+        outcome = next(iter(item.values()), {})
+        status = outcome.get("status", 0)
+        if 200 <= status < 300:
+            succeeded += 1
+        else:
+            failures.append({
+                "url": urls[position] if position < len(urls) else outcome.get("_id"),
+                "status": status,
+                "error": outcome.get("error", "Unknown error")
+            })
+    return succeeded, failures
+
+
+async def write_bulk_chunks(chunks: Iterable[BulkChunk], send_chunk: SendChunk,
+                            concurrency: int = DEFAULT_CONCURRENCY) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Send chunks through the bulk API with several requests in flight.
+
+    Chunks are pulled from the iterable only when a request slot is free, so
+    at most `concurrency` chunks are held in memory. A request that fails as
+    a whole (e.g. a transport error) cancels the others and is re-raised.
+
+    Args:
+        chunks: Chunks from iter_bulk_chunks
+        send_chunk: Coroutine sending one chunk and returning the decoded bulk response
+        concurrency: Maximum number of concurrent bulk requests
+
+    Returns:
+        (succeeded, failures) totals over all chunks
+    """
+    succeeded = 0
+    failures: List[Dict[str, Any]] = []
+    in_flight: Set[asyncio.Task] = set()
+
+    async def send(chunk: BulkChunk) -> Tuple[int, List[Dict[str, Any]]]:
+        return parse_bulk_response(await send_chunk(chunk), chunk[1])
+
+    async def drain(return_when):
+        nonlocal succeeded
+        done, _ = await asyncio.wait(in_flight, return_when=return_when)
+        for task in done:
+            in_flight.discard(task)
+            chunk_succeeded, chunk_failures = task.result()
+            succeeded += chunk_succeeded
+            failures.extend(chunk_failures)
+
+    try:
+        for chunk in chunks:
+            if len(in_flight) >= max(1, concurrency):
+                await drain(asyncio.FIRST_COMPLETED)
+            in_flight.add(asyncio.create_task(send(chunk)))
+        if in_flight:
+            await drain(asyncio.ALL_COMPLETED)
+    except BaseException:
+        for task in in_flight:
+            if task.done():
+                if not task.cancelled():
+                    task.exception()
+            else:
+                task.cancel()
+        raise
+
+    return succeeded, failures
+
+
+def bulk_settings(endpoint_config: Any) -> Tuple[int, int, int]:
+    """
+    Read the optional bulk_chunk_docs, bulk_chunk_bytes and bulk_concurrency endpoint settings.
+
+    Returns:
+        (max_docs, max_bytes, concurrency)
+    """
+    return (
+        int(getattr(endpoint_config, 'bulk_chunk_docs', None) or DEFAULT_CHUNK_DOCS),
+        int(getattr(endpoint_config, 'bulk_chunk_bytes', None) or DEFAULT_CHUNK_BYTES),
+        int(getattr(endpoint_config, 'bulk_concurrency', None) or DEFAULT_CONCURRENCY),
+    )
@@ -10,10 +10,11 @@ import uuid
 import threading
 from typing import List, Dict, Union, Optional, Any
 from elasticsearch import AsyncElasticsearch
-from elasticsearch.helpers import async_bulk
+from elasticsearch.helpers import BulkIndexError
 
 from config.config import CONFIG
 from embedding.embedding import get_embedding
+from retrieval.bulk_writer import iter_bulk_chunks, write_bulk_chunks, bulk_settings, MAX_REPORTED_FAILURES
 from utils.logging_config_helper import get_configured_logger
 from utils.logger import LogLevel
 
@@ -43,6 +44,10 @@ class ElasticsearchClient:
         self.api_key = self.endpoint_config.api_key
         self.default_index_name = self.endpoint_config.index_name or "embeddings"
         
+        # Open bulk loads per index, and the refresh_interval to restore when the last one ends
+        self._bulk_loads: Dict[str, int] = {}
+        self._saved_refresh_intervals: Dict[str, Optional[str]] = {}
+        
         if self.api_endpoint is None:
             raise ValueError(f"API endpoint not configured for {self.endpoint_name}. Check environment variable configuration.")
         if self.api_key is None:
@@ -282,6 +287,9 @@ class ElasticsearchClient:
         """
         Upload documents to Elasticsearch using bulk API.
         
+        Documents are streamed in chunks bounded by bulk_chunk_docs and
+        bulk_chunk_bytes, with up to bulk_concurrency bulk requests in flight.
+        
         Args:
             documents: List of document objects with keys: url, site, schema_json, name, embedding
             **kwargs: Additional parameters
@@ -302,40 +310,54 @@ class ElasticsearchClient:
         # Ensure index exists with proper mapping
         await self.create_index_if_not_exists(index_name)
         
-        # Prepare bulk operations
-        actions = []
-        for doc in documents:
-            url = doc.get('url', '')
-            if url == '':
-                raise ValueError('The url cannot be empty')
-        
-            # Convert the URL in a deterministic unique ID
-            id = str(uuid.uuid5(uuid.NAMESPACE_URL, url))
+        def bulk_documents():
+            for doc in documents:
+                url = doc.get('url', '')
+                if url == '':
+                    raise ValueError('The url cannot be empty')
             
-            action = {
-                "_op_type": "index",
-                "_index": index_name,
-                "_id": id,
-                "url": url,
-                "site": doc.get('site', ''),
-                "name": doc.get('name', ''),
-                "schema_json": str(doc.get('schema_json', '{}')),
-                "embedding": doc.get('embedding', [])
-            }
-            actions.append(action)
+                # Convert the URL in a deterministic unique ID
+                id = str(uuid.uuid5(uuid.NAMESPACE_URL, url))
+                
+                yield url, {"index": {"_index": index_name, "_id": id}}, {
+                    "url": url,
+                    "site": doc.get('site', ''),
+                    "name": doc.get('name', ''),
+                    "schema_json": str(doc.get('schema_json', '{}')),
+                    "embedding": doc.get('embedding', [])
+                }
+        
+        async def send_chunk(chunk):
+            lines, _urls = chunk
+            response = await client.bulk(operations=lines, timeout='300s')
+            return response.body if hasattr(response, 'body') else response
+        
+        max_docs, max_bytes, concurrency = bulk_settings(self.endpoint_config)
         
         try:
-            successful_count, error_count = await async_bulk(
-                client=client,
-                actions=actions,
-                timeout='300s',
-                refresh=True,
-                raise_on_error=True,
-                stats_only=True
+            successful_count, failures = await write_bulk_chunks(
+                iter_bulk_chunks(bulk_documents(), max_docs, max_bytes),
+                send_chunk,
+                concurrency
             )
+            
+            # Make the documents searchable once per call instead of once per
+            # chunk; inside a bulk load the refresh happens when the load ends
+            if not self._bulk_loads.get(index_name):
+                await client.indices.refresh(index=index_name)
 
-            if error_count > 0:
-                logger.warning(f"{error_count} out of {num_documents} documents failed to upload")
+            if failures:
+                logger.log_with_context(
+                    LogLevel.WARNING,
+                    "Elasticsearch bulk upload had failed documents",
+                    {
+                        "failed_count": len(failures),
+                        "document_count": num_documents,
+                        "index_name": index_name,
+                        "failures": failures[:MAX_REPORTED_FAILURES]
+                    }
+                )
+                raise BulkIndexError(f"{len(failures)} document(s) failed to index.", failures)
             
             logger.info(f"Successfully uploaded {successful_count} documents to index: {index_name}")
             
@@ -355,24 +377,77 @@ class ElasticsearchClient:
             )
             raise
     
-    async def _format_es_response(self, response: Dict[str, Any]) -> List[List[str]]:
+    async def begin_bulk_load(self, **kwargs):
+        """
+        Prepare an index for a large load.
+        
+        Disables periodic refresh (refresh_interval -1) unless the endpoint sets
+        bulk_disable_refresh: false, and stops upload_documents from refreshing
+        after each call. Loads may nest or overlap; the index is restored when
+        the last one ends.
+        
+        Args:
+            **kwargs: Additional parameters (index_name)
+        """
+        index_name = kwargs.get('index_name', self.default_index_name)
+        self._bulk_loads[index_name] = self._bulk_loads.get(index_name, 0) + 1
+        if self._bulk_loads[index_name] > 1:
+            return
+        if getattr(self.endpoint_config, 'bulk_disable_refresh', True) is False:
+            return
+        
+        try:
+            await self.create_index_if_not_exists(index_name)
+            client = await self._get_es_client()
+            settings = await client.indices.get_settings(index=index_name, name="index.refresh_interval")
+            current = settings.get(index_name, {}).get("settings", {}).get("index", {}).get("refresh_interval")
+            # A leftover -1 from an interrupted load restores to the default
+            self._saved_refresh_intervals[index_name] = None if current == "-1" else current
+            await client.indices.put_settings(index=index_name, settings={"index": {"refresh_interval": "-1"}})
+            logger.info(f"Disabled refresh on index {index_name} for bulk load")
+        except Exception as e:
+            logger.warning(f"Could not disable refresh on index {index_name}: {e}")
+    
+    async def end_bulk_load(self, **kwargs):
+        """
+        Finish a load started with begin_bulk_load: restore refresh_interval and refresh once.
+        
+        Args:
+            **kwargs: Additional parameters (index_name)
+        """
+        index_name = kwargs.get('index_name', self.default_index_name)
+        remaining = self._bulk_loads.get(index_name, 0) - 1
+        if remaining > 0:
+            self._bulk_loads[index_name] = remaining
+            return
+        self._bulk_loads.pop(index_name, None)
+        
+        client = await self._get_es_client()
+        if index_name in self._saved_refresh_intervals:
+            interval = self._saved_refresh_intervals.pop(index_name)
+            await client.indices.put_settings(index=index_name, settings={"index": {"refresh_interval": interval}})
+            logger.info(f"Restored refresh_interval {interval or 'default'} on index {index_name}")
+        await client.indices.refresh(index=index_name)
+    
+    async def _format_es_response(self, response: Dict[str, Any], include_schema: bool = True) -> List[List[str]]:
         """ 
-        Converts the Elasticsearch response in a list of values [url, schema_json, name, site_name]
+        Converts the Elasticsearch response in a list of values [url, schema_json, name, site_name, score]
 
         Args:
             response (List[Dict[str, Any]]): the Elasticsearch response
+            include_schema: If False, schema_json was not fetched and is returned as None
 
         Returns:
-            List[List[str]]: the list of values [url, schema_json, name, site_name]
+            List[List[str]]: the list of values [url, schema_json, name, site_name, score]
         """
         processed_results = []
         for hit in response['hits']['hits']:
             source = hit.get('_source', {})
             url = source.get('url', '')
-            schema_json = source.get('schema_json', '{}')
+            schema_json = source.get('schema_json', '{}') if include_schema else None
             name = source.get('name', '')
             site_name = source.get('site', '')
-            processed_results.append([url, schema_json, name, site_name])
+            processed_results.append([url, schema_json, name, site_name, hit.get('_score')])
             
         return processed_results
     
@@ -432,27 +507,53 @@ class ElasticsearchClient:
         Returns:
             List[List[str]]: List of search results [url, schema_json, name, site]
         """
-        index_name = kwargs.get('index_name', self.default_index_name)
-        logger.info(f"Starting Elasticsearch - query: '{query[:50]}...', site: {site}, index: {index_name}")
+        logger.info(f"Starting Elasticsearch - query: '{query[:50]}...', site: {site}")
         
         start_embed = time.time()
-        embedding = await get_embedding(query)
+        embedding = await get_embedding(
+            query,
+            provider=getattr(self.endpoint_config, 'embedding_provider', None),
+            model=getattr(self.endpoint_config, 'embedding_model', None)
+        )
         embed_time = time.time() - start_embed
         logger.debug(f"Embedding generated in {embed_time:.2f}s, dimension: {len(embedding)}")
         
-        # Handle both single site and multiple sites
-        if isinstance(site, str):
-            sites = [site]
-        else:
-            sites = site
-        
-        # Build site filter
-        if len(sites) == 1:
-            filter = {"term": {"site": sites[0]}}
-        else:
-            filter = {"terms": {"site": sites}}
+        return await self.search_by_vector(embedding, site, num_results, **kwargs)
+    
+    async def search_by_vector(self, embedding: List[float], site: Union[str, List[str]],
+                               num_results: int = 50, **kwargs) -> List[List[str]]:
+        """
+        Search for documents using a precomputed query embedding.
+        
+        Args:
+            embedding: The query embedding vector
+            site: Site identifier, list of sites, or "all"
+            num_results: Maximum number of results to return
+            **kwargs: Additional parameters; include_schema=False skips fetching
+                schema_json, which is then None (see fetch_schema_json)
+            
+        Returns:
+            List[List[str]]: List of search results [url, schema_json, name, site]
+        """
+        index_name = kwargs.get('index_name', self.default_index_name)
+        include_schema = kwargs.get('include_schema', True)
+        logger.info(f"Starting Elasticsearch vector search - site: {site}, index: {index_name}")
+        
+        # Build site filter, no filter when searching all sites
+        filter = None
+        if site != "all":
+            # Handle both single site and multiple sites
+            if isinstance(site, str):
+                sites = [site]
+            else:
+                sites = site
+            
+            if len(sites) == 1:
+                filter = {"term": {"site": sites[0]}}
+            else:
+                filter = {"terms": {"site": sites}}
                 
-        source = ["url", "site", "schema_json", "name"]
+        source = ["url", "site", "schema_json", "name"] if include_schema else ["url", "site", "name"]
         start_retrieve = time.time()
         # Execute Elasticsearch query with kNN vector search and filter
         response = await self._search_knn_filter(
@@ -464,21 +565,47 @@ class ElasticsearchClient:
         ) 
         retrieve_time = time.time() - start_retrieve
         
-        results = await self._format_es_response(response)
+        results = await self._format_es_response(response, include_schema)
         
         logger.log_with_context(
             LogLevel.INFO,
             "Elasticsearch search completed",
             {
-                "embedding_time": f"{embed_time:.2f}s",
                 "retrieval_time": f"{retrieve_time:.2f}s",
-                "total_time": f"{embed_time + retrieve_time:.2f}s",
                 "results_count": len(results)
             }
         )
         return results
     
     
+    async def fetch_schema_json(self, urls: List[str], **kwargs) -> Dict[str, Any]:
+        """
+        Fetch schema_json for a set of URLs with a single mget, used to hydrate
+        results searched with include_schema=False.
+        
+        Args:
+            urls: URLs to fetch
+            **kwargs: Additional parameters
+            
+        Returns:
+            Dict[str, Any]: Mapping of URL to schema_json for the URLs that were found
+        """
+        if not urls:
+            return {}
+        index_name = kwargs.get('index_name', self.default_index_name)
+        client = await self._get_es_client()
+        
+        # Document ids are derived from the URL at upload time
+        ids = [str(uuid.uuid5(uuid.NAMESPACE_URL, url)) for url in urls]
+        response = await client.mget(index=index_name, ids=ids, source=["url", "schema_json"])
+        
+        schemas = {}
+        for doc in response.get('docs', []):
+            if doc.get('found'):
+                source = doc.get('_source', {})
+                schemas[source.get('url', '')] = source.get('schema_json', '{}')
+        return schemas
+    
     async def search_by_url(self, url: str, **kwargs) -> Optional[List[str]]:
         """
         Retrieve records by exact URL match
@@ -526,6 +653,34 @@ class ElasticsearchClient:
             )
             raise
     
+    async def search_by_urls(self, urls: List[str], **kwargs) -> Dict[str, List[str]]:
+        """
+        Retrieve several records by exact URL with a single mget
+        
+        Args:
+            urls: URLs to look up
+            **kwargs: Additional parameters
+            
+        Returns:
+            Dict[str, List[str]]: Mapping of URL to [url, schema_json, name, site] for the URLs that were found
+        """
+        if not urls:
+            return {}
+        index_name = kwargs.get('index_name', self.default_index_name)
+        client = await self._get_es_client()
+        
+        # Document ids are derived from the URL at upload time
+        ids = [str(uuid.uuid5(uuid.NAMESPACE_URL, url)) for url in urls]
+        response = await client.mget(index=index_name, ids=ids, source=["url", "site", "schema_json", "name"])
+        
+        found = {}
+        for doc in response.get('docs', []):
+            if doc.get('found'):
+                source = doc.get('_source', {})
+                url = source.get('url', '')
+                found[url] = [url, source.get('schema_json', '{}'), source.get('name', ''), source.get('site', '')]
+        return found
+    
     async def search_all_sites(self, query: str, num_results: int = 50, **kwargs) -> List[List[str]]:
         """
         Search across all sites using vector similarity
@@ -538,39 +693,19 @@ class ElasticsearchClient:
         Returns:
             List[List[str]]: List of search results
         """
-        index_name = kwargs.get('index_name', self.default_index_name)
-        logger.info(f"Starting global Elasticsearch (all sites) - index: {index_name}, num_results: {num_results}")
         logger.debug(f"Query: {query}")
         
         try:
             start_embed = time.time()
-            embedding = await get_embedding(query)
+            embedding = await get_embedding(
+                query,
+                provider=getattr(self.endpoint_config, 'embedding_provider', None),
+                model=getattr(self.endpoint_config, 'embedding_model', None)
+            )
             embed_time = time.time() - start_embed
             logger.debug(f"Embedding generated in {embed_time:.2f}s, dimension: {len(embedding)}")
             
-            source = ["url", "site", "schema_json", "name"]
-            start_retrieve = time.time()
-            # Execute Elasticsearch query with kNN vector search and filter
-            response = await self._search_knn_filter(
-                index_name=index_name, 
-                embedding=embedding,
-                k=num_results,
-                source=source
-            ) 
-            retrieve_time = time.time() - start_retrieve
-            
-            results = await self._format_es_response(response)
-            logger.log_with_context(
-                LogLevel.INFO,
-                "Elasticsearch search_all_sites completed",
-                {
-                    "embedding_time": f"{embed_time:.2f}s",
-                    "retrieval_time": f"{retrieve_time:.2f}s",
-                    "total_time": f"{embed_time + retrieve_time:.2f}s",
-                    "results_count": len(results)
-                }
-            )
-            return results
+            return await self.search_by_vector(embedding, "all", num_results, **kwargs)
             
         except Exception as e:
             logger.exception(f"Error in search_all_sites")
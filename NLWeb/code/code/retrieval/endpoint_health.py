@@ -0,0 +1,183 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""
+Circuit breaker and health scoring for retrieval endpoints.
+
+Each endpoint gets a breaker that opens when the failure rate over its recent
+requests crosses a threshold (slow requests count as failures if a latency
+threshold is configured). An open breaker rejects requests until a cool-down
+has passed, then lets a single half-open probe through; a successful probe
+closes it again. An EWMA of success and latency gives each endpoint a health
+score that the fan-out uses to order endpoints.
+
+Optional retrieval endpoint settings:
+    breaker_failure_rate: failure ratio that opens the breaker (default 0.5)
+    breaker_min_requests: requests in the window before the breaker can open (default 10)
+    breaker_window: number of recent requests considered (default 20)
+    breaker_latency_threshold: seconds above which a success counts as a failure (default none)
+    breaker_open_seconds: cool-down before a half-open probe (default 30)
+
+WARNING: This code is under development and may undergo changes in future releases.
+Backwards compatibility is not guaranteed at this time.
+"""
+
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+from config.config import CONFIG
+
+from utils.logging_config_helper import get_configured_logger
+from utils.logger import LogLevel
+
+logger = get_configured_logger("endpoint_health")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_RATE = 0.5
+DEFAULT_MIN_REQUESTS = 10
+DEFAULT_WINDOW = 20
+DEFAULT_OPEN_SECONDS = 30.0
+EWMA_ALPHA = 0.2
+
+
+class EndpointHealth:
+    """Breaker state and health metrics for one retrieval endpoint."""
+
+    def __init__(self, name: str, endpoint_config=None):
+        self.name = name
+        self.failure_rate_threshold = float(getattr(endpoint_config, 'breaker_failure_rate', None) or DEFAULT_FAILURE_RATE)
+        self.min_requests = int(getattr(endpoint_config, 'breaker_min_requests', None) or DEFAULT_MIN_REQUESTS)
+        self.open_seconds = float(getattr(endpoint_config, 'breaker_open_seconds', None) or DEFAULT_OPEN_SECONDS)
+        latency_threshold = getattr(endpoint_config, 'breaker_latency_threshold', None)
+        self.latency_threshold = float(latency_threshold) if latency_threshold else None
+        window = int(getattr(endpoint_config, 'breaker_window', None) or DEFAULT_WINDOW)
+
+        self.state = CLOSED
+        self.outcomes = deque(maxlen=window)
+        self.opened_at = 0.0
+        self.probe_in_flight = False
+        self.probe_started_at = 0.0
+        self.ewma_success = 1.0
+        self.ewma_latency: Optional[float] = None
+        self.total_requests = 0
+        self.total_failures = 0
+        self.rejected = 0
+
+    @property
+    def health_score(self) -> float:
+        """Health in [0, 1]; 0 while the breaker is open."""
+        if self.state == OPEN:
+            return 0.0
+        return self.ewma_success
+
+    def allow_request(self) -> bool:
+        """Return True if a request may be sent to this endpoint now."""
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                self.rejected += 1
+                return False
+            self._transition(HALF_OPEN)
+        # Half-open: only one probe at a time. A probe that never reported back
+        # (e.g. its task was cancelled before running) expires after the cool-down.
+        now = time.monotonic()
+        if self.probe_in_flight and now - self.probe_started_at < self.open_seconds:
+            self.rejected += 1
+            return False
+        self.probe_in_flight = True
+        self.probe_started_at = now
+        return True
+
+    def record_success(self, latency: float):
+        """Record a completed request."""
+        slow = self.latency_threshold is not None and latency > self.latency_threshold
+        self._record(not slow, latency)
+
+    def record_failure(self, latency: Optional[float] = None):
+        """Record a failed or timed-out request."""
+        self._record(False, latency)
+
+    def record_cancelled(self):
+        """Release a half-open probe whose request was cancelled without an outcome."""
+        if self.state == HALF_OPEN:
+            self.probe_in_flight = False
+
+    def _record(self, ok: bool, latency: Optional[float]):
+        self.total_requests += 1
+        if not ok:
+            self.total_failures += 1
+        self.outcomes.append(ok)
+        self.ewma_success = EWMA_ALPHA * (1.0 if ok else 0.0) + (1 - EWMA_ALPHA) * self.ewma_success
+        if latency is not None:
+            if self.ewma_latency is None:
+                self.ewma_latency = latency
+            else:
+                self.ewma_latency = EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.ewma_latency
+
+        if self.state == HALF_OPEN:
+            self.probe_in_flight = False
+            if ok:
+                self.outcomes.clear()
+                self._transition(CLOSED)
+            else:
+                self._open()
+            return
+
+        if self.state == CLOSED and len(self.outcomes) >= self.min_requests:
+            failures = sum(1 for outcome in self.outcomes if not outcome)
+            if failures / len(self.outcomes) >= self.failure_rate_threshold:
+                self._open()
+
+    def _open(self):
+        self.opened_at = time.monotonic()
+        self._transition(OPEN)
+
+    def _transition(self, state: str):
+        if state == self.state:
+            return
+        logger.log_with_context(
+            LogLevel.WARNING if state == OPEN else LogLevel.INFO,
+            "Endpoint circuit breaker state changed",
+            {
+                "endpoint": self.name,
+                "from": self.state,
+                "to": state,
+                "health_score": round(self.ewma_success, 3)
+            }
+        )
+        self.state = state
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "health_score": round(self.health_score, 4),
+            "ewma_latency": round(self.ewma_latency, 4) if self.ewma_latency is not None else None,
+            "recent_failure_rate": round(
+                sum(1 for outcome in self.outcomes if not outcome) / len(self.outcomes), 4
+            ) if self.outcomes else 0.0,
+            "total_requests": self.total_requests,
+            "total_failures": self.total_failures,
+            "rejected": self.rejected,
+        }
+
+
+_endpoint_health: Dict[str, EndpointHealth] = {}
+
+
+def get_endpoint_health(endpoint_name: str) -> EndpointHealth:
+    """Return the shared health tracker for an endpoint, creating it on first use."""
+    health = _endpoint_health.get(endpoint_name)
+    if health is None:
+        health = EndpointHealth(endpoint_name, CONFIG.retrieval_endpoints.get(endpoint_name))
+        _endpoint_health[endpoint_name] = health
+    return health
+
+
+def get_endpoint_health_stats() -> Dict[str, Dict[str, Any]]:
+    """Return breaker state and health metrics for every endpoint seen so far."""
+    return {name: health.stats() for name, health in _endpoint_health.items()}
@@ -0,0 +1,136 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""
+Dedicated, bounded thread pools for retrieval backends with blocking SDKs.
+
+Backends that only offer a synchronous client run their calls here instead of
+on the event loop's default executor, so a slow store can only tie up its own
+threads and never starves unrelated code that shares the default pool. Each
+pool tracks queue depth, active threads and queue wait so saturation is
+visible in the /stats endpoint.
+
+WARNING: This code is under development and may undergo changes in future releases.
+Backwards compatibility is not guaranteed at this time.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from utils.logging_config_helper import get_configured_logger
+from utils.logger import LogLevel
+
+logger = get_configured_logger("executor_pool")
+
+DEFAULT_MAX_WORKERS = 16
+
+
+class BoundedExecutor:
+    """Thread pool with a fixed number of workers and usage counters."""
+
+    def __init__(self, name: str, max_workers: int = DEFAULT_MAX_WORKERS):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"nlweb-{name}")
+        self._lock = threading.Lock()
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.queued = 0
+        self.active = 0
+        self.peak_active = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking function on this pool and await its result.
+
+        Args:
+            fn: Function to call
+            *args, **kwargs: Arguments passed to fn
+
+        Returns:
+            The function's return value
+        """
+        submitted_at = time.monotonic()
+        with self._lock:
+            self.submitted += 1
+            self.queued += 1
+
+        def call():
+            wait = time.monotonic() - submitted_at
+            with self._lock:
+                self.queued -= 1
+                self.active += 1
+                self.peak_active = max(self.peak_active, self.active)
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            ok = False
+            try:
+                result = fn(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                with self._lock:
+                    self.active -= 1
+                    self.completed += 1
+                    if not ok:
+                        self.failed += 1
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, call)
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self.submitted - self.queued
+            return {
+                "max_workers": self.max_workers,
+                "active": self.active,
+                "peak_active": self.peak_active,
+                "queued": self.queued,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_queue_wait": round(self.total_wait / started, 4) if started else 0.0,
+                "max_queue_wait": round(self.max_wait, 4),
+            }
+
+
+_executors: Dict[str, BoundedExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name: str, max_workers: Optional[int] = None) -> BoundedExecutor:
+    """
+    Return the shared executor with the given name, creating it on first use.
+
+    Args:
+        name: Pool name, usually the retrieval endpoint name
+        max_workers: Pool size used when the pool is created (default 16)
+    """
+    with _executors_lock:
+        executor = _executors.get(name)
+        if executor is None:
+            max_workers = int(max_workers or DEFAULT_MAX_WORKERS)
+            executor = BoundedExecutor(name, max_workers)
+            _executors[name] = executor
+            logger.log_with_context(
+                LogLevel.INFO,
+                "Created dedicated executor",
+                {"name": name, "max_workers": max_workers}
+            )
+        return executor
+
+
+def get_executor_stats() -> Dict[str, Dict[str, Any]]:
+    """Return usage counters for every executor created so far."""
+    with _executors_lock:
+        executors = list(_executors.items())
+    return {name: executor.stats() for name, executor in executors}
@@ -0,0 +1,167 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""
+TTL + LRU cache of individual documents, keyed by (endpoint, url).
+
+Two-phase retrieval stores the schema_json it hydrates here, so documents that
+keep showing up in top results are only transferred and decoded once. Entries
+remember their site and are dropped when VectorDBClient writes to that site.
+
+Configuration (environment variables):
+    NLWEB_ITEM_CACHE_TTL: entry lifetime in seconds (default 300, 0 disables the cache)
+    NLWEB_ITEM_CACHE_SIZE: max number of entries (default 10000)
+
+WARNING: This code is under development and may undergo changes in future releases.
+Backwards compatibility is not guaranteed at this time.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.logging_config_helper import get_configured_logger
+
+logger = get_configured_logger("item_cache")
+
+DEFAULT_TTL_SECONDS = 300.0
+DEFAULT_MAX_ENTRIES = 10000
+
+ItemKey = Tuple[str, str]
+
+
+class ItemCache:
+    """
+    Bounded TTL cache of [url, schema_json, name, site] rows with per-site invalidation.
+
+    Like ResultCache, a generation counter is bumped on every invalidation so
+    rows fetched across a write are not stored.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[ItemKey, Tuple[float, List[Any]]]" = OrderedDict()
+        self._site_keys: Dict[str, Set[ItemKey]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def _drop(self, key: ItemKey):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        site = entry[1][3]
+        keys = self._site_keys.get(site)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._site_keys[site]
+
+    def get_many(self, endpoint_name: str, urls: Iterable[str]) -> Dict[str, List[Any]]:
+        """
+        Look up cached rows for an endpoint.
+
+        Args:
+            endpoint_name: Endpoint the rows were fetched from
+            urls: URLs to look up
+
+        Returns:
+            Dictionary mapping each cached URL to a copy of its row; misses are omitted
+        """
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for url in urls:
+                key = (endpoint_name, url)
+                entry = self._entries.get(key)
+                if entry is None or entry[0] <= now:
+                    if entry is not None:
+                        self._drop(key)
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end(key)
+                self.hits += 1
+                found[url] = list(entry[1])
+        return found
+
+    def put_many(self, endpoint_name: str, rows: Iterable[List[Any]], generation: int):
+        """
+        Store rows fetched from an endpoint.
+
+        Args:
+            endpoint_name: Endpoint the rows were fetched from
+            rows: [url, schema_json, name, site] rows
+            generation: Value of `generation` read before the fetch started
+        """
+        expires = time.monotonic() + self.ttl
+        with self._lock:
+            if generation != self._generation:
+                return
+            for row in rows:
+                key = (endpoint_name, row[0])
+                self._drop(key)
+                self._entries[key] = (expires, list(row[:4]))
+                self._site_keys.setdefault(row[3], set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate_sites(self, sites: Iterable[str]):
+        """Drop cached rows for the given sites."""
+        with self._lock:
+            self._generation += 1
+            for site in set(sites):
+                for key in list(self._site_keys.get(site, ())):
+                    self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._site_keys.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit-rate counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+            }
+
+
+_cache: Optional[ItemCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_item_cache() -> ItemCache:
+    """Return the process-wide item cache, creating it from the environment on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    ttl = float(os.getenv("NLWEB_ITEM_CACHE_TTL", DEFAULT_TTL_SECONDS))
+                except ValueError:
+                    ttl = DEFAULT_TTL_SECONDS
+                try:
+                    max_entries = int(os.getenv("NLWEB_ITEM_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+                except ValueError:
+                    max_entries = DEFAULT_MAX_ENTRIES
+                _cache = ItemCache(ttl=ttl, max_entries=max_entries)
+    return _cache
@@ -0,0 +1,126 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""
+Micro-batching of concurrent backend calls.
+
+Requests that share a batch key (e.g. same collection, filter and limit) and
+arrive within a short window are coalesced into one backend call carrying all
+of their inputs. A batch is flushed when the window closes or when it reaches
+the maximum size, whichever comes first. Vector stores answer one
+multi-vector search much more cheaply than the same number of single-vector
+searches.
+
+WARNING: This code is under development and may undergo changes in future releases.
+Backwards compatibility is not guaranteed at this time.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Set, Tuple
+
+from utils.logging_config_helper import get_configured_logger
+
+logger = get_configured_logger("micro_batcher")
+
+DEFAULT_MAX_BATCH_SIZE = 16
+DEFAULT_BATCH_WINDOW = 0.002
+
+BatchRunner = Callable[[Hashable, List[Any]], Awaitable[List[Any]]]
+
+_batchers: Dict[str, "MicroBatcher"] = {}
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent submissions with the same key into batched calls.
+
+    The runner receives the batch key and the submitted items, and must return
+    one result per item in the same order.
+    """
+
+    def __init__(self, name: str, run_batch: BatchRunner,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 window: float = DEFAULT_BATCH_WINDOW):
+        self.name = name
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.window = max(0.0, float(window))
+        self._run_batch = run_batch
+        self._pending: Dict[Hashable, List[Tuple[Any, asyncio.Future]]] = {}
+        self._timers: Dict[Hashable, asyncio.TimerHandle] = {}
+        self._running: Set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+        _batchers[name] = self
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_batch_size > 1
+
+    async def submit(self, key: Hashable, item: Any) -> Any:
+        """
+        Add an item to the batch for a key and wait for its result.
+
+        Args:
+            key: Batch key; only items with equal keys are batched together
+            item: Input for the batch runner
+
+        Returns:
+            The runner's result for this item
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(key, [])
+        pending.append((item, future))
+        if len(pending) >= self.max_batch_size:
+            self._flush(key)
+        elif len(pending) == 1:
+            self._timers[key] = loop.call_later(self.window, self._flush, key)
+        return await future
+
+    def _flush(self, key: Hashable):
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(key, None)
+        if not batch:
+            return
+        task = asyncio.ensure_future(self._run(key, batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, key: Hashable, batch: List[Tuple[Any, asyncio.Future]]):
+        # Drop callers that gave up while the batch was filling
+        batch = [(item, future) for item, future in batch if not future.done()]
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        try:
+            results = await self._run_batch(key, [item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"Batch runner returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "max_batch_size": self.max_batch_size,
+            "window": self.window,
+        }
+
+
+def get_micro_batcher_stats() -> Dict[str, Dict[str, Any]]:
+    """Return batching counters for every batcher created so far."""
+    return {name: batcher.stats() for name, batcher in list(_batchers.items())}
@@ -8,7 +8,6 @@ Milvus Vector Database Client - Interface for Milvus operations.
 import os
 import sys
 import threading
-import asyncio
 import json
 from typing import List, Dict, Union, Optional, Any, Tuple
 
@@ -17,6 +16,8 @@ import numpy as np
 
 from config.config import CONFIG
 from embedding.embedding import get_embedding
+from retrieval.executor_pool import get_executor
+from retrieval.micro_batcher import MicroBatcher, DEFAULT_MAX_BATCH_SIZE, DEFAULT_BATCH_WINDOW
 from utils.logging_config_helper import get_configured_logger
 from utils.logger import LogLevel
 
@@ -55,6 +56,19 @@ class MilvusVectorClient:
             
         self.default_collection_name = self.endpoint_config.index_name or "prod_collection"
         logger.info(f"Default collection name: {self.default_collection_name}")
+        
+        # Blocking pymilvus calls run on a dedicated pool instead of the loop's default executor
+        self._executor = get_executor(self.endpoint_name, getattr(self.endpoint_config, 'executor_threads', None))
+        
+        # Concurrent single-vector searches are coalesced into multi-vector searches
+        batch_size = getattr(self.endpoint_config, 'search_batch_size', None)
+        batch_window = getattr(self.endpoint_config, 'search_batch_window', None)
+        self._search_batcher = MicroBatcher(
+            self.endpoint_name,
+            self._run_search_batch,
+            max_batch_size=batch_size if batch_size is not None else DEFAULT_MAX_BATCH_SIZE,
+            window=batch_window if batch_window is not None else DEFAULT_BATCH_WINDOW
+        )
     
     def _get_endpoint_config(self):
         """Get the Milvus endpoint configuration from CONFIG"""
@@ -104,6 +118,10 @@ class MilvusVectorClient:
                     
         return self._milvus_clients[client_key]
     
+    async def warmup(self):
+        """Create the Milvus client and verify the connection before the first request needs it."""
+        await self._executor.run(self._get_milvus_client)
+    
     def collection_exists(self, collection_name: Optional[str] = None, 
                          embedding_size: str = "small") -> bool:
         """
@@ -200,16 +218,17 @@ class MilvusVectorClient:
             int: Number of documents deleted
         """
         collection_name = collection_name or self.default_collection_name
-        client = self._get_milvus_client(embedding_size)
         
-        if not client.has_collection(collection_name):
+        if not await self._executor.run(self.collection_exists, collection_name, embedding_size):
             logger.warning(f"Collection '{collection_name}' does not exist")
             return 0
         
+        client = self._get_milvus_client(embedding_size)
+        
         try:
             # Run the delete operation asynchronously
-            return await asyncio.get_event_loop().run_in_executor(
-                None, self._delete_documents_by_site_sync, site, collection_name, client
+            return await self._executor.run(
+                self._delete_documents_by_site_sync, site, collection_name, client
             )
         except Exception as e:
             logger.error(f"Error deleting documents for site {site}: {str(e)}")
@@ -270,11 +289,11 @@ class MilvusVectorClient:
         collection_name = collection_name or self.default_collection_name
         
         # Ensure collection exists
-        self.ensure_collection_exists(collection_name, embedding_size)
+        await self._executor.run(self.ensure_collection_exists, collection_name, embedding_size)
         
         # Run the upload operation asynchronously
-        return await asyncio.get_event_loop().run_in_executor(
-            None, self._upload_documents_sync, documents, collection_name, embedding_size
+        return await self._executor.run(
+            self._upload_documents_sync, documents, collection_name, embedding_size
         )
     
     def _upload_documents_sync(self, documents: List[Dict[str, Any]], 
@@ -318,22 +337,52 @@ class MilvusVectorClient:
             collection_name: Optional collection name (defaults to configured name)
             query_params: Additional query parameters
             
+        Returns:
+            List[List[str]]: List of search results in format [url, text_json, name, site]
+        """
+        logger.debug(f"Query: {query}")
+        
+        # Generate embedding for the query
+        embedding = await get_embedding(
+            query,
+            provider=getattr(self.endpoint_config, 'embedding_provider', None),
+            model=getattr(self.endpoint_config, 'embedding_model', None)
+        )
+        logger.debug(f"Generated embedding with dimension: {len(embedding)}")
+        
+        return await self.search_by_vector(embedding, site, num_results, collection_name, query_params)
+    
+    async def search_by_vector(self, embedding: List[float], site: Union[str, List[str]],
+                               num_results: int = 50, collection_name: Optional[str] = None,
+                               query_params: Optional[Dict[str, Any]] = None,
+                               include_schema: bool = True) -> List[List[str]]:
+        """
+        Search the Milvus collection with a precomputed query embedding.
+        
+        Args:
+            embedding: The query embedding vector
+            site: Site to filter by (string or list of strings, or "all")
+            num_results: Maximum number of results to return
+            collection_name: Optional collection name (defaults to configured name)
+            query_params: Additional query parameters
+            include_schema: If False, the text field is neither fetched nor decoded
+                and schema_json is None (see fetch_schema_json)
+            
         Returns:
             List[List[str]]: List of search results in format [url, text_json, name, site]
         """
         collection_name = collection_name or self.default_collection_name
         logger.info(f"Starting Milvus search - collection: {collection_name}, site: {site}, num_results: {num_results}")
-        logger.debug(f"Query: {query}")
         
         try:
-            # Generate embedding for the query
-            embedding = await get_embedding(query)
-            logger.debug(f"Generated embedding with dimension: {len(embedding)}")
-            
-            # Run the search operation asynchronously
-            results = await asyncio.get_event_loop().run_in_executor(
-                None, self._search_sync, query, site, num_results, embedding, collection_name, query_params
-            )
+            if self._search_batcher.enabled:
+                key = (collection_name, self._site_filter(site), num_results, include_schema)
+                results = await self._search_batcher.submit(key, embedding)
+            else:
+                results = await self._executor.run(
+                    self._search_sync, site, num_results, embedding, collection_name, query_params,
+                    include_schema
+                )
             
             logger.info(f"Milvus search completed successfully, found {len(results)} results")
             return results
@@ -348,61 +397,80 @@ class MilvusVectorClient:
                     "error_message": str(e),
                     "collection": collection_name,
                     "site": site,
-                    "query_length": len(query)
+                    "embedding_dim": len(embedding)
                 }
             )
             raise
     
-    def _search_sync(self, query: str, site: Union[str, List[str]], num_results: int, 
+    def _site_filter(self, site: Union[str, List[str]]) -> Optional[str]:
+        """Build the Milvus filter expression for a site argument (None for all sites)."""
+        if site == "all":
+            return None
+        if isinstance(site, list):
+            return " || ".join([f"site == '{s}'" for s in site])
+        return f"site == '{site}'"
+    
+    def _format_hits(self, hits, include_schema: bool = True) -> List[List[Any]]:
+        """Convert the hits for one query vector into [url, schema_json, name, site, distance] rows."""
+        retval = []
+        for item in hits:
+            ent = item["entity"]
+            if not include_schema:
+                retval.append([ent["url"], None, ent["name"], ent["site"], item.get("distance")])
+                continue
+            try:
+                # Parse text field as JSON
+                schema_json = json.loads(ent["text"])
+                retval.append([ent["url"], schema_json, ent["name"], ent["site"], item.get("distance")])
+            except json.JSONDecodeError as e:
+                logger.error(f"Failed to parse text field as JSON: {str(e)}")
+                continue
+        return retval
+    
+    def _search_many_sync(self, embeddings: List[List[float]], site_filter: Optional[str],
+                          num_results: int, collection_name: str,
+                          include_schema: bool = True) -> List[List[List[Any]]]:
+        """
+        Run one Milvus search for several query vectors sharing a filter and limit.
+        
+        Returns:
+            One result list per query vector, in input order
+        """
+        client = self._get_milvus_client()
+        search_args = {
+            "collection_name": collection_name,
+            "data": embeddings,
+            "limit": num_results,
+            "output_fields": ["url", "text", "name", "site"] if include_schema else ["url", "name", "site"],
+        }
+        if site_filter:
+            search_args["filter"] = site_filter
+        res = client.search(**search_args)
+        
+        results = [self._format_hits(hits, include_schema) for hits in (res or [])]
+        # Pad in case the server returned fewer result sets than vectors
+        results.extend([] for _ in range(len(embeddings) - len(results)))
+        return results
+    
+    async def _run_search_batch(self, key: Tuple[str, Optional[str], int, bool],
+                                embeddings: List[List[float]]) -> List[List[List[Any]]]:
+        """Micro-batcher runner: search all queued vectors that share a batch key."""
+        collection_name, site_filter, num_results, include_schema = key
+        logger.debug(f"Executing batched Milvus search - vectors: {len(embeddings)}, filter: {site_filter}")
+        return await self._executor.run(
+            self._search_many_sync, embeddings, site_filter, num_results, collection_name, include_schema
+        )
+    
+    def _search_sync(self, site: Union[str, List[str]], num_results: int, 
                    embedding: List[float], collection_name: str, 
-                   query_params: Optional[Dict[str, Any]]) -> List[List[str]]:
+                   query_params: Optional[Dict[str, Any]],
+                   include_schema: bool = True) -> List[List[str]]:
         """Synchronous implementation of search for thread execution"""
         logger.debug(f"Executing synchronous search - site: {site}, num_results: {num_results}")
         
         try:
-            client = self._get_milvus_client()
-            
-            # Perform the search based on the site parameter
-            if site == "all":
-                logger.debug(f"Searching all sites in collection: {collection_name}")
-                res = client.search(
-                    collection_name=collection_name,
-                    data=[embedding],
-                    limit=num_results,
-                    output_fields=["url", "text", "name", "site"],
-                )
-            elif isinstance(site, list):
-                site_filter = " || ".join([f"site == '{s}'" for s in site])
-                logger.debug(f"Searching sites: {site} with filter: {site_filter}")
-                res = client.search(
-                    collection_name=collection_name, 
-                    data=[embedding],
-                    filter=site_filter,
-                    limit=num_results,
-                    output_fields=["url", "text", "name", "site"],
-                )
-            else:
-                logger.debug(f"Searching site: {site} in collection: {collection_name}")
-                res = client.search(
-                    collection_name=collection_name,
-                    data=[embedding],
-                    filter=f"site == '{site}'",
-                    limit=num_results,
-                    output_fields=["url", "text", "name", "site"],
-                )
-
-            # Format the results
-            retval = []
-            if res and len(res) > 0:
-                for item in res[0]:
-                    ent = item["entity"]
-                    try:
-                        # Parse text field as JSON
-                        schema_json = json.loads(ent["text"])
-                        retval.append([ent["url"], schema_json, ent["name"], ent["site"]])
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to parse text field as JSON: {str(e)}")
-                        continue
+            retval = self._search_many_sync([embedding], self._site_filter(site), num_results,
+                                            collection_name, include_schema)[0]
             
             logger.info(f"Retrieved {len(retval)} items from Milvus")
             logger.debug(f"First result URL: {retval[0][0] if retval else 'No results'}")
@@ -412,6 +480,40 @@ class MilvusVectorClient:
             logger.exception(f"Error in _search_sync")
             raise
     
+    async def fetch_schema_json(self, urls: List[str], collection_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch and decode schema_json for a set of URLs, used to hydrate results
+        searched with include_schema=False.
+        
+        Args:
+            urls: URLs to fetch
+            collection_name: Optional collection name (defaults to configured name)
+            
+        Returns:
+            Dict[str, Any]: Mapping of URL to parsed schema_json for the URLs that were found
+        """
+        if not urls:
+            return {}
+        collection_name = collection_name or self.default_collection_name
+        return await self._executor.run(self._fetch_schema_json_sync, list(urls), collection_name)
+    
+    def _fetch_schema_json_sync(self, urls: List[str], collection_name: str) -> Dict[str, Any]:
+        """Synchronous implementation of fetch_schema_json for thread execution"""
+        client = self._get_milvus_client()
+        res = client.query(
+            collection_name=collection_name,
+            filter=f"url in {json.dumps(urls)}",
+            output_fields=["url", "text"],
+        )
+        
+        schemas = {}
+        for ent in res:
+            try:
+                schemas[ent["url"]] = json.loads(ent["text"])
+            except json.JSONDecodeError as e:
+                logger.error(f"Failed to parse text field as JSON: {str(e)}")
+        return schemas
+    
     async def search_by_url(self, url: str, collection_name: Optional[str] = None) -> Optional[List[str]]:
         """
         Retrieve a record by its exact URL.
@@ -428,8 +530,8 @@ class MilvusVectorClient:
         
         try:
             # Run the search by URL operation asynchronously
-            return await asyncio.get_event_loop().run_in_executor(
-                None, self._search_by_url_sync, url, collection_name
+            return await self._executor.run(
+                self._search_by_url_sync, url, collection_name
             )
         except Exception as e:
             logger.exception(f"Error retrieving item with URL: {url}")
@@ -471,6 +573,40 @@ class MilvusVectorClient:
             logger.error(f"Failed to parse text field as JSON: {str(e)}")
             return None
     
+    async def search_by_urls(self, urls: List[str],
+                             collection_name: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Retrieve several records by URL with a single query.
+        
+        Args:
+            urls: URLs to look up
+            collection_name: Optional collection name (defaults to configured name)
+            
+        Returns:
+            Dict[str, List[str]]: Mapping of URL to [url, schema_json, name, site] for the URLs that were found
+        """
+        if not urls:
+            return {}
+        collection_name = collection_name or self.default_collection_name
+        return await self._executor.run(self._search_by_urls_sync, list(urls), collection_name)
+    
+    def _search_by_urls_sync(self, urls: List[str], collection_name: str) -> Dict[str, List[str]]:
+        """Synchronous implementation of search_by_urls for thread execution"""
+        client = self._get_milvus_client()
+        res = client.query(
+            collection_name=collection_name,
+            filter=f"url in {json.dumps(urls)}",
+            output_fields=["url", "text", "name", "site"],
+        )
+        
+        found = {}
+        for item in res:
+            try:
+                found[item["url"]] = [item["url"], json.loads(item["text"]), item["name"], item["site"]]
+            except json.JSONDecodeError as e:
+                logger.error(f"Failed to parse text field as JSON: {str(e)}")
+        return found
+    
     async def search_all_sites(self, query: str, num_results: int = 50, 
                              collection_name: Optional[str] = None,
                              query_params: Optional[Dict[str, Any]] = None) -> List[List[str]]:
@@ -506,8 +642,8 @@ class MilvusVectorClient:
         
         try:
             # Run the get_sites operation asynchronously
-            return await asyncio.get_event_loop().run_in_executor(
-                None, self._get_sites_sync, collection_name, embedding_size
+            return await self._executor.run(
+                self._get_sites_sync, collection_name, embedding_size
             )
         except Exception as e:
             logger.exception(f"Error retrieving sites from collection '{collection_name}': {str(e)}")
@@ -541,6 +677,31 @@ class MilvusVectorClient:
             batch_size = 10000
             offset = 0
             
+            # Prefer the primary-key iterator: offset paging gets slower with every
+            # page and is capped by Milvus' max offset+limit window
+            if hasattr(client, "query_iterator"):
+                iterator = client.query_iterator(
+                    collection_name=collection_name,
+                    batch_size=batch_size,
+                    filter="",
+                    output_fields=["site"]
+                )
+                try:
+                    while True:
+                        results = iterator.next()
+                        if not results:
+                            break
+                        for result in results:
+                            site = result.get("site")
+                            if site:
+                                sites.add(site)
+                finally:
+                    iterator.close()
+                
+                site_list = sorted(sites)
+                logger.info(f"Found {len(site_list)} unique sites in collection '{collection_name}'")
+                return site_list
+            
             while True:
                 try:
                     # Query a batch of records, only getting the site field
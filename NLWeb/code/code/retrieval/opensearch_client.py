@@ -8,17 +8,31 @@ OpenSearch Client - Interface for OpenSearch operations.
 import time
 import threading
 import base64
-import json
 from typing import List, Dict, Union, Optional, Any
 import httpx
 
 from config.config import CONFIG
 from embedding.embedding import get_embedding
+from retrieval.bulk_writer import iter_bulk_chunks, write_bulk_chunks, bulk_settings, MAX_REPORTED_FAILURES
 from utils.logging_config_helper import get_configured_logger
 from utils.logger import LogLevel
 
 logger = get_configured_logger("opensearch_client")
 
+# Connection pool defaults for the shared HTTP client
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+
+def _h2_available() -> bool:
+    """Return True if the h2 package needed for HTTP/2 support is installed."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
 
 class OpenSearchClient:
     """
@@ -59,8 +73,45 @@ class OpenSearchClient:
             # Default based on endpoint name for backward compatibility
             self.use_knn = 'script' not in self.endpoint_name.lower()
         
+        # Long-lived pooled HTTP client, created on first use
+        self._http_client: Optional[httpx.AsyncClient] = None
+        self._auth_headers: Optional[Dict[str, str]] = None
+        
+        # Open bulk loads per index, and the refresh_interval to restore when the last one ends
+        self._bulk_loads: Dict[str, int] = {}
+        self._saved_refresh_intervals: Dict[str, Optional[str]] = {}
+        
         logger.info(f"Initialized OpenSearchClient for endpoint: {self.endpoint_name}, use_knn: {self.use_knn}")
     
+    async def _get_http_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared HTTP client for this endpoint, creating it on first use.
+        
+        Connections are pooled and kept alive across requests. Pool limits come from
+        the optional max_connections, max_keepalive_connections and keepalive_expiry
+        endpoint settings; HTTP/2 is used when the h2 package is installed unless the
+        endpoint sets http2: false.
+        """
+        if self._http_client is None or self._http_client.is_closed:
+            with self._client_lock:
+                if self._http_client is None or self._http_client.is_closed:
+                    limits = httpx.Limits(
+                        max_connections=int(getattr(self.endpoint_config, 'max_connections', None) or DEFAULT_MAX_CONNECTIONS),
+                        max_keepalive_connections=int(getattr(self.endpoint_config, 'max_keepalive_connections', None) or DEFAULT_MAX_KEEPALIVE_CONNECTIONS),
+                        keepalive_expiry=float(getattr(self.endpoint_config, 'keepalive_expiry', None) or DEFAULT_KEEPALIVE_EXPIRY)
+                    )
+                    use_http2 = getattr(self.endpoint_config, 'http2', True) is not False and _h2_available()
+                    self._http_client = httpx.AsyncClient(limits=limits, http2=use_http2, timeout=60)
+                    logger.info(f"Created pooled HTTP client for {self.endpoint_name} (http2: {use_http2}, max_connections: {limits.max_connections})")
+        return self._http_client
+    
+    async def close(self):
+        """Close the pooled HTTP client and release its connections."""
+        if self._http_client is not None and not self._http_client.is_closed:
+            await self._http_client.aclose()
+            logger.info(f"Closed pooled HTTP client for {self.endpoint_name}")
+        self._http_client = None
+    
     def _get_endpoint_config(self):
         """Get the OpenSearch endpoint configuration from CONFIG"""
         endpoint_config = CONFIG.retrieval_endpoints.get(self.endpoint_name)
@@ -83,6 +134,9 @@ class OpenSearchClient:
         Get authentication headers for OpenSearch requests.
         Supports both basic auth (username:password) and API key authentication.
         """
+        if self._auth_headers is not None:
+            return self._auth_headers
+        
         headers = {
             "Content-Type": "application/json",
             "Accept": "application/json"
@@ -96,6 +150,7 @@ class OpenSearchClient:
             # API key authentication
             headers["Authorization"] = f"Bearer {self.credentials}"
         
+        self._auth_headers = headers
         return headers
     
     async def create_index_if_not_exists(self, index_name: Optional[str] = None, 
@@ -114,15 +169,15 @@ class OpenSearchClient:
         
         # Check if index already exists
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.head(
-                    f"{self.api_endpoint}/{index_name}",
-                    headers=self._get_auth_headers(),
-                    timeout=30
-                )
-                if response.status_code == 200:
-                    logger.info(f"Index {index_name} already exists")
-                    return False
+            client = await self._get_http_client()
+            response = await client.head(
+                f"{self.api_endpoint}/{index_name}",
+                headers=self._get_auth_headers(),
+                timeout=30
+            )
+            if response.status_code == 200:
+                logger.info(f"Index {index_name} already exists")
+                return False
         except Exception:
             pass  # Index doesn't exist, proceed to create
         
@@ -208,18 +263,18 @@ class OpenSearchClient:
             }
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.put(
-                    f"{self.api_endpoint}/{index_name}",
-                    json=index_mapping,
-                    headers=self._get_auth_headers(),
-                    timeout=60
-                )
-                response.raise_for_status()
-                
-                logger.info(f"Successfully created index {index_name} with kNN vector mapping")
-                return True
-                
+            client = await self._get_http_client()
+            response = await client.put(
+                f"{self.api_endpoint}/{index_name}",
+                json=index_mapping,
+                headers=self._get_auth_headers(),
+                timeout=60
+            )
+            response.raise_for_status()
+            
+            logger.info(f"Successfully created index {index_name} with kNN vector mapping")
+            return True
+            
         except Exception as e:
             error_details = str(e)
             # Try to get more details from the response if it's an HTTP error
@@ -253,22 +308,22 @@ class OpenSearchClient:
         index_name = index_name or self.default_index_name
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.delete(
-                    f"{self.api_endpoint}/{index_name}",
-                    headers=self._get_auth_headers(),
-                    timeout=30
-                )
+            client = await self._get_http_client()
+            response = await client.delete(
+                f"{self.api_endpoint}/{index_name}",
+                headers=self._get_auth_headers(),
+                timeout=30
+            )
+            
+            if response.status_code == 200:
+                logger.info(f"Successfully deleted index {index_name}")
+                return True
+            elif response.status_code == 404:
+                logger.info(f"Index {index_name} does not exist")
+                return False
+            else:
+                response.raise_for_status()
                 
-                if response.status_code == 200:
-                    logger.info(f"Successfully deleted index {index_name}")
-                    return True
-                elif response.status_code == 404:
-                    logger.info(f"Index {index_name} does not exist")
-                    return False
-                else:
-                    response.raise_for_status()
-                    
         except Exception as e:
             logger.exception(f"Error deleting index {index_name}: {e}")
             logger.log_with_context(
@@ -327,21 +382,21 @@ class OpenSearchClient:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_endpoint}/{index_name}/_delete_by_query",
-                    json=delete_query,
-                    headers=self._get_auth_headers(),
-                    timeout=60
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                deleted_count = result.get('deleted', 0)
-                
-                logger.info(f"Successfully deleted {deleted_count} documents for site: {site}")
-                return deleted_count
-                
+            client = await self._get_http_client()
+            response = await client.post(
+                f"{self.api_endpoint}/{index_name}/_delete_by_query",
+                json=delete_query,
+                headers=self._get_auth_headers(),
+                timeout=60
+            )
+            response.raise_for_status()
+            
+            result = response.json()
+            deleted_count = result.get('deleted', 0)
+            
+            logger.info(f"Successfully deleted {deleted_count} documents for site: {site}")
+            return deleted_count
+            
         except Exception as e:
             logger.exception(f"Error deleting documents for site {site}: {e}")
             logger.log_with_context(
@@ -360,6 +415,9 @@ class OpenSearchClient:
         """
         Upload documents to OpenSearch using bulk API.
         
+        Documents are streamed in chunks bounded by bulk_chunk_docs and
+        bulk_chunk_bytes, with up to bulk_concurrency bulk requests in flight.
+        
         Args:
             documents: List of document objects with keys: url, site, schema_json, name, embedding
             **kwargs: Additional parameters
@@ -377,67 +435,57 @@ class OpenSearchClient:
         # Ensure index exists with proper kNN mapping
         await self.create_index_if_not_exists(index_name)
         
-        # Prepare bulk request body
-        bulk_body = []
-        for doc in documents:
-            # Index action metadata
-            action = {
-                "index": {
-                    "_index": index_name,
-                    "_id": doc.get('url', '')  # Use URL as document ID
+        def bulk_documents():
+            for doc in documents:
+                url = doc.get('url', '')
+                # Use URL as document ID
+                yield url, {"index": {"_index": index_name, "_id": url}}, {
+                    "url": url,
+                    "site": doc.get('site', ''),
+                    "schema_json": doc.get('schema_json', '{}'),
+                    "name": doc.get('name', ''),
+                    "embedding": doc.get('embedding', [])
                 }
-            }
-            bulk_body.append(action)
-            
-            # Document source
-            doc_source = {
-                "url": doc.get('url', ''),
-                "site": doc.get('site', ''),
-                "schema_json": doc.get('schema_json', '{}'),
-                "name": doc.get('name', ''),
-                "embedding": doc.get('embedding', [])
-            }
-            bulk_body.append(doc_source)
+        
+        headers = dict(self._get_auth_headers())
+        headers["Content-Type"] = "application/x-ndjson"
+        
+        async def send_chunk(chunk):
+            lines, _urls = chunk
+            response = await client.post(
+                f"{self.api_endpoint}/_bulk",
+                content=b'\n'.join(lines) + b'\n',
+                headers=headers,
+                timeout=120  # Longer timeout for bulk operations
+            )
+            response.raise_for_status()
+            return response.json()
+        
+        max_docs, max_bytes, concurrency = bulk_settings(self.endpoint_config)
         
         try:
-            # Use proper JSON serialization for bulk API
-            bulk_lines = []
-            for item in bulk_body:
-                bulk_lines.append(json.dumps(item))
-            bulk_data = '\n'.join(bulk_lines) + '\n'
-            
-            headers = self._get_auth_headers()
-            headers["Content-Type"] = "application/x-ndjson"
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_endpoint}/_bulk",
-                    content=bulk_data,
-                    headers=headers,
-                    timeout=120  # Longer timeout for bulk operations
+            client = await self._get_http_client()
+            successful_count, failures = await write_bulk_chunks(
+                iter_bulk_chunks(bulk_documents(), max_docs, max_bytes),
+                send_chunk,
+                concurrency
+            )
+            
+            if failures:
+                logger.log_with_context(
+                    LogLevel.WARNING,
+                    "Some documents failed to upload",
+                    {
+                        "failed_count": len(failures),
+                        "document_count": len(documents),
+                        "index_name": index_name,
+                        "failures": failures[:MAX_REPORTED_FAILURES]
+                    }
                 )
-                response.raise_for_status()
-                
-                result = response.json()
-                
-                # Count successful uploads
-                successful_count = 0
-                errors = []
-                
-                if 'items' in result:
-                    for item in result['items']:
-                        if 'index' in item:
-                            if item['index'].get('status') in [200, 201]:
-                                successful_count += 1
-                            else:
-                                errors.append(item['index'].get('error', 'Unknown error'))
-                
-                if errors:
-                    logger.warning(f"Some documents failed to upload. Errors: {errors[:5]}...")  # Show first 5 errors
-                
-                logger.info(f"Successfully uploaded {successful_count} documents to index: {index_name}")
-                return successful_count
-                
+            
+            logger.info(f"Successfully uploaded {successful_count} documents to index: {index_name}")
+            return successful_count
+            
         except Exception as e:
             logger.exception(f"Error uploading documents: {e}")
             logger.log_with_context(
@@ -452,6 +500,75 @@ class OpenSearchClient:
             )
             raise
     
+    async def begin_bulk_load(self, **kwargs):
+        """
+        Prepare an index for a large load.
+        
+        Disables periodic refresh (refresh_interval -1) unless the endpoint sets
+        bulk_disable_refresh: false. Loads may nest or overlap; the index is
+        restored when the last one ends.
+        
+        Args:
+            **kwargs: Additional parameters (index_name)
+        """
+        index_name = kwargs.get('index_name', self.default_index_name)
+        self._bulk_loads[index_name] = self._bulk_loads.get(index_name, 0) + 1
+        if self._bulk_loads[index_name] > 1:
+            return
+        if getattr(self.endpoint_config, 'bulk_disable_refresh', True) is False:
+            return
+        
+        try:
+            await self.create_index_if_not_exists(index_name)
+            client = await self._get_http_client()
+            response = await client.get(
+                f"{self.api_endpoint}/{index_name}/_settings/index.refresh_interval",
+                headers=self._get_auth_headers()
+            )
+            response.raise_for_status()
+            current = response.json().get(index_name, {}).get("settings", {}).get("index", {}).get("refresh_interval")
+            # A leftover -1 from an interrupted load restores to the default
+            self._saved_refresh_intervals[index_name] = None if current == "-1" else current
+            response = await client.put(
+                f"{self.api_endpoint}/{index_name}/_settings",
+                json={"index": {"refresh_interval": "-1"}},
+                headers=self._get_auth_headers()
+            )
+            response.raise_for_status()
+            logger.info(f"Disabled refresh on index {index_name} for bulk load")
+        except Exception as e:
+            logger.warning(f"Could not disable refresh on index {index_name}: {e}")
+    
+    async def end_bulk_load(self, **kwargs):
+        """
+        Finish a load started with begin_bulk_load: restore refresh_interval and refresh once.
+        
+        Args:
+            **kwargs: Additional parameters (index_name)
+        """
+        index_name = kwargs.get('index_name', self.default_index_name)
+        remaining = self._bulk_loads.get(index_name, 0) - 1
+        if remaining > 0:
+            self._bulk_loads[index_name] = remaining
+            return
+        self._bulk_loads.pop(index_name, None)
+        
+        client = await self._get_http_client()
+        if index_name in self._saved_refresh_intervals:
+            interval = self._saved_refresh_intervals.pop(index_name)
+            response = await client.put(
+                f"{self.api_endpoint}/{index_name}/_settings",
+                json={"index": {"refresh_interval": interval}},
+                headers=self._get_auth_headers()
+            )
+            response.raise_for_status()
+            logger.info(f"Restored refresh_interval {interval or 'default'} on index {index_name}")
+        response = await client.post(
+            f"{self.api_endpoint}/{index_name}/_refresh",
+            headers=self._get_auth_headers()
+        )
+        response.raise_for_status()
+    
     async def search(self, query: str, site: Union[str, List[str]], 
                     num_results: int = 50, **kwargs) -> List[List[str]]:
         """
@@ -466,14 +583,39 @@ class OpenSearchClient:
         Returns:
             List[List[str]]: List of search results [url, schema_json, name, site]
         """
-        index_name = kwargs.get('index_name', self.default_index_name)
-        logger.info(f"Starting OpenSearch - query: '{query[:50]}...', site: {site}, index: {index_name}")
+        logger.info(f"Starting OpenSearch - query: '{query[:50]}...', site: {site}")
         
         start_embed = time.time()
-        embedding = await get_embedding(query)
+        embedding = await get_embedding(
+            query,
+            provider=getattr(self.endpoint_config, 'embedding_provider', None),
+            model=getattr(self.endpoint_config, 'embedding_model', None)
+        )
         embed_time = time.time() - start_embed
         logger.debug(f"Embedding generated in {embed_time:.2f}s, dimension: {len(embedding)}")
         
+        return await self.search_by_vector(embedding, site, num_results, **kwargs)
+    
+    async def search_by_vector(self, embedding: List[float], site: Union[str, List[str]],
+                               num_results: int = 50, **kwargs) -> List[List[str]]:
+        """
+        Search for documents using a precomputed query embedding.
+        
+        Args:
+            embedding: The query embedding vector
+            site: Site identifier, list of sites, or "all"
+            num_results: Maximum number of results to return
+            **kwargs: Additional parameters; include_schema=False skips fetching
+                schema_json, which is then None (see fetch_schema_json)
+            
+        Returns:
+            List[List[str]]: List of search results [url, schema_json, name, site]
+        """
+        index_name = kwargs.get('index_name', self.default_index_name)
+        include_schema = kwargs.get('include_schema', True)
+        if site == "all":
+            return await self._search_all_by_vector(embedding, num_results, index_name, include_schema)
+        
         # Handle both single site and multiple sites
         if isinstance(site, str):
             sites = [site]
@@ -489,7 +631,7 @@ class OpenSearchClient:
         # Build OpenSearch query with kNN vector search and site filtering
         search_query = {
             "size": num_results,
-            "_source": ["url", "site", "schema_json", "name"],
+            "_source": ["url", "site", "schema_json", "name"] if include_schema else ["url", "site", "name"],
             "query": {
                 "bool": {
                     "must": [
@@ -509,43 +651,41 @@ class OpenSearchClient:
         
         start_retrieve = time.time()
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_endpoint}/{index_name}/_search",
-                    json=search_query,
-                    headers=self._get_auth_headers(),
-                    timeout=60
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                hits = result.get('hits', {}).get('hits', [])
-                
-                # Process results into the expected format
-                processed_results = []
-                for hit in hits:
-                    source = hit.get('_source', {})
-                    url = source.get('url', '')
-                    schema_json = source.get('schema_json', '{}')
-                    name = source.get('name', '')
-                    site_name = source.get('site', '')
-                    
-                    processed_result = [url, schema_json, name, site_name]
-                    processed_results.append(processed_result)
-                
-                retrieve_time = time.time() - start_retrieve
+            client = await self._get_http_client()
+            response = await client.post(
+                f"{self.api_endpoint}/{index_name}/_search",
+                json=search_query,
+                headers=self._get_auth_headers(),
+                timeout=60
+            )
+            response.raise_for_status()
+            
+            result = response.json()
+            hits = result.get('hits', {}).get('hits', [])
+            
+            # Process results into the expected format
+            processed_results = []
+            for hit in hits:
+                source = hit.get('_source', {})
+                url = source.get('url', '')
+                schema_json = source.get('schema_json', '{}') if include_schema else None
+                name = source.get('name', '')
+                site_name = source.get('site', '')
                 
-                logger.log_with_context(
-                    LogLevel.INFO,
-                    "OpenSearch completed",
-                    {
-                        "embedding_time": f"{embed_time:.2f}s",
-                        "retrieval_time": f"{retrieve_time:.2f}s",
-                        "total_time": f"{embed_time + retrieve_time:.2f}s",
-                        "results_count": len(processed_results)
-                    }
-                )
-                return processed_results
+                processed_result = [url, schema_json, name, site_name, hit.get('_score')]
+                processed_results.append(processed_result)
+            
+            retrieve_time = time.time() - start_retrieve
+            
+            logger.log_with_context(
+                LogLevel.INFO,
+                "OpenSearch completed",
+                {
+                    "retrieval_time": f"{retrieve_time:.2f}s",
+                    "results_count": len(processed_results)
+                }
+            )
+            return processed_results
         
         except Exception as e:
             logger.exception(f"Error in OpenSearch")
@@ -645,32 +785,32 @@ class OpenSearchClient:
             }
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_endpoint}/{index_name}/_search",
-                    json=search_query,
-                    headers=self._get_auth_headers(),
-                    timeout=60
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                hits = result.get('hits', {}).get('hits', [])
-                
-                # Process results into the expected format
-                processed_results = []
-                for hit in hits:
-                    source = hit.get('_source', {})
-                    url = source.get('url', '')
-                    schema_json = source.get('schema_json', '{}')
-                    name = source.get('name', '')
-                    site = source.get('site', '')
-                    
-                    processed_result = [url, schema_json, name, site]
-                    processed_results.append(processed_result)
+            client = await self._get_http_client()
+            response = await client.post(
+                f"{self.api_endpoint}/{index_name}/_search",
+                json=search_query,
+                headers=self._get_auth_headers(),
+                timeout=60
+            )
+            response.raise_for_status()
+            
+            result = response.json()
+            hits = result.get('hits', {}).get('hits', [])
+            
+            # Process results into the expected format
+            processed_results = []
+            for hit in hits:
+                source = hit.get('_source', {})
+                url = source.get('url', '')
+                schema_json = source.get('schema_json', '{}')
+                name = source.get('name', '')
+                site = source.get('site', '')
                 
-                logger.debug(f"Retrieved {len(processed_results)} results")
-                return processed_results
+                processed_result = [url, schema_json, name, site, hit.get('_score')]
+                processed_results.append(processed_result)
+            
+            logger.debug(f"Retrieved {len(processed_results)} results")
+            return processed_results
         
         except Exception as e:
             logger.exception(f"Error in _search_by_site_and_vector")
@@ -686,6 +826,40 @@ class OpenSearchClient:
             )
             raise
     
+    async def fetch_schema_json(self, urls: List[str], index_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch schema_json for a set of URLs with a single _mget, used to hydrate
+        results searched with include_schema=False.
+        
+        Args:
+            urls: URLs to fetch
+            index_name: Optional index name (defaults to configured index name)
+            
+        Returns:
+            Dict[str, Any]: Mapping of URL to schema_json for the URLs that were found
+        """
+        if not urls:
+            return {}
+        index_name = index_name or self.default_index_name
+        
+        # Documents are indexed with their URL as the id
+        client = await self._get_http_client()
+        response = await client.post(
+            f"{self.api_endpoint}/{index_name}/_mget",
+            json={"ids": list(urls)},
+            params={"_source": "url,schema_json"},
+            headers=self._get_auth_headers(),
+            timeout=60
+        )
+        response.raise_for_status()
+        
+        schemas = {}
+        for doc in response.json().get('docs', []):
+            if doc.get('found'):
+                source = doc.get('_source', {})
+                schemas[source.get('url', doc.get('_id'))] = source.get('schema_json', '{}')
+        return schemas
+    
     async def search_by_url(self, url: str, index_name: Optional[str] = None, 
                           top_n: int = 1) -> Optional[List[str]]:
         """
@@ -713,30 +887,30 @@ class OpenSearchClient:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_endpoint}/{index_name}/_search",
-                    json=search_query,
-                    headers=self._get_auth_headers(),
-                    timeout=60
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                hits = result.get('hits', {}).get('hits', [])
-                
-                if hits:
-                    source = hits[0].get('_source', {})
-                    logger.info(f"Successfully retrieved item for URL: {url}")
-                    return [
-                        source.get('url', ''),
-                        source.get('schema_json', '{}'),
-                        source.get('name', ''),
-                        source.get('site', '')
-                    ]
-                
-                logger.warning(f"No item found for URL: {url}")
-                return None
+            client = await self._get_http_client()
+            response = await client.post(
+                f"{self.api_endpoint}/{index_name}/_search",
+                json=search_query,
+                headers=self._get_auth_headers(),
+                timeout=60
+            )
+            response.raise_for_status()
+            
+            result = response.json()
+            hits = result.get('hits', {}).get('hits', [])
+            
+            if hits:
+                source = hits[0].get('_source', {})
+                logger.info(f"Successfully retrieved item for URL: {url}")
+                return [
+                    source.get('url', ''),
+                    source.get('schema_json', '{}'),
+                    source.get('name', ''),
+                    source.get('site', '')
+                ]
+            
+            logger.warning(f"No item found for URL: {url}")
+            return None
         
         except Exception as e:
             logger.exception(f"Error retrieving item with URL: {url}")
@@ -751,6 +925,63 @@ class OpenSearchClient:
             )
             raise
     
+    async def search_by_urls(self, urls: List[str], index_name: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Retrieve several records by exact URL
+        
+        Documents are fetched with one _mget on their URL ids; any URL not found
+        that way (documents indexed under another id) is looked up with a single
+        terms query.
+        
+        Args:
+            urls: URLs to look up
+            index_name: Optional index name (defaults to configured index name)
+            
+        Returns:
+            Dict[str, List[str]]: Mapping of URL to [url, schema_json, name, site] for the URLs that were found
+        """
+        if not urls:
+            return {}
+        index_name = index_name or self.default_index_name
+        wanted = set(urls)
+        found: Dict[str, List[str]] = {}
+        
+        def collect(source: Dict[str, Any]):
+            url = source.get('url', '')
+            if url in wanted and url not in found:
+                found[url] = [url, source.get('schema_json', '{}'), source.get('name', ''), source.get('site', '')]
+        
+        client = await self._get_http_client()
+        response = await client.post(
+            f"{self.api_endpoint}/{index_name}/_mget",
+            json={"ids": list(wanted)},
+            params={"_source": "url,site,schema_json,name"},
+            headers=self._get_auth_headers(),
+            timeout=60
+        )
+        response.raise_for_status()
+        for doc in response.json().get('docs', []):
+            if doc.get('found'):
+                collect(doc.get('_source', {}))
+        
+        missing = [url for url in wanted if url not in found]
+        if missing:
+            response = await client.post(
+                f"{self.api_endpoint}/{index_name}/_search",
+                json={
+                    "size": len(missing),
+                    "_source": ["url", "site", "schema_json", "name"],
+                    "query": {"terms": {"url.keyword": missing}}
+                },
+                headers=self._get_auth_headers(),
+                timeout=60
+            )
+            response.raise_for_status()
+            for hit in response.json().get('hits', {}).get('hits', []):
+                collect(hit.get('_source', {}))
+        
+        return found
+    
     async def search_all_sites(self, query: str, top_n: int = 10, 
                              index_name: Optional[str] = None) -> List[List[str]]:
         """
@@ -764,85 +995,17 @@ class OpenSearchClient:
         Returns:
             List[List[str]]: List of search results
         """
-        index_name = index_name or self.default_index_name
-        logger.info(f"Starting global OpenSearch (all sites) - index: {index_name}, top_n: {top_n}")
         logger.debug(f"Query: {query}")
         
         try:
-            query_embedding = await get_embedding(query)
+            query_embedding = await get_embedding(
+                query,
+                provider=getattr(self.endpoint_config, 'embedding_provider', None),
+                model=getattr(self.endpoint_config, 'embedding_model', None)
+            )
             logger.debug(f"Generated embedding with dimension: {len(query_embedding)}")
             
-            # Build OpenSearch query based on k-NN availability (no site filter)
-            if self.use_knn:
-                # Use k-NN plugin query
-                search_query = {
-                    "size": top_n,
-                    "_source": ["url", "site", "schema_json", "name"],
-                    "query": {
-                        "knn": {
-                            "embedding": {
-                                "vector": query_embedding,
-                                "k": top_n
-                            }
-                        }
-                    }
-                }
-            else:
-                # Use script_score for vector similarity
-                search_query = {
-                    "size": top_n,
-                    "_source": ["url", "site", "schema_json", "name"],
-                    "query": {
-                        "script_score": {
-                            "query": {
-                                "match_all": {}
-                            },
-                            "script": {
-                                "source": """
-                                    double dotProduct = 0.0;
-                                    double normA = 0.0;
-                                    double normB = 0.0;
-                                    for (int i = 0; i < params.query_vector.length; i++) {
-                                        dotProduct += params.query_vector[i] * doc['embedding'][i];
-                                        normA += params.query_vector[i] * params.query_vector[i];
-                                        normB += doc['embedding'][i] * doc['embedding'][i];
-                                    }
-                                    return dotProduct / (Math.sqrt(normA) * Math.sqrt(normB)) + 1.0;
-                                """,
-                                "params": {
-                                    "query_vector": query_embedding
-                                }
-                            }
-                        }
-                    }
-                }
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_endpoint}/{index_name}/_search",
-                    json=search_query,
-                    headers=self._get_auth_headers(),
-                    timeout=60
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                hits = result.get('hits', {}).get('hits', [])
-                
-                # Process results into the expected format
-                processed_results = []
-                for hit in hits:
-                    source = hit.get('_source', {})
-                    processed_result = [
-                        source.get('url', ''),
-                        source.get('schema_json', '{}'),
-                        source.get('name', ''),
-                        source.get('site', '')
-                    ]
-                    processed_results.append(processed_result)
-                
-                logger.info(f"Global search completed, found {len(processed_results)} results")
-                return processed_results
+            return await self._search_all_by_vector(query_embedding, top_n, index_name)
         
         except Exception as e:
             logger.exception(f"Error in search_all_sites")
@@ -857,6 +1020,98 @@ class OpenSearchClient:
             )
             raise
     
+    async def _search_all_by_vector(self, query_embedding: List[float], top_n: int = 10,
+                                    index_name: Optional[str] = None,
+                                    include_schema: bool = True) -> List[List[str]]:
+        """
+        Internal method to retrieve top n records across all sites ranked by vector similarity
+        
+        Args:
+            query_embedding: The embedding vector to search with
+            top_n: Maximum number of results to return
+            index_name: Optional index name (defaults to configured index name)
+            include_schema: If False, schema_json is not fetched and is returned as None
+            
+        Returns:
+            List[List[str]]: List of search results
+        """
+        index_name = index_name or self.default_index_name
+        source_fields = ["url", "site", "schema_json", "name"] if include_schema else ["url", "site", "name"]
+        logger.info(f"Starting global OpenSearch (all sites) - index: {index_name}, top_n: {top_n}")
+        
+        # Build OpenSearch query based on k-NN availability (no site filter)
+        if self.use_knn:
+            # Use k-NN plugin query
+            search_query = {
+                "size": top_n,
+                "_source": source_fields,
+                "query": {
+                    "knn": {
+                        "embedding": {
+                            "vector": query_embedding,
+                            "k": top_n
+                        }
+                    }
+                }
+            }
+        else:
+            # Use script_score for vector similarity
+            search_query = {
+                "size": top_n,
+                "_source": source_fields,
+                "query": {
+                    "script_score": {
+                        "query": {
+                            "match_all": {}
+                        },
+                        "script": {
+                            "source": """
+                                double dotProduct = 0.0;
+                                double normA = 0.0;
+                                double normB = 0.0;
+                                for (int i = 0; i < params.query_vector.length; i++) {
+                                    dotProduct += params.query_vector[i] * doc['embedding'][i];
+                                    normA += params.query_vector[i] * params.query_vector[i];
+                                    normB += doc['embedding'][i] * doc['embedding'][i];
+                                }
+                                return dotProduct / (Math.sqrt(normA) * Math.sqrt(normB)) + 1.0;
+                            """,
+                            "params": {
+                                "query_vector": query_embedding
+                            }
+                        }
+                    }
+                }
+            }
+        
+        client = await self._get_http_client()
+        response = await client.post(
+            f"{self.api_endpoint}/{index_name}/_search",
+            json=search_query,
+            headers=self._get_auth_headers(),
+            timeout=60
+        )
+        response.raise_for_status()
+        
+        result = response.json()
+        hits = result.get('hits', {}).get('hits', [])
+        
+        # Process results into the expected format
+        processed_results = []
+        for hit in hits:
+            source = hit.get('_source', {})
+            processed_result = [
+                source.get('url', ''),
+                source.get('schema_json', '{}') if include_schema else None,
+                source.get('name', ''),
+                source.get('site', ''),
+                hit.get('_score')
+            ]
+            processed_results.append(processed_result)
+        
+        logger.info(f"Global search completed, found {len(processed_results)} results")
+        return processed_results
+    
     async def get_sites(self, index_name: Optional[str] = None) -> List[str]:
         """
         Get list of all unique sites in the database.
@@ -884,21 +1139,21 @@ class OpenSearchClient:
         }
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.api_endpoint}/{index_name}/_search",
-                    json=aggregation_query,
-                    headers=self._get_auth_headers(),
-                    timeout=60
-                )
-                response.raise_for_status()
-                
-                result = response.json()
-                buckets = result.get('aggregations', {}).get('unique_sites', {}).get('buckets', [])
-                
-                sites = [bucket['key'] for bucket in buckets]
-                logger.info(f"Retrieved {len(sites)} unique sites")
-                return sorted(sites)
+            client = await self._get_http_client()
+            response = await client.post(
+                f"{self.api_endpoint}/{index_name}/_search",
+                json=aggregation_query,
+                headers=self._get_auth_headers(),
+                timeout=60
+            )
+            response.raise_for_status()
+            
+            result = response.json()
+            buckets = result.get('aggregations', {}).get('unique_sites', {}).get('buckets', [])
+            
+            sites = [bucket['key'] for bucket in buckets]
+            logger.info(f"Retrieved {len(sites)} unique sites")
+            return sorted(sites)
         
         except Exception as e:
             logger.exception(f"Error retrieving sites from index: {index_name}")
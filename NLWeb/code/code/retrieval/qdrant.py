@@ -5,6 +5,7 @@
 Qdrant Vector Database Client - Interface for Qdrant operations.
 """
 
+import asyncio
 import os
 import sys
 import threading
@@ -19,11 +20,21 @@ from qdrant_client.http.exceptions import UnexpectedResponse
 
 from config.config import CONFIG
 from embedding.embedding import get_embedding
+from retrieval.micro_batcher import MicroBatcher, DEFAULT_BATCH_WINDOW
 from utils.logging_config_helper import get_configured_logger
 from utils.logger import LogLevel
 
 logger = get_configured_logger("qdrant_client")
 
+# Payload fields that get a keyword index for filtering and lookups
+QDRANT_INDEXED_FIELDS = ("site", "url")
+
+# Upload pipeline defaults, overridable per endpoint
+DEFAULT_UPLOAD_BATCH_SIZE = 100
+DEFAULT_UPLOAD_CONCURRENCY = 4
+DEFAULT_UPLOAD_MAX_RETRIES = 3
+DEFAULT_UPLOAD_RETRY_BACKOFF = 0.5
+
 class QdrantVectorClient:
     """
     Client for Qdrant vector database operations, providing a unified interface for 
@@ -48,6 +59,16 @@ class QdrantVectorClient:
         self.database_path = self.endpoint_config.database_path
         self.default_collection_name = self.endpoint_config.index_name or "nlweb_collection"
         
+        # Optional micro-batching of concurrent searches into search_batch requests;
+        # disabled unless search_batch_size is set above 1
+        batch_window = getattr(self.endpoint_config, 'search_batch_window', None)
+        self._search_batcher = MicroBatcher(
+            self.endpoint_name,
+            self._run_search_batch,
+            max_batch_size=getattr(self.endpoint_config, 'search_batch_size', None) or 1,
+            window=batch_window if batch_window is not None else DEFAULT_BATCH_WINDOW
+        )
+        
         logger.info(f"Initialized QdrantVectorClient for endpoint: {self.endpoint_name}")
         if self.api_endpoint:
             logger.info(f"Using Qdrant server URL: {self.api_endpoint}")
@@ -246,6 +267,155 @@ class QdrantVectorClient:
             logger.error(f"Error checking if collection '{collection_name}' exists: {str(e)}")
             return False
     
+    def _quantization_config(self):
+        """Build the quantization config from the endpoint's quantization setting ("scalar" or "binary")."""
+        quantization = getattr(self.endpoint_config, 'quantization', None)
+        if not quantization:
+            return None
+        always_ram = getattr(self.endpoint_config, 'quantization_always_ram', True) is not False
+        if quantization == "scalar":
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=0.99,
+                    always_ram=always_ram,
+                )
+            )
+        if quantization == "binary":
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=always_ram)
+            )
+        logger.warning(f"Unknown quantization '{quantization}' for endpoint {self.endpoint_name}, ignoring")
+        return None
+    
+    def _collection_params(self, vector_size: int) -> Dict[str, Any]:
+        """
+        Build the create_collection arguments from the endpoint configuration.
+        
+        Optional endpoint settings:
+            hnsw_config: HNSW parameters (m, ef_construct, payload_m, full_scan_threshold, on_disk)
+            quantization: "scalar" (int8) or "binary"
+            quantization_always_ram: keep quantized vectors in RAM (default true)
+            on_disk_vectors: store original vectors on disk
+            on_disk_payload: store payloads on disk
+        
+        Args:
+            vector_size: Size of the embedding vectors
+            
+        Returns:
+            Dict[str, Any]: Keyword arguments for create_collection
+        """
+        params: Dict[str, Any] = {
+            "vectors_config": models.VectorParams(
+                size=vector_size,
+                distance=models.Distance.COSINE,
+                on_disk=getattr(self.endpoint_config, 'on_disk_vectors', None),
+            )
+        }
+        hnsw_config = getattr(self.endpoint_config, 'hnsw_config', None)
+        if hnsw_config:
+            params["hnsw_config"] = models.HnswConfigDiff(**hnsw_config)
+        quantization_config = self._quantization_config()
+        if quantization_config is not None:
+            params["quantization_config"] = quantization_config
+        on_disk_payload = getattr(self.endpoint_config, 'on_disk_payload', None)
+        if on_disk_payload is not None:
+            params["on_disk_payload"] = on_disk_payload
+        return params
+    
+    def _search_params(self) -> Optional[models.SearchParams]:
+        """
+        Build search-time parameters from the optional hnsw_ef, quantization_rescore
+        and quantization_oversampling endpoint settings.
+        """
+        hnsw_ef = getattr(self.endpoint_config, 'hnsw_ef', None)
+        rescore = getattr(self.endpoint_config, 'quantization_rescore', None)
+        oversampling = getattr(self.endpoint_config, 'quantization_oversampling', None)
+        if hnsw_ef is None and rescore is None and oversampling is None:
+            return None
+        quantization = None
+        if rescore is not None or oversampling is not None:
+            quantization = models.QuantizationSearchParams(rescore=rescore, oversampling=oversampling)
+        return models.SearchParams(hnsw_ef=hnsw_ef, quantization=quantization)
+    
+    async def _ensure_payload_indexes(self, collection_name: str) -> List[str]:
+        """
+        Create keyword payload indexes on site and url if they don't exist yet.
+        
+        Site filters and URL lookups then use the index instead of scanning payloads,
+        and HNSW builds filter-aware links for indexed fields (see hnsw_config.payload_m).
+        
+        Args:
+            collection_name: Name of the collection
+            
+        Returns:
+            List[str]: Fields an index was created for
+        """
+        client = await self._get_qdrant_client()
+        info = await client.get_collection(collection_name)
+        existing = set((info.payload_schema or {}).keys())
+        
+        created = []
+        for field_name in QDRANT_INDEXED_FIELDS:
+            if field_name in existing:
+                continue
+            await client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=models.PayloadSchemaType.KEYWORD,
+            )
+            created.append(field_name)
+        if created:
+            logger.info(f"Created payload indexes on {created} for collection '{collection_name}'")
+        return created
+    
+    async def migrate_collection(self, collection_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Bring an existing collection up to the endpoint configuration.
+        
+        Creates missing payload indexes and applies the configured HNSW,
+        quantization and on-disk settings. Qdrant rebuilds the affected
+        segments in the background.
+        
+        Args:
+            collection_name: Name of the collection (defaults to configured name)
+            
+        Returns:
+            Dict[str, Any]: Summary of the indexes created and settings applied
+        """
+        collection_name = collection_name or self.default_collection_name
+        client = await self._get_qdrant_client()
+        
+        if not await client.collection_exists(collection_name):
+            raise ValueError(f"Collection '{collection_name}' does not exist")
+        
+        summary: Dict[str, Any] = {
+            "collection": collection_name,
+            "indexes_created": await self._ensure_payload_indexes(collection_name),
+            "updated": []
+        }
+        
+        update_args: Dict[str, Any] = {}
+        hnsw_config = getattr(self.endpoint_config, 'hnsw_config', None)
+        if hnsw_config:
+            update_args["hnsw_config"] = models.HnswConfigDiff(**hnsw_config)
+        quantization_config = self._quantization_config()
+        if quantization_config is not None:
+            update_args["quantization_config"] = quantization_config
+        on_disk_vectors = getattr(self.endpoint_config, 'on_disk_vectors', None)
+        if on_disk_vectors is not None:
+            update_args["vectors_config"] = {"": models.VectorParamsDiff(on_disk=on_disk_vectors)}
+        on_disk_payload = getattr(self.endpoint_config, 'on_disk_payload', None)
+        if on_disk_payload is not None:
+            update_args["collection_params"] = models.CollectionParamsDiff(on_disk_payload=on_disk_payload)
+        
+        if update_args:
+            await client.update_collection(collection_name=collection_name, **update_args)
+            summary["updated"] = sorted(update_args.keys())
+        
+        logger.log_with_context(LogLevel.INFO, "Qdrant collection migrated", summary)
+        return summary
+    
     async def create_collection(self, collection_name: Optional[str] = None, 
                               vector_size: int = 1536) -> bool:
         """
@@ -271,8 +441,9 @@ class QdrantVectorClient:
             logger.info(f"Creating collection '{collection_name}' with vector size {vector_size}")
             await client.create_collection(
                 collection_name=collection_name,
-                vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE),
+                **self._collection_params(vector_size)
             )
+            await self._ensure_payload_indexes(collection_name)
             logger.info(f"Successfully created collection '{collection_name}'")
             return True
         
@@ -283,8 +454,9 @@ class QdrantVectorClient:
                 try:
                     await client.create_collection(
                         collection_name=collection_name,
-                        vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE),
+                        **self._collection_params(vector_size)
                     )
+                    await self._ensure_payload_indexes(collection_name)
                     logger.info(f"Successfully created collection '{collection_name}' on second attempt")
                     return True
                 except Exception as e2:
@@ -317,8 +489,9 @@ class QdrantVectorClient:
             logger.info(f"Creating collection '{collection_name}' with vector size {vector_size}")
             await client.create_collection(
                 collection_name=collection_name,
-                vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE),
+                **self._collection_params(vector_size)
             )
+            await self._ensure_payload_indexes(collection_name)
             
             logger.info(f"Successfully recreated collection '{collection_name}'")
             return True
@@ -330,8 +503,9 @@ class QdrantVectorClient:
                 try:
                     await client.create_collection(
                         collection_name=collection_name,
-                        vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE),
+                        **self._collection_params(vector_size)
                     )
+                    await self._ensure_payload_indexes(collection_name)
                     logger.info(f"Successfully created collection '{collection_name}' on second attempt")
                     return True
                 except Exception as e2:
@@ -405,6 +579,13 @@ class QdrantVectorClient:
         """
         Upload a batch of documents to Qdrant.
         
+        Points are upserted in batches of upload_batch_size (default 100) with up
+        to upload_concurrency (default 4) unacknowledged batches in flight. Each
+        batch is retried upload_max_retries times with exponential backoff
+        starting at upload_retry_backoff seconds. The last batch is sent with
+        wait=True once the others are acknowledged, so all points are applied
+        when this returns.
+        
         Args:
             documents: List of document objects with embedding, schema_json, etc.
             collection_name: Optional collection name (defaults to configured name)
@@ -433,65 +614,148 @@ class QdrantVectorClient:
         # Ensure collection exists
         await self.ensure_collection_exists(collection_name, vector_size)
         
+        batch_size = getattr(self.endpoint_config, 'upload_batch_size', None) or DEFAULT_UPLOAD_BATCH_SIZE
+        concurrency = getattr(self.endpoint_config, 'upload_concurrency', None) or DEFAULT_UPLOAD_CONCURRENCY
+        
         try:
-            # Convert documents to Qdrant point format
-            points = []
-            for doc in documents:
-                # Skip documents without embeddings
-                if "embedding" not in doc or not doc["embedding"]:
-                    continue
-                    
-                # Generate a deterministic UUID from the document ID or URL
-                doc_id = doc.get("id", doc.get("url", str(uuid.uuid4())))
-                point_id = str(uuid.uuid5(uuid.NAMESPACE_URL, str(doc_id)))
-                
-                points.append(models.PointStruct(
-                    id=point_id,
-                    vector=doc["embedding"],
-                    payload={
-                        "url": doc.get("url"),
-                        "name": doc.get("name"),
-                        "site": doc.get("site"),
-                        "schema_json": doc.get("schema_json")
-                    }
-                ))
-            
-            if points:
-                # Upload in batches
-                batch_size = 100  # Smaller batch size for stability
-                total_uploaded = 0
-                
-                for i in range(0, len(points), batch_size):
-                    batch = points[i:i+batch_size]
-                    try:
-                        await client.upsert(collection_name=collection_name, points=batch)
-                        total_uploaded += len(batch)
-                        logger.info(f"Uploaded batch of {len(batch)} points (total: {total_uploaded})")
-                    except Exception as e:
-                        logger.error(f"Error uploading batch: {str(e)}")
-                        # Try to create the collection if it doesn't exist
-                        if "Collection not found" in str(e):
-                            logger.info(f"Collection '{collection_name}' not found during upload. Creating it...")
-                            await client.create_collection(
-                                collection_name=collection_name,
-                                vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE),
-                            )
-                            # Try upload again
-                            await client.upsert(collection_name=collection_name, points=batch)
-                            total_uploaded += len(batch)
-                            logger.info(f"Uploaded batch of {len(batch)} points after creating collection")
-                        else:
-                            raise
+            batches = self._iter_point_batches(documents, batch_size)
+            total_uploaded = 0
+            in_flight: Set[asyncio.Task] = set()
+            pending_batch = None
+            
+            async def drain(return_when):
+                nonlocal total_uploaded
+                done, _ = await asyncio.wait(in_flight, return_when=return_when)
+                for task in done:
+                    in_flight.discard(task)
+                    # Re-raises the first failed batch
+                    total_uploaded += task.result()
+                logger.info(f"Uploaded {total_uploaded} points to collection '{collection_name}'")
+            
+            try:
+                # Keep up to `concurrency` unacknowledged upserts in flight. The
+                # most recent batch is held back so it can be sent last as the barrier.
+                for batch in batches:
+                    if pending_batch is not None:
+                        if len(in_flight) >= concurrency:
+                            await drain(asyncio.FIRST_COMPLETED)
+                        in_flight.add(asyncio.create_task(
+                            self._upsert_batch(client, collection_name, pending_batch, vector_size, wait=False)
+                        ))
+                    pending_batch = batch
                 
+                if in_flight:
+                    await drain(asyncio.ALL_COMPLETED)
+            except BaseException:
+                for task in in_flight:
+                    if task.done():
+                        if not task.cancelled():
+                            task.exception()
+                    else:
+                        task.cancel()
+                raise
+            
+            if pending_batch is not None:
+                # Final barrier: Qdrant applies updates in order, so once this
+                # upsert is applied every earlier wait=False batch is as well
+                total_uploaded += await self._upsert_batch(
+                    client, collection_name, pending_batch, vector_size, wait=True
+                )
                 logger.info(f"Successfully uploaded {total_uploaded} points to collection '{collection_name}'")
-                return total_uploaded
             
-            return 0
+            return total_uploaded
             
         except Exception as e:
             logger.exception(f"Error uploading documents to collection '{collection_name}': {str(e)}")
             raise
     
+    def _iter_point_batches(self, documents: List[Dict[str, Any]], batch_size: int):
+        """
+        Convert documents to Qdrant points lazily, one batch at a time.
+        
+        Args:
+            documents: List of document objects with embedding, schema_json, etc.
+            batch_size: Number of points per batch
+            
+        Yields:
+            Lists of at most batch_size PointStructs; documents without embeddings are skipped
+        """
+        batch = []
+        for doc in documents:
+            # Skip documents without embeddings
+            if "embedding" not in doc or not doc["embedding"]:
+                continue
+                
+            # Generate a deterministic UUID from the URL (or the document ID if there is
+            # no URL), so points can be retrieved by id in search_by_urls
+            doc_id = doc.get("url") or doc.get("id") or str(uuid.uuid4())
+            point_id = str(uuid.uuid5(uuid.NAMESPACE_URL, str(doc_id)))
+            
+            batch.append(models.PointStruct(
+                id=point_id,
+                vector=doc["embedding"],
+                payload={
+                    "url": doc.get("url"),
+                    "name": doc.get("name"),
+                    "site": doc.get("site"),
+                    "schema_json": doc.get("schema_json")
+                }
+            ))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    
+    async def _upsert_batch(self, client: AsyncQdrantClient, collection_name: str,
+                            batch: List[models.PointStruct], vector_size: int,
+                            wait: bool) -> int:
+        """
+        Upsert one batch of points, retrying with exponential backoff.
+        
+        Args:
+            client: Qdrant client
+            collection_name: Collection to write to
+            batch: Points to upsert
+            vector_size: Vector dimension, used if the collection has to be created
+            wait: Whether Qdrant should apply the update before acknowledging it
+            
+        Returns:
+            int: Number of points upserted
+        """
+        max_retries = getattr(self.endpoint_config, 'upload_max_retries', None)
+        if max_retries is None:
+            max_retries = DEFAULT_UPLOAD_MAX_RETRIES
+        backoff = getattr(self.endpoint_config, 'upload_retry_backoff', None) or DEFAULT_UPLOAD_RETRY_BACKOFF
+        
+        attempt = 0
+        while True:
+            try:
+                await client.upsert(collection_name=collection_name, points=batch, wait=wait)
+                return len(batch)
+            except Exception as e:
+                if "Collection not found" in str(e):
+                    # Collection was dropped mid-upload; recreate it and retry
+                    logger.info(f"Collection '{collection_name}' not found during upload. Creating it...")
+                    try:
+                        await client.create_collection(
+                            collection_name=collection_name,
+                            **self._collection_params(vector_size)
+                        )
+                        await self._ensure_payload_indexes(collection_name)
+                    except Exception as create_error:
+                        # Another in-flight batch may have created it already
+                        if not await client.collection_exists(collection_name):
+                            raise create_error
+                if attempt >= max_retries:
+                    logger.error(f"Error uploading batch of {len(batch)} points after {attempt + 1} attempts: {str(e)}")
+                    raise
+                delay = backoff * (2 ** attempt)
+                attempt += 1
+                logger.warning(f"Error uploading batch of {len(batch)} points (attempt {attempt}), "
+                               f"retrying in {delay:.1f}s: {str(e)}")
+                await asyncio.sleep(delay)
+    
     def _create_site_filter(self, site: Union[str, List[str]]):
         """
         Create a Qdrant filter for site filtering.
@@ -516,12 +780,14 @@ class QdrantVectorClient:
             must=[models.FieldCondition(key="site", match=models.MatchAny(any=sites))]
         )
     
-    def _format_results(self, search_result: List[models.ScoredPoint]) -> List[List[str]]:
+    def _format_results(self, search_result: List[models.ScoredPoint],
+                        include_schema: bool = True) -> List[List[str]]:
         """
-        Format Qdrant search results to match expected API: [url, text_json, name, site].
+        Format Qdrant search results to match expected API: [url, text_json, name, site, score].
         
         Args:
             search_result: Qdrant search results
+            include_schema: If False, schema_json was not fetched and is returned as None
             
         Returns:
             List[List[str]]: Formatted results
@@ -530,11 +796,11 @@ class QdrantVectorClient:
         for item in search_result:
             payload = item.payload
             url = payload.get("url", "")
-            schema = payload.get("schema_json", "")
+            schema = payload.get("schema_json", "") if include_schema else None
             name = payload.get("name", "")
             site_name = payload.get("site", "")
 
-            results.append([url, schema, name, site_name])
+            results.append([url, schema, name, site_name, item.score])
 
         return results
     
@@ -555,35 +821,76 @@ class QdrantVectorClient:
             List[List[str]]: List of search results in format [url, text_json, name, site]
         """
         collection_name = collection_name or self.default_collection_name
-        logger.info(f"Starting Qdrant search - collection: {collection_name}, site: {site}, num_results: {num_results}")
         logger.debug(f"Query: {query}")
         
-        try:
-            start_embed = time.time()
-            embedding = await get_embedding(query)
-            embed_time = time.time() - start_embed
-            logger.debug(f"Generated embedding with dimension: {len(embedding)} in {embed_time:.2f}s")
+        start_embed = time.time()
+        embedding = await get_embedding(
+            query,
+            provider=getattr(self.endpoint_config, 'embedding_provider', None),
+            model=getattr(self.endpoint_config, 'embedding_model', None)
+        )
+        embed_time = time.time() - start_embed
+        logger.debug(f"Generated embedding with dimension: {len(embedding)} in {embed_time:.2f}s")
+        
+        return await self.search_by_vector(embedding, site, num_results, collection_name, query_params)
+    
+    async def search_by_vector(self, embedding: List[float], site: Union[str, List[str]],
+                               num_results: int = 50, collection_name: Optional[str] = None,
+                               query_params: Optional[Dict[str, Any]] = None,
+                               include_schema: bool = True) -> List[List[str]]:
+        """
+        Search the Qdrant collection with a precomputed query embedding.
+        
+        Args:
+            embedding: The query embedding vector
+            site: Site to filter by (string or list of strings, or "all")
+            num_results: Maximum number of results to return
+            collection_name: Optional collection name (defaults to configured name)
+            query_params: Additional query parameters
+            include_schema: If False, only url, name and site are fetched and
+                schema_json is None (see fetch_schema_json)
             
+        Returns:
+            List[List[str]]: List of search results in format [url, text_json, name, site]
+        """
+        collection_name = collection_name or self.default_collection_name
+        logger.info(f"Starting Qdrant search - collection: {collection_name}, site: {site}, num_results: {num_results}")
+        
+        try:
             start_retrieve = time.time()
             
             # Get client and prepare filter
             client = await self._get_qdrant_client()
             filter_condition = self._create_site_filter(site)
+            with_payload = True if include_schema else ["url", "name", "site"]
             
             try:
                 # Perform the search
-                search_result = (
-                    await client.search(
-                        collection_name=collection_name,
-                        query_vector=embedding,
-                        limit=num_results,
-                        query_filter=filter_condition,
-                        with_payload=True,
+                if self._search_batcher.enabled:
+                    search_result = await self._search_batcher.submit(
+                        collection_name,
+                        models.SearchRequest(
+                            vector=embedding,
+                            filter=filter_condition,
+                            limit=num_results,
+                            with_payload=with_payload,
+                            params=self._search_params(),
+                        )
+                    )
+                else:
+                    search_result = (
+                        await client.search(
+                            collection_name=collection_name,
+                            query_vector=embedding,
+                            limit=num_results,
+                            query_filter=filter_condition,
+                            with_payload=with_payload,
+                            search_params=self._search_params(),
+                        )
                     )
-                )
                 
                 # Format the results
-                results = self._format_results(search_result)
+                results = self._format_results(search_result, include_schema)
                 
             except Exception as e:
                 # If collection doesn't exist yet
@@ -601,9 +908,7 @@ class QdrantVectorClient:
                 LogLevel.INFO,
                 "Qdrant search completed",
                 {
-                    "embedding_time": f"{embed_time:.2f}s",
                     "retrieval_time": f"{retrieve_time:.2f}s",
-                    "total_time": f"{embed_time + retrieve_time:.2f}s",
                     "results_count": len(results),
                     "embedding_dim": len(embedding),
                 }
@@ -625,7 +930,8 @@ class QdrantVectorClient:
                     self._qdrant_clients = {}
                     
                 # Try search again with new local client
-                return await self.search(query, site, num_results, collection_name, query_params)
+                return await self.search_by_vector(embedding, site, num_results, collection_name, query_params,
+                                                   include_schema)
             
             logger.log_with_context(
                 LogLevel.ERROR,
@@ -639,6 +945,49 @@ class QdrantVectorClient:
             )
             raise
     
+    async def _run_search_batch(self, collection_name: str,
+                                requests: List[models.SearchRequest]) -> List[List[models.ScoredPoint]]:
+        """
+        Micro-batcher runner: send queued searches against one collection as a single search_batch call.
+        
+        Args:
+            collection_name: Collection all requests target
+            requests: Search requests, each with its own vector, filter and limit
+            
+        Returns:
+            One list of scored points per request, in request order
+        """
+        client = await self._get_qdrant_client()
+        logger.debug(f"Executing batched Qdrant search - collection: {collection_name}, requests: {len(requests)}")
+        return await client.search_batch(collection_name=collection_name, requests=requests)
+    
+    async def fetch_schema_json(self, urls: List[str], collection_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fetch schema_json for a set of URLs, used to hydrate results searched with include_schema=False.
+        
+        Args:
+            urls: URLs to fetch
+            collection_name: Optional collection name (defaults to configured name)
+            
+        Returns:
+            Dict[str, Any]: Mapping of URL to schema_json for the URLs that were found
+        """
+        if not urls:
+            return {}
+        collection_name = collection_name or self.default_collection_name
+        client = await self._get_qdrant_client()
+        
+        points, _offset = await client.scroll(
+            collection_name=collection_name,
+            scroll_filter=models.Filter(
+                must=[models.FieldCondition(key="url", match=models.MatchAny(any=list(urls)))]
+            ),
+            limit=len(urls),
+            with_payload=["url", "schema_json"],
+            with_vectors=False,
+        )
+        return {point.payload.get("url"): point.payload.get("schema_json", "") for point in points}
+    
     async def search_by_url(self, url: str, collection_name: Optional[str] = None) -> Optional[List[str]]:
         """
         Retrieve a specific item by URL from Qdrant database.
@@ -720,6 +1069,70 @@ class QdrantVectorClient:
             )
             raise
     
+    async def search_by_urls(self, urls: List[str],
+                             collection_name: Optional[str] = None) -> Dict[str, List[str]]:
+        """
+        Retrieve several items by URL.
+        
+        Points are fetched directly by their uuid5(url) ids. URLs not found that
+        way (points written before ids were derived from the URL) are looked up
+        with a scroll over the url payload index.
+        
+        Args:
+            urls: URLs to look up
+            collection_name: Optional collection name (defaults to configured name)
+            
+        Returns:
+            Dict[str, List[str]]: Mapping of URL to [url, schema_json, name, site] for the URLs that were found
+        """
+        if not urls:
+            return {}
+        collection_name = collection_name or self.default_collection_name
+        client = await self._get_qdrant_client()
+        wanted = set(urls)
+        found: Dict[str, List[str]] = {}
+        
+        def collect(points):
+            for point in points:
+                payload = point.payload or {}
+                url = payload.get("url")
+                if url in wanted and url not in found:
+                    found[url] = [url, payload.get("schema_json", ""), payload.get("name", ""), payload.get("site", "")]
+        
+        try:
+            collect(await client.retrieve(
+                collection_name=collection_name,
+                ids=[str(uuid.uuid5(uuid.NAMESPACE_URL, url)) for url in wanted],
+                with_payload=True,
+                with_vectors=False,
+            ))
+            
+            offset = None
+            missing = [url for url in wanted if url not in found]
+            while missing:
+                points, offset = await client.scroll(
+                    collection_name=collection_name,
+                    scroll_filter=models.Filter(
+                        must=[models.FieldCondition(key="url", match=models.MatchAny(any=missing))]
+                    ),
+                    limit=len(missing),
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=False,
+                )
+                collect(points)
+                if offset is None:
+                    break
+                missing = [url for url in missing if url not in found]
+        except Exception as e:
+            if "Collection not found" in str(e):
+                logger.warning(f"Collection '{collection_name}' not found.")
+                return {}
+            raise
+        
+        logger.debug(f"Retrieved {len(found)} of {len(wanted)} items by URL from collection: {collection_name}")
+        return found
+    
     async def search_all_sites(self, query: str, num_results: int = 50, 
                              collection_name: Optional[str] = None,
                              query_params: Optional[Dict[str, Any]] = None) -> List[List[str]]:
@@ -759,6 +1172,21 @@ class QdrantVectorClient:
                 logger.warning(f"Collection '{collection_name}' does not exist")
                 return []
             
+            # Facet on the keyword-indexed site field is a single cheap request
+            try:
+                facet_response = await client.facet(
+                    collection_name=collection_name,
+                    key="site",
+                    limit=100000,
+                    exact=True
+                )
+                site_list = sorted(hit.value for hit in facet_response.hits if hit.value)
+                logger.info(f"Found {len(site_list)} unique sites in collection '{collection_name}'")
+                return site_list
+            except Exception as e:
+                # Older servers, or no payload index on "site": scroll instead
+                logger.debug(f"Qdrant facet on 'site' unavailable, falling back to scroll: {e}")
+            
             # Use scroll to get all points with site field
             sites = set()
             offset = None
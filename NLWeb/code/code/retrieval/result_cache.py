@@ -0,0 +1,189 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""
+TTL + LRU cache for aggregated VectorDBClient search results.
+
+Entries are keyed by (normalized query, site set, num_results, enabled endpoint
+set, extra search arguments) and hold the final [url, json, name, site] rows.
+Writes through VectorDBClient invalidate the affected sites.
+
+Configuration (environment variables):
+    NLWEB_RESULT_CACHE_TTL: entry lifetime in seconds (default 60, 0 disables the cache)
+    NLWEB_RESULT_CACHE_SIZE: max number of entries (default 1000)
+
+WARNING: This code is under development and may undergo changes in future releases.
+Backwards compatibility is not guaranteed at this time.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from utils.logging_config_helper import get_configured_logger
+
+logger = get_configured_logger("result_cache")
+
+DEFAULT_TTL_SECONDS = 60.0
+DEFAULT_MAX_ENTRIES = 1000
+
+ALL_SITES = "all"
+
+
+def normalize_sites(site: Union[str, List[str]]) -> Tuple[str, ...]:
+    """Turn a site argument into a sorted, de-duplicated tuple."""
+    if isinstance(site, str):
+        return (site,)
+    return tuple(sorted(set(str(s) for s in site)))
+
+
+class ResultCache:
+    """
+    Bounded TTL cache of search results with per-site invalidation.
+
+    A generation counter is bumped on every invalidation; results computed
+    across an invalidation are not stored, so a search racing a write cannot
+    repopulate the cache with stale rows.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Tuple[float, Tuple[str, ...], List[List[Any]]]]" = OrderedDict()
+        self._site_keys: Dict[str, Set[tuple]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def make_key(self, query: str, site: Union[str, List[str]], num_results: int,
+                 endpoints: Iterable[str], **kwargs) -> Optional[tuple]:
+        """
+        Build a cache key, or return None if the arguments cannot be keyed.
+        """
+        try:
+            extra = json.dumps(kwargs, sort_keys=True) if kwargs else ""
+        except (TypeError, ValueError):
+            return None
+        return (
+            " ".join(query.split()),
+            normalize_sites(site),
+            num_results,
+            tuple(sorted(endpoints)),
+            extra,
+        )
+
+    def _drop(self, key: tuple):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for site in entry[1]:
+            keys = self._site_keys.get(site)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._site_keys[site]
+
+    def get(self, key: tuple) -> Optional[List[List[Any]]]:
+        """Return a copy of the cached rows, or None on a miss or expired entry."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    self._drop(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            rows = entry[2]
+        return [list(row) for row in rows]
+
+    def put(self, key: tuple, rows: List[List[Any]], generation: int):
+        """
+        Store rows for a key.
+
+        Args:
+            key: Key from make_key()
+            rows: Aggregated search results
+            generation: Value of `generation` read before the search started
+        """
+        sites = key[1]
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl, sites, [list(row) for row in rows])
+            for site in sites:
+                self._site_keys.setdefault(site, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+
+    def invalidate_sites(self, sites: Iterable[str]):
+        """Drop entries for the given sites and any entries covering all sites."""
+        sites = set(sites)
+        with self._lock:
+            self._generation += 1
+            dropped = 0
+            for site in sites | {ALL_SITES}:
+                for key in list(self._site_keys.get(site, ())):
+                    self._drop(key)
+                    dropped += 1
+            self.invalidations += 1
+        if dropped:
+            logger.debug(f"Invalidated {dropped} cached result sets for sites: {sorted(sites)}")
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._site_keys.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit-rate counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+            }
+
+
+_cache: Optional[ResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Return the process-wide result cache, creating it from the environment on first use."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    ttl = float(os.getenv("NLWEB_RESULT_CACHE_TTL", DEFAULT_TTL_SECONDS))
+                except ValueError:
+                    ttl = DEFAULT_TTL_SECONDS
+                try:
+                    max_entries = int(os.getenv("NLWEB_RESULT_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+                except ValueError:
+                    max_entries = DEFAULT_MAX_ENTRIES
+                _cache = ResultCache(ttl=ttl, max_entries=max_entries)
+    return _cache
@@ -6,19 +6,28 @@ Unified vector database interface with support for Azure AI Search, Milvus, and
 This module provides abstract base classes and concrete implementations for database operations.
 """
 
+import os
 import time
 import asyncio
 import subprocess
 import sys
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Union, Tuple, Type
-import json
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import List, Dict, Any, Optional, Union, Tuple, Type, AsyncIterator, Awaitable, Callable, Deque
 
 from config.config import CONFIG
 from utils.utils import get_param
 from utils.logging_config_helper import get_configured_logger
 from utils.logger import LogLevel
+from utils import fast_json
 from utils.json_utils import merge_json_array
+from retrieval.result_cache import get_result_cache
+from retrieval.item_cache import get_item_cache
+from retrieval.endpoint_health import get_endpoint_health, get_endpoint_health_stats
+from retrieval.site_catalog import get_site_catalog
+from retrieval.executor_pool import get_executor_stats
+from retrieval.micro_batcher import get_micro_batcher_stats
 
 logger = get_configured_logger("retriever")
 
@@ -29,6 +38,189 @@ _client_cache_lock = asyncio.Lock()
 # Preloaded client modules
 _preloaded_modules = {}
 
+# Concurrency control shared by all VectorDBClient instances (a new instance is
+# created per request, so per-instance locks would not protect anything).
+# Reads never take a lock; they are only bounded by a per-endpoint semaphore.
+# Writes take a lock per (endpoint, site) so loads for different sites proceed
+# in parallel.
+DEFAULT_MAX_CONCURRENT_SEARCHES = 32
+_endpoint_semaphores: Dict[str, asyncio.Semaphore] = {}
+_site_write_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+
+
+def _get_endpoint_semaphore(endpoint_name: str) -> asyncio.Semaphore:
+    """
+    Get the semaphore limiting concurrent searches against an endpoint.
+    
+    The limit is read from the endpoint's `max_concurrent_searches` setting,
+    falling back to DEFAULT_MAX_CONCURRENT_SEARCHES.
+    
+    Args:
+        endpoint_name: Name of the endpoint
+        
+    Returns:
+        Semaphore shared by all clients using this endpoint
+    """
+    semaphore = _endpoint_semaphores.get(endpoint_name)
+    if semaphore is None:
+        endpoint_config = CONFIG.retrieval_endpoints.get(endpoint_name)
+        limit = getattr(endpoint_config, 'max_concurrent_searches', None) or DEFAULT_MAX_CONCURRENT_SEARCHES
+        semaphore = asyncio.Semaphore(int(limit))
+        _endpoint_semaphores[endpoint_name] = semaphore
+        logger.debug(f"Created search semaphore for endpoint {endpoint_name} with limit {limit}")
+    return semaphore
+
+
+# Per-endpoint deadlines and hedging. Each endpoint may set:
+#   search_timeout: seconds before a search against it is abandoned (0 disables)
+#   hedge_percentile: latency percentile (e.g. 95) after which a duplicate
+#       request is sent; the first answer wins and the other is cancelled
+#   hedge_delay: fixed hedge delay in seconds, used until enough latency
+#       samples exist to compute the percentile (or on its own)
+DEFAULT_SEARCH_TIMEOUT = 10.0
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW_SIZE = 200
+_endpoint_latencies: Dict[str, Deque[float]] = {}
+
+
+def _get_search_timeout(endpoint_config) -> Optional[float]:
+    """
+    Get the per-search deadline for an endpoint.
+    
+    Args:
+        endpoint_config: Endpoint configuration
+        
+    Returns:
+        Timeout in seconds, or None if searches should not time out
+    """
+    timeout = getattr(endpoint_config, 'search_timeout', None)
+    if timeout is None:
+        timeout = DEFAULT_SEARCH_TIMEOUT
+    timeout = float(timeout)
+    return timeout if timeout > 0 else None
+
+
+def _record_endpoint_latency(endpoint_name: str, latency: float):
+    """Record a successful search latency for hedge delay estimation."""
+    latencies = _endpoint_latencies.get(endpoint_name)
+    if latencies is None:
+        latencies = deque(maxlen=LATENCY_WINDOW_SIZE)
+        _endpoint_latencies[endpoint_name] = latencies
+    latencies.append(latency)
+
+
+def _get_hedge_delay(endpoint_name: str, endpoint_config) -> Optional[float]:
+    """
+    Get how long to wait before sending a hedged request to an endpoint.
+    
+    Uses the configured hedge_percentile of recent latencies once enough samples
+    exist, otherwise the fixed hedge_delay.
+    
+    Args:
+        endpoint_name: Name of the endpoint
+        endpoint_config: Endpoint configuration
+        
+    Returns:
+        Delay in seconds, or None if hedging is disabled
+    """
+    percentile = getattr(endpoint_config, 'hedge_percentile', None)
+    fixed_delay = getattr(endpoint_config, 'hedge_delay', None)
+    
+    latencies = _endpoint_latencies.get(endpoint_name)
+    if percentile and latencies and len(latencies) >= HEDGE_MIN_SAMPLES:
+        ordered = sorted(latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * float(percentile) / 100))
+        return ordered[index]
+    if fixed_delay:
+        return float(fixed_delay)
+    return None
+
+
+async def _run_hedged(attempt: Callable[[], Awaitable[Any]], hedge_delay: float) -> Any:
+    """
+    Run attempt(), starting a second copy if the first has not finished after
+    hedge_delay seconds. The first successful result wins and the other copy
+    is cancelled.
+    
+    Args:
+        attempt: Factory returning a new coroutine for each attempt
+        hedge_delay: Seconds to wait before hedging
+        
+    Returns:
+        Result of the first successful attempt
+    """
+    pending = {asyncio.create_task(attempt())}
+    try:
+        done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+        if done:
+            return done.pop().result()
+        
+        pending.add(asyncio.create_task(attempt()))
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.cancelled():
+                    continue
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error or asyncio.CancelledError()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+# Result fusion across endpoints, selected by the fusion_strategy setting
+# ("interleave", "rrf" or "score"); rrf_k is the reciprocal rank fusion constant.
+DEFAULT_FUSION_STRATEGY = "interleave"
+DEFAULT_RRF_K = 60
+
+
+def _get_site_write_lock(endpoint_name: str, site: str) -> asyncio.Lock:
+    """
+    Get the lock serializing write operations for a site on an endpoint.
+    
+    Args:
+        endpoint_name: Name of the endpoint being written to
+        site: Site identifier
+        
+    Returns:
+        Lock shared by all clients writing this site to this endpoint
+    """
+    key = (endpoint_name, site)
+    lock = _site_write_locks.get(key)
+    if lock is None:
+        lock = asyncio.Lock()
+        _site_write_locks[key] = lock
+    return lock
+
+
+def _get_default_latency_budget() -> Optional[float]:
+    """
+    Read the default streaming search latency budget (seconds) from the
+    NLWEB_SEARCH_LATENCY_BUDGET environment variable.
+    """
+    value = os.getenv("NLWEB_SEARCH_LATENCY_BUDGET")
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Invalid NLWEB_SEARCH_LATENCY_BUDGET value: {value}")
+        return None
+
+
+def _strip_scores(results: List[List[Any]], include_scores: bool) -> List[List[Any]]:
+    """
+    Drop the optional score column from [url, json, name, site, score] rows
+    unless the caller asked for scores.
+    """
+    if include_scores:
+        return results
+    return [row[:4] for row in results]
+
+
 def init():
     """Initialize retrieval clients based on configuration."""
     print("=== Retrieval initialization starting ===")
@@ -125,6 +317,25 @@ def _ensure_package_installed(db_type: str):
                 raise ValueError(f"Failed to install required package {package} for {db_type}")
 
 
+def get_endpoint_embedding_config(endpoint_config) -> Tuple[str, Optional[str]]:
+    """
+    Get the embedding provider and model used to query an endpoint.
+    
+    Endpoints use the preferred embedding provider unless their configuration
+    sets `embedding_provider` (and optionally `embedding_model`), e.g. when the
+    index was built with a different model.
+    
+    Args:
+        endpoint_config: Retrieval endpoint configuration
+        
+    Returns:
+        Tuple of (provider, model); model is None for the provider's default
+    """
+    provider = getattr(endpoint_config, 'embedding_provider', None) or CONFIG.preferred_embedding_provider
+    model = getattr(endpoint_config, 'embedding_model', None)
+    return provider, model
+
+
 class VectorDBClientInterface(ABC):
     """
     Abstract base class defining the interface for vector database clients.
@@ -172,10 +383,51 @@ class VectorDBClientInterface(ABC):
             **kwargs: Additional parameters
             
         Returns:
-            List of search results
+            List of search results [url, schema_json, name, site], optionally
+            followed by the backend similarity score (higher is better)
         """
         pass
     
+    async def search_by_vector(self, embedding: List[float], site: Union[str, List[str]],
+                               num_results: int = 50, **kwargs) -> List[List[str]]:
+        """
+        Search for documents using a precomputed query embedding.
+        
+        VectorDBClient embeds the query once per request and shares the vector
+        across every endpoint that implements this method. Backends that embed
+        queries server-side (or cannot search by vector) simply don't implement it
+        and are called through search() instead.
+        
+        Args:
+            embedding: Query embedding vector
+            site: Site identifier, list of sites, or "all"
+            num_results: Maximum number of results to return
+            **kwargs: Additional parameters. Backends that implement
+                fetch_schema_json accept include_schema=False, returning None
+                in place of schema_json.
+            
+        Returns:
+            List of search results
+        """
+        raise NotImplementedError("This backend does not support search by vector")
+    
+    async def fetch_schema_json(self, urls: List[str], **kwargs) -> Dict[str, Any]:
+        """
+        Fetch the schema_json payloads for a set of URLs.
+        
+        Used by two-phase retrieval: endpoints with two_phase_retrieval enabled are
+        searched with include_schema=False, and only the rows that survive fusion
+        and the top-k cut are hydrated through this method.
+        
+        Args:
+            urls: URLs to fetch
+            **kwargs: Additional parameters
+            
+        Returns:
+            Dictionary mapping each URL that was found to its schema_json
+        """
+        raise NotImplementedError("This backend does not support fetching payloads by URL")
+    
     @abstractmethod
     async def search_by_url(self, url: str, **kwargs) -> Optional[List[str]]:
         """
@@ -190,6 +442,22 @@ class VectorDBClientInterface(ABC):
         """
         pass
     
+    async def search_by_urls(self, urls: List[str], **kwargs) -> Dict[str, List[str]]:
+        """
+        Retrieve several documents by exact URL in as few round-trips as possible.
+        
+        Optional: VectorDBClient falls back to concurrent search_by_url calls for
+        backends that don't implement it.
+        
+        Args:
+            urls: URLs to look up
+            **kwargs: Additional parameters
+            
+        Returns:
+            Dictionary mapping each URL that was found to its [url, schema_json, name, site] row
+        """
+        raise NotImplementedError("This backend does not support batch lookup by URL")
+    
     @abstractmethod
     async def search_all_sites(self, query: str, num_results: int = 50, **kwargs) -> List[List[str]]:
         """
@@ -315,15 +583,11 @@ class VectorDBClient:
             logger.info(f"Write operations will use endpoint: {self.write_endpoint}")
         else:
             logger.warning("No write endpoint configured - write operations will fail")
-        
-        self._retrieval_lock = asyncio.Lock()
-        
-        # Cache for endpoint sites - will be populated lazily
-        self._endpoint_sites_cache: Dict[str, Optional[List[str]]] = {}
+
     
     async def _get_endpoint_sites(self, endpoint_name: str) -> Optional[List[str]]:
         """
-        Get the list of sites available in an endpoint, with caching.
+        Get the list of sites available in an endpoint from the process-wide site catalog.
         
         Args:
             endpoint_name: Name of the endpoint
@@ -331,22 +595,11 @@ class VectorDBClient:
         Returns:
             List of site names if supported, None if not supported by this backend.
         """
-        # Return cached value if available
-        if endpoint_name in self._endpoint_sites_cache:
-            return self._endpoint_sites_cache[endpoint_name]
-        
-        try:
+        async def fetch_sites():
             client = await self.get_client(endpoint_name)
-            sites = await client.get_sites()
-            self._endpoint_sites_cache[endpoint_name] = sites
-            logger.info(f"Endpoint {endpoint_name} has {len(sites)} sites: {sites[:5]}{'...' if len(sites) > 5 else ''}")
-            return sites
-        except Exception as e:
-            # Any error means the backend doesn't support get_sites or it failed
-            logger.info(f"Backend for endpoint {endpoint_name} does not support get_sites() or it failed: {e}")
-            # Cache None to indicate unsupported
-            self._endpoint_sites_cache[endpoint_name] = None
-            return None
+            return await client.get_sites()
+        
+        return await get_site_catalog().get_sites(endpoint_name, fetch_sites)
     
     async def _endpoint_has_site(self, endpoint_name: str, site: Union[str, List[str]]) -> bool:
         """
@@ -503,19 +756,35 @@ class VectorDBClient:
         # Return deduplicated results
         return list(url_to_result.values())
     
-    def _aggregate_results(self, endpoint_results: Dict[str, List[List[str]]]) -> List[List[str]]:
+    def _aggregate_results(self, endpoint_results: Dict[str, List[List[str]]],
+                           fusion_strategy: Optional[str] = None,
+                           num_results: Optional[int] = None,
+                           parse_cache: Optional[Dict[str, Any]] = None) -> List[List[str]]:
         """
         Aggregate results from multiple endpoints, merging JSON data for duplicate URLs.
         
         When the same URL appears in multiple endpoints, the JSON data (second element)
         from each source is merged into a single array.
         
+        Results are ordered by the configured fusion strategy:
+            interleave: round-robin across endpoints in relevance order (default)
+            rrf: reciprocal rank fusion, sum of 1 / (rrf_k + rank) over endpoints
+            score: sum over endpoints of backend scores min-max normalized per endpoint
+        
+        JSON for duplicate URLs is only merged for rows within the num_results cut.
+        
         Args:
             endpoint_results: Dictionary mapping endpoint names to their results
+            fusion_strategy: Optional override of the configured fusion strategy
+            num_results: Optional maximum number of rows to return
+            parse_cache: Optional per-request memo of parsed JSON payloads
             
         Returns:
-            Aggregated results with merged JSON for duplicate URLs
+            Aggregated results [url, json, name, site, score] with merged JSON for duplicate URLs.
+            The score is the fused score, or the backend score for interleave.
         """
+        fusion_strategy = fusion_strategy or getattr(CONFIG, 'fusion_strategy', None) or DEFAULT_FUSION_STRATEGY
+        
         # Dictionary to store aggregated data by URL
         # Format: {url: {"result": [url, json_array, name, site], "sources": [json1, json2...]}}
         url_to_data = {}
@@ -531,6 +800,7 @@ class VectorDBClient:
                         json_data = result[1]
                         name = result[2]
                         site = result[3]
+                        score = result[4] if len(result) > 4 else None
                         
                         if url not in url_to_data:
                             # First occurrence of this URL
@@ -539,6 +809,7 @@ class VectorDBClient:
                                 "json_list": [json_data] if json_data else [],
                                 "name": name,
                                 "site": site,
+                                "score": score,
                                 "first_endpoint": endpoint_name
                             }
                         else:
@@ -546,9 +817,50 @@ class VectorDBClient:
                             if json_data:
                                 url_to_data[url]["json_list"].append(json_data)
         
-        # Second pass: build final results maintaining order from first endpoint
-        # We'll interleave to preserve relevance ordering
+        # Second pass: order URLs by the fusion strategy
+        ordered_urls, fused_scores = self._rank_urls(endpoint_results, fusion_strategy, num_results)
+        
         final_results = []
+        for url in ordered_urls:
+            data = url_to_data[url]
+            # Merge JSON data if multiple sources
+            json_list = data["json_list"]
+            if len(json_list) > 1:
+                # Multiple sources - merge them
+                merged_json = merge_json_array(json_list, parse_cache)
+                # Convert back to JSON string
+                merged_json_str = fast_json.dumps(merged_json)
+            else:
+                # Single source - use as is
+                merged_json_str = json_list[0] if json_list else "{}"
+            
+            score = fused_scores.get(url) if fused_scores is not None else data["score"]
+            final_results.append([data["url"], merged_json_str, data["name"], data["site"], score])
+        
+        logger.info(f"Aggregated {sum(len(r) for r in endpoint_results.values())} total results into {len(url_to_data)} unique URLs")
+        
+        return final_results
+    
+    def _rank_urls(self, endpoint_results: Dict[str, List[List[str]]],
+                   fusion_strategy: Optional[str] = None,
+                   num_results: Optional[int] = None) -> Tuple[List[str], Optional[Dict[str, float]]]:
+        """
+        Order the unique URLs across endpoints by the fusion strategy.
+        
+        Ranking only looks at URLs, positions and scores, never at the JSON payloads.
+        
+        Args:
+            endpoint_results: Dictionary mapping endpoint names to their results
+            fusion_strategy: Optional override of the configured fusion strategy
+            num_results: Optional maximum number of URLs to return
+            
+        Returns:
+            Tuple of (ordered URLs, fused scores by URL or None for interleave)
+        """
+        fusion_strategy = fusion_strategy or getattr(CONFIG, 'fusion_strategy', None) or DEFAULT_FUSION_STRATEGY
+        
+        # Interleave to preserve relevance ordering from each endpoint
+        ordered_urls = []
         seen_urls = set()
         
         # Create iterators for each endpoint's results
@@ -564,32 +876,11 @@ class VectorDBClient:
             for endpoint_name, iterator in iterators.items():
                 try:
                     result = next(iterator)
-                    if len(result) >= 1:
+                    if len(result) >= 4:
                         url = result[0]
                         if url and url not in seen_urls:
                             seen_urls.add(url)
-                            # Get the aggregated data for this URL
-                            data = url_to_data.get(url)
-                            if data:
-                                # Merge JSON data if multiple sources
-                                json_list = data["json_list"]
-                                if len(json_list) > 1:
-                                    # Multiple sources - merge them
-                                    merged_json = merge_json_array(json_list)
-                                    # Convert back to JSON string
-                                    merged_json_str = json.dumps(merged_json)
-                                else:
-                                    # Single source - use as is
-                                    merged_json_str = json_list[0] if json_list else "{}"
-                                
-                                # Create result with merged JSON
-                                merged_result = [
-                                    data["url"],
-                                    merged_json_str,  # Single merged JSON string
-                                    data["name"],
-                                    data["site"]
-                                ]
-                                final_results.append(merged_result)
+                            ordered_urls.append(url)
                 except StopIteration:
                     endpoints_to_remove.append(endpoint_name)
             
@@ -597,9 +888,335 @@ class VectorDBClient:
             for endpoint in endpoints_to_remove:
                 del iterators[endpoint]
         
-        logger.info(f"Aggregated {sum(len(r) for r in endpoint_results.values())} total results into {len(final_results)} unique URLs")
+        # Reorder by fused score; the sort is stable so ties keep the interleaved order
+        fused_scores = None
+        if fusion_strategy == "rrf":
+            fused_scores = self._reciprocal_rank_fusion(endpoint_results)
+        elif fusion_strategy == "score":
+            fused_scores = self._normalized_score_fusion(endpoint_results)
+        elif fusion_strategy != "interleave":
+            logger.warning(f"Unknown fusion strategy '{fusion_strategy}', using interleave")
+        if fused_scores is not None:
+            ordered_urls.sort(key=lambda url: fused_scores.get(url, 0.0), reverse=True)
+        if num_results is not None:
+            ordered_urls = ordered_urls[:num_results]
+        return ordered_urls, fused_scores
+    
+    def _uses_two_phase(self, endpoint_name: str, client: VectorDBClientInterface) -> bool:
+        """
+        Return True if an endpoint is searched without payloads and hydrated afterwards.
         
-        return final_results
+        Enabled per endpoint with two_phase_retrieval: true; the backend must
+        implement fetch_schema_json.
+        """
+        endpoint_config = CONFIG.retrieval_endpoints.get(endpoint_name)
+        return bool(getattr(endpoint_config, 'two_phase_retrieval', False)) and hasattr(client, 'fetch_schema_json')
+    
+    async def _fetch_schema_json(self, endpoint_name: str, urls: List[str]) -> Dict[str, Any]:
+        """
+        Fetch schema_json for URLs from one endpoint within its search deadline.
+        
+        Args:
+            endpoint_name: Name of the endpoint
+            urls: URLs to fetch
+            
+        Returns:
+            Dictionary mapping the URLs that were found to their schema_json
+        """
+        client = await self.get_client(endpoint_name)
+        timeout = _get_search_timeout(CONFIG.retrieval_endpoints.get(endpoint_name))
+        async with _get_endpoint_semaphore(endpoint_name):
+            return await asyncio.wait_for(client.fetch_schema_json(urls), timeout)
+    
+    async def _hydrate_results(self, endpoint_results: Dict[str, List[List[Any]]],
+                               num_results: Optional[int] = None,
+                               hydrated: Optional[Dict[Tuple[str, str], Any]] = None) -> Dict[str, List[List[Any]]]:
+        """
+        Fill in schema_json for rows that two-phase endpoints returned without it.
+        
+        Only rows that make the num_results cut are fetched, from the shared item
+        cache when possible. Rows whose document has disappeared are dropped, and
+        an endpoint whose fetch fails is dropped like a failed search.
+        
+        Args:
+            endpoint_results: Dictionary mapping endpoint names to their results
+            num_results: Maximum number of rows that will be kept after aggregation
+            hydrated: Optional per-request memo of (endpoint, url) -> schema_json
+            
+        Returns:
+            Endpoint results with payloads filled in for every row within the cut
+        """
+        if not any(len(row) > 1 and row[1] is None
+                   for rows in endpoint_results.values() for row in rows):
+            return endpoint_results
+        if hydrated is None:
+            hydrated = {}
+        item_cache = get_item_cache()
+        endpoint_results = dict(endpoint_results)
+        
+        while True:
+            # Ranking doesn't depend on payloads, so rank first and hydrate only the winners
+            top_urls = set(self._rank_urls(endpoint_results, num_results=num_results)[0])
+            
+            missing: Dict[str, Dict[str, List[Any]]] = {}
+            for endpoint_name, rows in endpoint_results.items():
+                for row in rows:
+                    if len(row) > 1 and row[1] is None and row[0] in top_urls \
+                            and (endpoint_name, row[0]) not in hydrated:
+                        missing.setdefault(endpoint_name, {})[row[0]] = row
+            if not missing:
+                break
+            
+            if item_cache.enabled:
+                for endpoint_name, rows_by_url in missing.items():
+                    for url, row in item_cache.get_many(endpoint_name, list(rows_by_url)).items():
+                        hydrated[(endpoint_name, url)] = row[1]
+                        del rows_by_url[url]
+                missing = {name: rows_by_url for name, rows_by_url in missing.items() if rows_by_url}
+            
+            generation = item_cache.generation
+            names = list(missing)
+            fetched = await asyncio.gather(
+                *(self._fetch_schema_json(name, list(missing[name])) for name in names),
+                return_exceptions=True
+            )
+            
+            for endpoint_name, schemas in zip(names, fetched):
+                rows_by_url = missing[endpoint_name]
+                if isinstance(schemas, Exception):
+                    logger.warning(f"Hydrating results failed for endpoint {endpoint_name}: {schemas}")
+                    del endpoint_results[endpoint_name]
+                    continue
+                
+                for url in rows_by_url:
+                    if url in schemas:
+                        hydrated[(endpoint_name, url)] = schemas[url]
+                gone = [url for url in rows_by_url if url not in schemas]
+                if gone:
+                    logger.debug(f"Dropping {len(gone)} results from {endpoint_name} that no longer exist")
+                    endpoint_results[endpoint_name] = [row for row in endpoint_results[endpoint_name]
+                                                       if row[0] not in gone]
+                if item_cache.enabled:
+                    item_cache.put_many(
+                        endpoint_name,
+                        [[url, schemas[url], row[2], row[3]] for url, row in rows_by_url.items() if url in schemas],
+                        generation
+                    )
+        
+        # Rows outside the cut stay unhydrated; aggregation never reads them
+        return {
+            endpoint_name: [
+                [row[0], hydrated[(endpoint_name, row[0])]] + list(row[2:])
+                if len(row) > 1 and row[1] is None and (endpoint_name, row[0]) in hydrated else row
+                for row in rows
+            ]
+            for endpoint_name, rows in endpoint_results.items()
+        }
+    
+    def _reciprocal_rank_fusion(self, endpoint_results: Dict[str, List[List[str]]]) -> Dict[str, float]:
+        """
+        Score URLs by reciprocal rank fusion across endpoints.
+        
+        Args:
+            endpoint_results: Dictionary mapping endpoint names to their results
+            
+        Returns:
+            Dictionary mapping URLs to fused scores
+        """
+        rrf_k = getattr(CONFIG, 'rrf_k', None) or DEFAULT_RRF_K
+        fused = {}
+        for results in endpoint_results.values():
+            seen = set()
+            rank = 0
+            for result in results or []:
+                url = result[0] if result else None
+                if not url or url in seen:
+                    continue
+                seen.add(url)
+                rank += 1
+                fused[url] = fused.get(url, 0.0) + 1.0 / (rrf_k + rank)
+        return fused
+    
+    def _normalized_score_fusion(self, endpoint_results: Dict[str, List[List[str]]]) -> Dict[str, float]:
+        """
+        Score URLs by summing per-endpoint min-max normalized backend scores.
+        
+        Endpoints that return no scores fall back to a linear score by rank.
+        
+        Args:
+            endpoint_results: Dictionary mapping endpoint names to their results
+            
+        Returns:
+            Dictionary mapping URLs to fused scores
+        """
+        fused = {}
+        for results in endpoint_results.values():
+            best = {}
+            for rank, result in enumerate(results or []):
+                url = result[0] if result else None
+                if not url or url in best:
+                    continue
+                score = result[4] if len(result) > 4 else None
+                best[url] = (rank, score)
+            if not best:
+                continue
+            
+            scores = [score for _, score in best.values() if score is not None]
+            if len(scores) == len(best):
+                low, high = min(scores), max(scores)
+                span = high - low
+                for url, (_, score) in best.items():
+                    normalized = (score - low) / span if span > 0 else 1.0
+                    fused[url] = fused.get(url, 0.0) + normalized
+            else:
+                count = len(best)
+                for url, (rank, _) in best.items():
+                    fused[url] = fused.get(url, 0.0) + 1.0 - rank / count
+        return fused
+    
+    async def _embed_query_for_endpoints(self, query: str,
+                                         clients: Dict[str, VectorDBClientInterface]) -> Dict[str, Any]:
+        """
+        Compute the query embedding once per embedding provider/model.
+        
+        Only endpoints whose client implements search_by_vector need a vector;
+        the rest embed (or not) on their own inside search().
+        
+        Args:
+            query: Search query string
+            clients: Backend clients for the endpoints about to be searched
+            
+        Returns:
+            Dictionary mapping endpoint names to their embedding, or to the
+            exception raised while computing it
+        """
+        from embedding.embedding import get_embedding
+        
+        # Group endpoints by the embedding they need
+        groups: Dict[Tuple[str, Optional[str]], List[str]] = {}
+        for endpoint_name, client in clients.items():
+            if not hasattr(client, 'search_by_vector'):
+                continue
+            key = get_endpoint_embedding_config(self.enabled_endpoints[endpoint_name])
+            groups.setdefault(key, []).append(endpoint_name)
+        
+        if not groups:
+            return {}
+        
+        keys = list(groups.keys())
+        start_embed = time.time()
+        embeddings = await asyncio.gather(
+            *(get_embedding(query, provider=provider, model=model) for provider, model in keys),
+            return_exceptions=True
+        )
+        logger.debug(f"Computed {len(keys)} query embedding(s) for {sum(len(g) for g in groups.values())} "
+                     f"endpoints in {time.time() - start_embed:.2f}s")
+        
+        endpoint_embeddings = {}
+        for key, embedding in zip(keys, embeddings):
+            if isinstance(embedding, Exception):
+                logger.warning(f"Failed to compute query embedding with provider {key[0]}: {embedding}")
+            for endpoint_name in groups[key]:
+                endpoint_embeddings[endpoint_name] = embedding
+        return endpoint_embeddings
+    
+    async def _search_endpoint(self, endpoint_name: str, client: VectorDBClientInterface,
+                               query: str, site: Union[str, List[str]],
+                               num_results: int, embedding: Optional[Any] = None,
+                               **kwargs) -> List[List[str]]:
+        """
+        Run a search against a single endpoint within its deadline, hedging slow
+        requests if the endpoint is configured to.
+        
+        Args:
+            endpoint_name: Name of the endpoint
+            client: Backend client for the endpoint
+            query: Search query string
+            site: Site identifier, list of sites, or "all"
+            num_results: Maximum number of results to return
+            embedding: Precomputed query embedding (or the exception raised while
+                computing it) for clients that support search_by_vector
+            **kwargs: Additional parameters
+            
+        Returns:
+            List of search results from the endpoint
+        """
+        health = get_endpoint_health(endpoint_name)
+        if isinstance(embedding, Exception):
+            # Not the endpoint's fault, so don't count it against its health
+            health.record_cancelled()
+            raise embedding
+        
+        endpoint_config = CONFIG.retrieval_endpoints.get(endpoint_name)
+        timeout = _get_search_timeout(endpoint_config)
+        hedge_delay = _get_hedge_delay(endpoint_name, endpoint_config)
+        
+        def attempt():
+            return self._search_endpoint_once(endpoint_name, client, query, site,
+                                              num_results, embedding, **kwargs)
+        
+        if hedge_delay is not None:
+            search_coro = _run_hedged(attempt, hedge_delay)
+        else:
+            search_coro = attempt()
+        
+        start_time = time.time()
+        try:
+            results = await asyncio.wait_for(search_coro, timeout)
+            health.record_success(time.time() - start_time)
+            return results
+        except asyncio.CancelledError:
+            health.record_cancelled()
+            raise
+        except asyncio.TimeoutError:
+            health.record_failure(time.time() - start_time)
+            logger.log_with_context(
+                LogLevel.WARNING,
+                "Endpoint search timed out",
+                {
+                    "endpoint": endpoint_name,
+                    "timeout": timeout,
+                    "hedge_delay": hedge_delay
+                }
+            )
+            raise TimeoutError(f"Search on endpoint {endpoint_name} timed out after {timeout}s")
+        except Exception:
+            health.record_failure(time.time() - start_time)
+            raise
+    
+    async def _search_endpoint_once(self, endpoint_name: str, client: VectorDBClientInterface,
+                                    query: str, site: Union[str, List[str]],
+                                    num_results: int, embedding: Optional[Any] = None,
+                                    **kwargs) -> List[List[str]]:
+        """
+        Send one search request to an endpoint, bounded by that endpoint's semaphore.
+        
+        Args:
+            endpoint_name: Name of the endpoint
+            client: Backend client for the endpoint
+            query: Search query string
+            site: Site identifier, list of sites, or "all"
+            num_results: Maximum number of results to return
+            embedding: Precomputed query embedding, if the client supports search_by_vector
+            **kwargs: Additional parameters
+            
+        Returns:
+            List of search results from the endpoint
+        """
+        async with _get_endpoint_semaphore(endpoint_name):
+            start_time = time.time()
+            if embedding is not None and self._uses_two_phase(endpoint_name, client):
+                results = await client.search_by_vector(embedding, site, num_results,
+                                                        include_schema=False, **kwargs)
+            elif embedding is not None:
+                results = await client.search_by_vector(embedding, site, num_results, **kwargs)
+            # Use search_all_sites if site is "all"
+            elif site == "all":
+                results = await client.search_all_sites(query, num_results, **kwargs)
+            else:
+                results = await client.search(query, site, num_results, **kwargs)
+            _record_endpoint_latency(endpoint_name, time.time() - start_time)
+            return results
     
     async def delete_documents_by_site(self, site: str, **kwargs) -> int:
         """
@@ -615,12 +1232,15 @@ class VectorDBClient:
         if not self.write_endpoint:
             raise ValueError("No write endpoint configured for delete operations")
             
-        async with self._retrieval_lock:
+        async with _get_site_write_lock(self.write_endpoint, site):
             logger.info(f"Deleting documents for site: {site} using write endpoint: {self.write_endpoint}")
             
             try:
                 client = await self.get_client(self.write_endpoint)
                 count = await client.delete_documents_by_site(site, **kwargs)
+                get_result_cache().invalidate_sites([site])
+                get_item_cache().invalidate_sites([site])
+                get_site_catalog().remove_site(self.write_endpoint, site)
                 logger.info(f"Successfully deleted {count} documents for site: {site}")
                 return count
             except Exception as e:
@@ -650,13 +1270,22 @@ class VectorDBClient:
         """
         if not self.write_endpoint:
             raise ValueError("No write endpoint configured for upload operations")
+        
+        # Lock every site touched by this batch, in sorted order to avoid deadlocks
+        sites = sorted({str(doc.get("site", "")) for doc in documents})
+        
+        async with AsyncExitStack() as stack:
+            for site in sites:
+                await stack.enter_async_context(_get_site_write_lock(self.write_endpoint, site))
             
-        async with self._retrieval_lock:
             logger.info(f"Uploading {len(documents)} documents to write endpoint: {self.write_endpoint}")
             
             try:
                 client = await self.get_client(self.write_endpoint)
                 count = await client.upload_documents(documents, **kwargs)
+                get_result_cache().invalidate_sites(sites)
+                get_item_cache().invalidate_sites(sites)
+                get_site_catalog().add_sites(self.write_endpoint, sites)
                 logger.info(f"Successfully uploaded {count} documents")
                 return count
             except Exception as e:
@@ -673,20 +1302,51 @@ class VectorDBClient:
                 )
                 raise
     
-    async def search(self, query: str, site: Union[str, List[str]], 
-                    num_results: int = 50, endpoint_name: Optional[str] = None, **kwargs) -> List[List[str]]:
+    @asynccontextmanager
+    async def bulk_load(self, **kwargs) -> AsyncIterator["VectorDBClient"]:
         """
-        Search for documents matching the query and site.
+        Wrap a load made of many upload_documents calls.
+        
+        Backends that implement begin_bulk_load/end_bulk_load use this to defer
+        index refreshes to the end of the load; for other backends it is a no-op.
+        
+        Args:
+            **kwargs: Additional parameters passed to the backend (e.g. index_name)
+            
+        Example:
+            async with client.bulk_load():
+                for batch in batches:
+                    await client.upload_documents(batch)
+        """
+        if not self.write_endpoint:
+            raise ValueError("No write endpoint configured for upload operations")
+        
+        client = await self.get_client(self.write_endpoint)
+        if not hasattr(client, 'begin_bulk_load'):
+            yield self
+            return
+        
+        await client.begin_bulk_load(**kwargs)
+        try:
+            yield self
+        except BaseException:
+            # Don't let a failure while finishing the load hide the error from the load itself
+            try:
+                await client.end_bulk_load(**kwargs)
+            except Exception as e:
+                logger.error(f"Error finishing bulk load after a failed load: {e}")
+            raise
+        await client.end_bulk_load(**kwargs)
+    
+    def _normalize_site(self, site: Union[str, List[str]]) -> Union[str, List[str]]:
+        """
+        Resolve "all" to the configured sites and split comma-separated site strings.
         
         Args:
-            query: Search query string
             site: Site identifier or list of sites
-            num_results: Maximum number of results to return
-            endpoint_name: Optional endpoint name override
-            **kwargs: Additional parameters
             
         Returns:
-            List of search results
+            Normalized site identifier or list of sites
         """
         # Handle configured sites
         if site == "all":
@@ -694,13 +1354,6 @@ class VectorDBClient:
             if sites and sites != "all":
                 # Use configured sites instead of "all"
                 site = sites
-
-        # If specific endpoint is requested, use only that endpoint
-        if endpoint_name:
-            if endpoint_name not in CONFIG.retrieval_endpoints:
-                raise ValueError(f"Invalid endpoint: {endpoint_name}")
-            temp_client = VectorDBClient(endpoint_name=endpoint_name)
-            return await temp_client.search(query, site, num_results, **kwargs)
         
         # Process site parameter for consistency
         if isinstance(site, str) and ',' in site:
@@ -708,81 +1361,276 @@ class VectorDBClient:
             site = [s.strip() for s in site.split(',')]
         elif isinstance(site, str):
             site = site.replace(" ", "_")
-
-        async with self._retrieval_lock:
-            logger.info(f"Searching for '{query[:50]}...' in site: {site}, num_results: {num_results}")
-            logger.info(f"Querying {len(self.enabled_endpoints)} enabled endpoints in parallel")
-            start_time = time.time()
-            
-            # Create tasks for parallel queries to endpoints that have the requested site
-            tasks = []
-            endpoint_names = []
-            skipped_endpoints = []
-            
-            for endpoint_name in self.enabled_endpoints:
-                try:
-                    # Check if endpoint has data for the requested site
-                    if not await self._endpoint_has_site(endpoint_name, site):
-                        skipped_endpoints.append(endpoint_name)
-                        continue
-                    
-                    client = await self.get_client(endpoint_name)
-                    # Use search_all_sites if site is "all"
-                    if site == "all":
-                        task = asyncio.create_task(client.search_all_sites(query, num_results, **kwargs))
-                    else:
-                        task = asyncio.create_task(client.search(query, site, num_results, **kwargs))
-                    tasks.append(task)
-                    endpoint_names.append(endpoint_name)
-                except Exception as e:
-                    logger.warning(f"Failed to create search task for endpoint {endpoint_name}: {e}")
-            
-            if skipped_endpoints:
-                logger.debug(f"Skipped endpoints without site '{site}': {skipped_endpoints}")
-            
-            if not tasks:
-                raise ValueError("No valid endpoints available for search")
-            
-            # Execute all searches in parallel and collect results
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Process results and handle failures gracefully
-            endpoint_results = {}
-            successful_endpoints = 0
-            
-            for endpoint_name, result in zip(endpoint_names, results):
-                if isinstance(result, Exception):
-                    logger.warning(f"Search failed for endpoint {endpoint_name}: {result}")
-                else:
-                    endpoint_results[endpoint_name] = result
-                    successful_endpoints += 1
-            
-            if successful_endpoints == 0:
-                raise ValueError("All endpoint searches failed")
-            
-            # Aggregate and deduplicate results
-            final_results = self._aggregate_results(endpoint_results)
-            
-            # Limit to requested number of results
-            # Results are already in relevance order from aggregation
-            final_results = final_results[:num_results]
-            
-            end_time = time.time()
-            search_duration = end_time - start_time
+        return site
+    
+    async def _start_endpoint_searches(self, query: str, site: Union[str, List[str]],
+                                       num_results: int, **kwargs) -> Dict[str, asyncio.Task]:
+        """
+        Start a search task for every enabled endpoint that has the requested site.
+        
+        Args:
+            query: Search query string
+            site: Normalized site identifier or list of sites
+            num_results: Maximum number of results per endpoint
+            **kwargs: Additional parameters
             
-            logger.log_with_context(
-                LogLevel.INFO,
-                "Parallel search completed",
-                {
-                    "duration": f"{search_duration:.2f}s",
-                    "endpoints_queried": len(tasks),
-                    "endpoints_succeeded": successful_endpoints,
-                    "total_results": len(final_results),
-                    "site": site
-                }
+        Returns:
+            Dictionary mapping endpoint names to their search tasks, in endpoint order
+        """
+        # Find the endpoints that have the requested site
+        clients = {}
+        skipped_endpoints = []
+        unhealthy_endpoints = []
+        
+        for endpoint_name in self.enabled_endpoints:
+            try:
+                # Check if endpoint has data for the requested site
+                if not await self._endpoint_has_site(endpoint_name, site):
+                    skipped_endpoints.append(endpoint_name)
+                    continue
+                
+                client = await self.get_client(endpoint_name)
+                
+                # Skip endpoints whose circuit breaker is open
+                if not get_endpoint_health(endpoint_name).allow_request():
+                    unhealthy_endpoints.append(endpoint_name)
+                    continue
+                
+                clients[endpoint_name] = client
+            except Exception as e:
+                logger.warning(f"Failed to create search task for endpoint {endpoint_name}: {e}")
+        
+        if skipped_endpoints:
+            logger.debug(f"Skipped endpoints without site '{site}': {skipped_endpoints}")
+        if unhealthy_endpoints:
+            logger.info(f"Skipped endpoints with open circuit breaker: {unhealthy_endpoints}")
+        
+        # Healthier endpoints first, so their results lead the aggregation
+        clients = dict(sorted(clients.items(),
+                              key=lambda item: get_endpoint_health(item[0]).health_score,
+                              reverse=True))
+        
+        if not clients:
+            raise ValueError("No valid endpoints available for search")
+        
+        # Embed the query once and share the vector across endpoints
+        endpoint_embeddings = await self._embed_query_for_endpoints(query, clients)
+        
+        # Create tasks for parallel queries
+        tasks = {}
+        for endpoint_name, client in clients.items():
+            tasks[endpoint_name] = asyncio.create_task(
+                self._search_endpoint(endpoint_name, client, query, site, num_results,
+                                      endpoint_embeddings.get(endpoint_name), **kwargs)
             )
+        return tasks
+    
+    async def search(self, query: str, site: Union[str, List[str]], 
+                    num_results: int = 50, endpoint_name: Optional[str] = None,
+                    include_scores: bool = False, **kwargs) -> List[List[str]]:
+        """
+        Search for documents matching the query and site.
+        
+        Args:
+            query: Search query string
+            site: Site identifier or list of sites
+            num_results: Maximum number of results to return
+            endpoint_name: Optional endpoint name override
+            include_scores: If True, each row carries its fused score as a fifth element
+            **kwargs: Additional parameters
             
-            return final_results
+        Returns:
+            List of search results
+        """
+        # If specific endpoint is requested, use only that endpoint
+        if endpoint_name:
+            if endpoint_name not in CONFIG.retrieval_endpoints:
+                raise ValueError(f"Invalid endpoint: {endpoint_name}")
+            temp_client = VectorDBClient(endpoint_name=endpoint_name)
+            return await temp_client.search(query, self._normalize_site(site), num_results,
+                                            include_scores=include_scores, **kwargs)
+        
+        site = self._normalize_site(site)
+        
+        # Serve repeated lookups from the result cache
+        result_cache = get_result_cache()
+        cache_key = None
+        if result_cache.enabled:
+            cache_key = result_cache.make_key(query, site, num_results, self.enabled_endpoints.keys(), **kwargs)
+        if cache_key is not None:
+            cached_results = result_cache.get(cache_key)
+            if cached_results is not None:
+                logger.debug(f"Result cache hit for '{query[:50]}...' in site: {site}")
+                return _strip_scores(cached_results, include_scores)
+            cache_generation = result_cache.generation
+
+        logger.info(f"Searching for '{query[:50]}...' in site: {site}, num_results: {num_results}")
+        logger.info(f"Querying {len(self.enabled_endpoints)} enabled endpoints in parallel")
+        start_time = time.time()
+        
+        tasks = await self._start_endpoint_searches(query, site, num_results, **kwargs)
+        
+        # Execute all searches in parallel and collect results
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+        
+        # Process results and handle failures gracefully
+        endpoint_results = {}
+        successful_endpoints = 0
+        
+        for endpoint_name, result in zip(tasks.keys(), results):
+            if isinstance(result, Exception):
+                logger.warning(f"Search failed for endpoint {endpoint_name}: {result}")
+            else:
+                endpoint_results[endpoint_name] = result
+                successful_endpoints += 1
+        
+        if successful_endpoints == 0:
+            raise ValueError("All endpoint searches failed")
+        
+        # Fetch payloads for two-phase endpoints' rows that made the cut
+        endpoint_results = await self._hydrate_results(endpoint_results, num_results)
+        if not endpoint_results:
+            raise ValueError("All endpoint searches failed")
+        
+        # Aggregate and deduplicate results, limited to the requested number
+        # Results are already in relevance order from aggregation
+        final_results = self._aggregate_results(endpoint_results, num_results=num_results)
+        
+        end_time = time.time()
+        search_duration = end_time - start_time
+        
+        logger.log_with_context(
+            LogLevel.INFO,
+            "Parallel search completed",
+            {
+                "duration": f"{search_duration:.2f}s",
+                "endpoints_queried": len(tasks),
+                "endpoints_succeeded": successful_endpoints,
+                "total_results": len(final_results),
+                "site": site
+            }
+        )
+        
+        if cache_key is not None:
+            result_cache.put(cache_key, final_results, cache_generation)
+        
+        return _strip_scores(final_results, include_scores)
+    
+    async def search_stream(self, query: str, site: Union[str, List[str]],
+                            num_results: int = 50, latency_budget: Optional[float] = None,
+                            include_scores: bool = False, **kwargs) -> AsyncIterator[List[List[str]]]:
+        """
+        Search all endpoints and yield the merged results each time an endpoint finishes.
+        
+        Each yielded value is the full aggregation of the endpoints that have answered
+        so far, limited to num_results, so callers can start emitting results before the
+        slowest backend responds. Once latency_budget seconds have passed, endpoints still
+        running are cancelled and the generator stops with the partial merge already yielded.
+        
+        Args:
+            query: Search query string
+            site: Site identifier or list of sites
+            num_results: Maximum number of results to return
+            latency_budget: Seconds to wait for stragglers; defaults to the
+                NLWEB_SEARCH_LATENCY_BUDGET environment variable, or no limit
+            include_scores: If True, each row carries its fused score as a fifth element
+            **kwargs: Additional parameters
+            
+        Yields:
+            Merged search results from the endpoints completed so far
+        """
+        site = self._normalize_site(site)
+        if latency_budget is None:
+            latency_budget = _get_default_latency_budget()
+        
+        result_cache = get_result_cache()
+        cache_key = None
+        if result_cache.enabled:
+            cache_key = result_cache.make_key(query, site, num_results, self.enabled_endpoints.keys(), **kwargs)
+        if cache_key is not None:
+            cached_results = result_cache.get(cache_key)
+            if cached_results is not None:
+                logger.debug(f"Result cache hit for '{query[:50]}...' in site: {site}")
+                yield _strip_scores(cached_results, include_scores)
+                return
+            cache_generation = result_cache.generation
+        
+        logger.info(f"Streaming search for '{query[:50]}...' in site: {site}, num_results: {num_results}, latency_budget: {latency_budget}")
+        start_time = time.time()
+        deadline = start_time + latency_budget if latency_budget else None
+        
+        tasks = await self._start_endpoint_searches(query, site, num_results, **kwargs)
+        task_endpoints = {task: endpoint_name for endpoint_name, task in tasks.items()}
+        pending = set(tasks.values())
+        completed_results = {}
+        # Parsed and hydrated JSON payloads are reused across the snapshots of this request
+        parse_cache = {}
+        hydrated = {}
+        failed_endpoints = 0
+        
+        try:
+            while pending:
+                timeout = None
+                if deadline is not None:
+                    timeout = deadline - time.time()
+                    if timeout <= 0:
+                        break
+                done, pending = await asyncio.wait(pending, timeout=timeout,
+                                                   return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    break
+                
+                new_results = False
+                for task in done:
+                    endpoint_name = task_endpoints[task]
+                    error = asyncio.CancelledError() if task.cancelled() else task.exception()
+                    if error is not None:
+                        logger.warning(f"Search failed for endpoint {endpoint_name}: {error}")
+                        failed_endpoints += 1
+                    else:
+                        completed_results[endpoint_name] = task.result()
+                        new_results = True
+                
+                if new_results:
+                    # Keep endpoint order so the final merge matches search()
+                    endpoint_results = {name: completed_results[name] for name in tasks
+                                        if name in completed_results}
+                    endpoint_results = await self._hydrate_results(endpoint_results, num_results, hydrated)
+                    yield _strip_scores(self._aggregate_results(endpoint_results, num_results=num_results,
+                                                                parse_cache=parse_cache),
+                                        include_scores)
+        finally:
+            for task in pending:
+                task.cancel()
+        
+        if pending:
+            logger.info(f"Latency budget exhausted, cancelled endpoints: {[task_endpoints[t] for t in pending]}")
+        
+        if not completed_results:
+            raise ValueError("All endpoint searches failed")
+        
+        logger.log_with_context(
+            LogLevel.INFO,
+            "Streaming search completed",
+            {
+                "duration": f"{time.time() - start_time:.2f}s",
+                "endpoints_queried": len(tasks),
+                "endpoints_succeeded": len(completed_results),
+                "endpoints_failed": failed_endpoints,
+                "endpoints_cancelled": len(pending),
+                "site": site
+            }
+        )
+        
+        # Only cache complete answers
+        if cache_key is not None and not pending:
+            endpoint_results = {name: completed_results[name] for name in tasks
+                                if name in completed_results}
+            endpoint_results = await self._hydrate_results(endpoint_results, num_results, hydrated)
+            result_cache.put(cache_key,
+                             self._aggregate_results(endpoint_results, num_results=num_results,
+                                                     parse_cache=parse_cache),
+                             cache_generation)
     
     async def search_by_url(self, url: str, endpoint_name: Optional[str] = None, **kwargs) -> Optional[List[str]]:
         """
@@ -801,47 +1649,137 @@ class VectorDBClient:
             temp_client = VectorDBClient(endpoint_name=endpoint_name)
             return await temp_client.search_by_url(url, **kwargs)
         
-        async with self._retrieval_lock:
-            logger.info(f"Retrieving item with URL: {url}")
+        logger.info(f"Retrieving item with URL: {url}")
+        
+        try:
+            # For single endpoint mode, use the first (and only) endpoint
+            if self.endpoint_name:
+                client = await self.get_client(self.endpoint_name)
+            else:
+                # Multiple endpoints - need to search all of them
+                for endpoint_name in self.enabled_endpoints:
+                    try:
+                        client = await self.get_client(endpoint_name)
+                        result = await client.search_by_url(url, **kwargs)
+                        if result:
+                            return result
+                    except Exception as e:
+                        logger.warning(f"Failed to search by URL in endpoint {endpoint_name}: {e}")
+                return None
             
+            result = await client.search_by_url(url, **kwargs)
+            
+            if result:
+                logger.debug(f"Successfully retrieved item for URL: {url}")
+            else:
+                logger.warning(f"No item found for URL: {url}")
+            
+            return result
+        except Exception as e:
+            logger.exception(f"Error retrieving item with URL: {url}")
+            logger.log_with_context(
+                LogLevel.ERROR,
+                "Item retrieval failed",
+                {
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                    "url": url,
+                    "db_type": self.db_type,
+                    "endpoint": self.endpoint_name
+                }
+            )
+            raise
+    
+    async def search_by_urls(self, urls: List[str], endpoint_name: Optional[str] = None,
+                             **kwargs) -> Dict[str, List[str]]:
+        """
+        Retrieve several documents by exact URL.
+        
+        Rows are served from the shared item cache when possible; the rest are
+        fetched with one batched lookup per endpoint. With several enabled
+        endpoints, each URL comes from the first endpoint (in configuration order)
+        that has it, as with search_by_url.
+        
+        Args:
+            urls: URLs to look up
+            endpoint_name: Optional endpoint name override
+            **kwargs: Additional parameters passed to the backend
+            
+        Returns:
+            Dictionary mapping each URL that was found to its [url, schema_json, name, site] row
+        """
+        if endpoint_name and endpoint_name != self.endpoint_name:
+            temp_client = VectorDBClient(endpoint_name=endpoint_name)
+            return await temp_client.search_by_urls(urls, **kwargs)
+        
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return {}
+        logger.info(f"Retrieving {len(urls)} items by URL")
+        
+        endpoint_names = [self.endpoint_name] if self.endpoint_name else list(self.enabled_endpoints)
+        found: Dict[str, List[str]] = {}
+        for name in endpoint_names:
+            remaining = [url for url in urls if url not in found]
+            if not remaining:
+                break
             try:
-                # For single endpoint mode, use the first (and only) endpoint
-                if self.endpoint_name:
-                    client = await self.get_client(self.endpoint_name)
-                else:
-                    # Multiple endpoints - need to search all of them
-                    for endpoint_name in self.enabled_endpoints:
-                        try:
-                            client = await self.get_client(endpoint_name)
-                            result = await client.search_by_url(url, **kwargs)
-                            if result:
-                                return result
-                        except Exception as e:
-                            logger.warning(f"Failed to search by URL in endpoint {endpoint_name}: {e}")
-                    return None
-                
-                result = await client.search_by_url(url, **kwargs)
-                
-                if result:
-                    logger.debug(f"Successfully retrieved item for URL: {url}")
-                else:
-                    logger.warning(f"No item found for URL: {url}")
-                
-                return result
+                found.update(await self._search_by_urls_on_endpoint(name, remaining, **kwargs))
             except Exception as e:
-                logger.exception(f"Error retrieving item with URL: {url}")
-                logger.log_with_context(
-                    LogLevel.ERROR,
-                    "Item retrieval failed",
-                    {
-                        "error_type": type(e).__name__,
-                        "error_message": str(e),
-                        "url": url,
-                        "db_type": self.db_type,
-                        "endpoint": self.endpoint_name
-                    }
-                )
-                raise
+                if self.endpoint_name:
+                    logger.exception(f"Error retrieving {len(remaining)} items by URL")
+                    logger.log_with_context(
+                        LogLevel.ERROR,
+                        "Batch item retrieval failed",
+                        {
+                            "error_type": type(e).__name__,
+                            "error_message": str(e),
+                            "url_count": len(remaining),
+                            "db_type": self.db_type,
+                            "endpoint": name
+                        }
+                    )
+                    raise
+                logger.warning(f"Failed to search by URLs in endpoint {name}: {e}")
+        
+        logger.debug(f"Found {len(found)} of {len(urls)} items by URL")
+        return found
+    
+    async def _search_by_urls_on_endpoint(self, endpoint_name: str, urls: List[str],
+                                          **kwargs) -> Dict[str, List[str]]:
+        """
+        Look up URLs on one endpoint through the item cache.
+        
+        Args:
+            endpoint_name: Name of the endpoint
+            urls: URLs to look up
+            **kwargs: Additional parameters passed to the backend
+            
+        Returns:
+            Dictionary mapping the URLs that were found to their rows
+        """
+        item_cache = get_item_cache()
+        # Cached rows are keyed by endpoint only, so overrides such as a
+        # different index bypass the cache
+        use_cache = item_cache.enabled and not kwargs
+        found = item_cache.get_many(endpoint_name, urls) if use_cache else {}
+        missing = [url for url in urls if url not in found]
+        if not missing:
+            return found
+        
+        generation = item_cache.generation
+        client = await self.get_client(endpoint_name)
+        async with _get_endpoint_semaphore(endpoint_name):
+            if hasattr(client, 'search_by_urls'):
+                fetched = await client.search_by_urls(missing, **kwargs)
+            else:
+                rows = await asyncio.gather(*(client.search_by_url(url, **kwargs) for url in missing))
+                fetched = {url: row for url, row in zip(missing, rows) if row}
+        
+        if use_cache:
+            item_cache.put_many(endpoint_name, [row[:4] for row in fetched.values()], generation)
+        found.update(fetched)
+        return found
     
     async def search_all_sites(self, query: str, num_results: int = 50, 
                              endpoint_name: Optional[str] = None, **kwargs) -> List[List[str]]:
@@ -880,58 +1818,121 @@ class VectorDBClient:
             temp_client = VectorDBClient(endpoint_name=endpoint_name)
             return await temp_client.get_sites(**kwargs)
         
-        async with self._retrieval_lock:
-            logger.info("Retrieving list of sites from database")
-            
-            try:
-                # For single endpoint mode, use the first (and only) endpoint
-                if self.endpoint_name:
+        logger.info("Retrieving list of sites from database")
+        
+        try:
+            # For single endpoint mode, use the first (and only) endpoint
+            if self.endpoint_name:
+                if kwargs:
                     client = await self.get_client(self.endpoint_name)
                     sites = await client.get_sites(**kwargs)
                 else:
-                    # Multiple endpoints - aggregate sites from all
-                    all_sites = set()
-                    for endpoint_name in self.enabled_endpoints:
-                        try:
+                    sites = await self._get_endpoint_sites(self.endpoint_name)
+            else:
+                # Multiple endpoints - aggregate sites from all
+                all_sites = set()
+                for endpoint_name in self.enabled_endpoints:
+                    try:
+                        if kwargs:
                             client = await self.get_client(endpoint_name)
                             endpoint_sites = await client.get_sites(**kwargs)
-                            if endpoint_sites:  # Not None and not empty
-                                all_sites.update(endpoint_sites)
-                        except Exception as e:
-                            logger.warning(f"Failed to get sites from endpoint {endpoint_name}: {e}")
-                    sites = list(all_sites)
-                
-                # If backend doesn't support get_sites, it should return None
-                if sites is None:
-                    # Return empty list to indicate unknown sites
-                    logger.info(f"Backend doesn't support get_sites, will query for all sites")
-                    return []
-                
-                logger.log_with_context(
-                    LogLevel.INFO,
-                    "Sites retrieved",
-                    {
-                        "sites_count": len(sites),
-                        "db_type": self.db_type,
-                        "endpoint": self.endpoint_name
-                    }
-                )
-                return sites
-            except Exception as e:
-                # Backend doesn't support get_sites or error occurred
-                logger.info(f"Backend doesn't support get_sites or error occurred: {e}")
-                
-                # Return empty list to indicate unknown sites (will be queried for all)
-                logger.log_with_context(
-                    LogLevel.INFO,
-                    "Backend doesn't support get_sites, will query for all sites",
-                    {
-                        "db_type": self.db_type,
-                        "endpoint": self.endpoint_name,
-                        "error": str(e)
-                    }
-                )
+                        else:
+                            endpoint_sites = await self._get_endpoint_sites(endpoint_name)
+                        if endpoint_sites:  # Not None and not empty
+                            all_sites.update(endpoint_sites)
+                    except Exception as e:
+                        logger.warning(f"Failed to get sites from endpoint {endpoint_name}: {e}")
+                sites = list(all_sites)
+            
+            # If backend doesn't support get_sites, it should return None
+            if sites is None:
+                # Return empty list to indicate unknown sites
+                logger.info(f"Backend doesn't support get_sites, will query for all sites")
                 return []
+            
+            logger.log_with_context(
+                LogLevel.INFO,
+                "Sites retrieved",
+                {
+                    "sites_count": len(sites),
+                    "db_type": self.db_type,
+                    "endpoint": self.endpoint_name
+                }
+            )
+            return sites
+        except Exception as e:
+            # Backend doesn't support get_sites or error occurred
+            logger.info(f"Backend doesn't support get_sites or error occurred: {e}")
+            
+            # Return empty list to indicate unknown sites (will be queried for all)
+            logger.log_with_context(
+                LogLevel.INFO,
+                "Backend doesn't support get_sites, will query for all sites",
+                {
+                    "db_type": self.db_type,
+                    "endpoint": self.endpoint_name,
+                    "error": str(e)
+                }
+            )
+            return []
+
+
+def get_retrieval_stats() -> Dict[str, Any]:
+    """
+    Collect endpoint health, result cache and embedding cache statistics.
+    
+    Returns:
+        Dictionary of statistics suitable for JSON serialization
+    """
+    from embedding.embedding_cache import get_embedding_cache
+    return {
+        "endpoints": get_endpoint_health_stats(),
+        "result_cache": get_result_cache().stats(),
+        "item_cache": get_item_cache().stats(),
+        "embedding_cache": get_embedding_cache().stats(),
+        "site_catalog": get_site_catalog().stats(),
+        "executors": get_executor_stats(),
+        "micro_batchers": get_micro_batcher_stats()
+    }
+
+
+async def warmup_retrieval_clients():
+    """
+    Create the clients for all enabled endpoints and let backends that support it
+    open their connections, so the first searches don't pay connection setup.
+    
+    Failures are logged and otherwise ignored; the endpoint is retried on first use.
+    """
+    try:
+        client = VectorDBClient()
+    except Exception as e:
+        logger.warning(f"Skipping retrieval warmup: {e}")
+        return
+    for endpoint_name in client.enabled_endpoints:
+        try:
+            backend = await client.get_client(endpoint_name)
+            if hasattr(backend, 'warmup'):
+                await backend.warmup()
+            logger.info(f"Warmed up retrieval endpoint: {endpoint_name}")
+        except Exception as e:
+            logger.warning(f"Warmup failed for endpoint {endpoint_name}: {e}")
+
+
+async def close_retrieval_clients():
+    """
+    Close cached backend clients that hold long-lived connections.
+    
+    Called on server shutdown so pooled connections are released cleanly.
+    """
+    async with _client_cache_lock:
+        clients = list(_client_cache.items())
+        _client_cache.clear()
+    for cache_key, client in clients:
+        if hasattr(client, 'close'):
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Error closing client {cache_key}: {e}")
 
 
 # Factory function to make it easier to get a client with the right type
@@ -977,6 +1978,37 @@ async def search(query: str,
     return await client.search(query, site, num_results, **kwargs)
 
 
+async def search_stream(query: str,
+                        site: str = "all",
+                        num_results: int = 50,
+                        latency_budget: Optional[float] = None,
+                        endpoint_name: Optional[str] = None,
+                        query_params: Optional[Dict[str, Any]] = None,
+                        **kwargs) -> AsyncIterator[List[List[str]]]:
+    """
+    Streaming search interface that yields merged results as each endpoint finishes.
+    
+    Args:
+        query: The search query
+        site: Site to search in (default: "all")
+        num_results: Number of results to return (default: 50)
+        latency_budget: Optional seconds after which slow endpoints are cancelled
+        endpoint_name: Optional name of the endpoint to use
+        query_params: Optional query parameters for overriding endpoint
+        **kwargs: Additional parameters passed to the search method
+        
+    Yields:
+        Merged search results from the endpoints completed so far
+        
+    Example:
+        async for results in search_stream("climate change", site="example.com", latency_budget=1.5):
+            ...
+    """
+    client = get_vector_db_client(endpoint_name=endpoint_name, query_params=query_params)
+    async for results in client.search_stream(query, site, num_results, latency_budget, **kwargs):
+        yield results
+
+
 async def search_all_sites(query: str,
                           top_n: int = 10,
                           endpoint_name: Optional[str] = None,
@@ -1044,6 +2076,29 @@ async def search_by_url(url: str,
     return await client.search_by_url(url, **kwargs)
 
 
+async def search_by_urls(urls: List[str],
+                        endpoint_name: Optional[str] = None,
+                        query_params: Optional[Dict[str, Any]] = None,
+                        **kwargs) -> Dict[str, List[str]]:
+    """
+    Retrieve several documents by exact URL with batched backend lookups.
+    
+    Args:
+        urls: URLs to look up
+        endpoint_name: Optional name of the endpoint to use
+        query_params: Optional query parameters for overriding endpoint
+        **kwargs: Additional parameters passed to the search_by_urls method
+        
+    Returns:
+        Dictionary mapping each URL that was found to its [url, schema_json, name, site] row
+        
+    Example:
+        documents = await search_by_urls(["https://example.com/a", "https://example.com/b"])
+    """
+    client = get_vector_db_client(endpoint_name=endpoint_name, query_params=query_params)
+    return await client.search_by_urls(urls, **kwargs)
+
+
 async def upload_documents(documents: List[Dict[str, Any]],
                           endpoint_name: Optional[str] = None,
                           query_params: Optional[Dict[str, Any]] = None,
@@ -1067,6 +2122,28 @@ async def upload_documents(documents: List[Dict[str, Any]],
     return await client.upload_documents(documents, **kwargs)
 
 
+@asynccontextmanager
+async def bulk_load(endpoint_name: Optional[str] = None,
+                    query_params: Optional[Dict[str, Any]] = None,
+                    **kwargs) -> AsyncIterator["VectorDBClient"]:
+    """
+    Wrap a multi-batch load so the write endpoint can defer index refreshes to the end.
+    
+    Args:
+        endpoint_name: Optional name of the endpoint to use (overrides write_endpoint)
+        query_params: Optional query parameters for overriding endpoint
+        **kwargs: Additional parameters passed to the backend
+        
+    Example:
+        async with bulk_load():
+            for batch in batches:
+                await upload_documents(batch)
+    """
+    client = get_vector_db_client(endpoint_name=endpoint_name, query_params=query_params)
+    async with client.bulk_load(**kwargs) as loader:
+        yield loader
+
+
 async def delete_documents_by_site(site: str,
                                   endpoint_name: Optional[str] = None,
                                   query_params: Optional[Dict[str, Any]] = None,
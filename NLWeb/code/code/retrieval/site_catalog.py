@@ -0,0 +1,181 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""
+Process-wide catalog of the sites available in each retrieval endpoint.
+
+VectorDBClient instances are created per request, so site lists are kept here
+instead of on the instance. The first lookup for an endpoint fetches its sites;
+after that lookups are served from memory. Entries older than the TTL are still
+served while a background task refreshes them, so routing never waits on a
+backend once an endpoint has been seen. Writes through VectorDBClient update the
+catalog directly.
+
+Configuration (environment variables):
+    NLWEB_SITE_CATALOG_TTL: seconds before an entry is refreshed (default 300, 0 disables caching)
+
+WARNING: This code is under development and may undergo changes in future releases.
+Backwards compatibility is not guaranteed at this time.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from utils.logging_config_helper import get_configured_logger
+from utils.logger import LogLevel
+
+logger = get_configured_logger("site_catalog")
+
+DEFAULT_TTL_SECONDS = 300.0
+
+SitesFetcher = Callable[[], Awaitable[Optional[List[str]]]]
+
+
+class _CatalogEntry:
+    def __init__(self, sites: Optional[List[str]], fetcher: SitesFetcher):
+        self.sites = sites
+        self.fetcher = fetcher
+        self.fetched_at = time.monotonic()
+
+
+class SiteCatalog:
+    """
+    Cache of endpoint site lists with stale-while-revalidate refresh.
+
+    A site list of None means the backend does not support listing sites, in
+    which case callers should assume it may hold any site.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL_SECONDS):
+        self.ttl = ttl
+        self._entries: Dict[str, _CatalogEntry] = {}
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._refresh_task: Optional[asyncio.Task] = None
+        self.fetches = 0
+        self.fetch_errors = 0
+
+    async def _fetch(self, endpoint_name: str, fetcher: SitesFetcher) -> Optional[List[str]]:
+        """Fetch an endpoint's sites and store them, keeping the old list on failure."""
+        self.fetches += 1
+        try:
+            sites = await fetcher()
+            if sites is not None:
+                sites = sorted(set(sites))
+                logger.info(f"Endpoint {endpoint_name} has {len(sites)} sites: {sites[:5]}{'...' if len(sites) > 5 else ''}")
+        except Exception as e:
+            self.fetch_errors += 1
+            previous = self._entries.get(endpoint_name)
+            if previous is not None:
+                logger.warning(f"Refreshing sites for endpoint {endpoint_name} failed, keeping previous list: {e}")
+                sites = previous.sites
+            else:
+                # Any error means the backend doesn't support get_sites or it failed
+                logger.info(f"Backend for endpoint {endpoint_name} does not support get_sites() or it failed: {e}")
+                sites = None
+        self._entries[endpoint_name] = _CatalogEntry(sites, fetcher)
+        return sites
+
+    def _start_fetch(self, endpoint_name: str, fetcher: SitesFetcher) -> asyncio.Task:
+        """Start fetching an endpoint's sites unless a fetch is already in flight."""
+        task = self._inflight.get(endpoint_name)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(endpoint_name, fetcher))
+            self._inflight[endpoint_name] = task
+            task.add_done_callback(lambda _: self._inflight.pop(endpoint_name, None))
+        return task
+
+    async def get_sites(self, endpoint_name: str, fetcher: SitesFetcher) -> Optional[List[str]]:
+        """
+        Get the sites for an endpoint.
+
+        Args:
+            endpoint_name: Name of the endpoint
+            fetcher: Coroutine function returning the endpoint's sites, used
+                for the first lookup and for refreshes
+
+        Returns:
+            List of site names, or None if the backend cannot list its sites
+        """
+        entry = self._entries.get(endpoint_name)
+        if self.ttl <= 0:
+            # Catalog disabled, always ask the backend
+            entry = None
+        else:
+            self._ensure_refresh_task()
+        if entry is None:
+            # Shield so a cancelled request doesn't abort a fetch others may be waiting on
+            return await asyncio.shield(self._start_fetch(endpoint_name, fetcher))
+        if time.monotonic() - entry.fetched_at > self.ttl:
+            # Serve the stale list and refresh it off the request path
+            self._start_fetch(endpoint_name, fetcher)
+        return entry.sites
+
+    def _ensure_refresh_task(self):
+        """Start the periodic refresh loop on the running event loop if needed."""
+        if self._refresh_task is not None and not self._refresh_task.done():
+            return
+        self._refresh_task = asyncio.ensure_future(self._refresh_loop())
+
+    async def _refresh_loop(self):
+        """Refresh every known endpoint once per TTL so entries rarely go stale."""
+        while True:
+            await asyncio.sleep(self.ttl)
+            for endpoint_name, entry in list(self._entries.items()):
+                try:
+                    await self._start_fetch(endpoint_name, entry.fetcher)
+                except Exception as e:
+                    logger.warning(f"Background site refresh for endpoint {endpoint_name} failed: {e}")
+
+    def add_sites(self, endpoint_name: str, sites: Iterable[str]):
+        """Record sites that were just written to an endpoint."""
+        entry = self._entries.get(endpoint_name)
+        if entry is None or entry.sites is None:
+            return
+        entry.sites = sorted(set(entry.sites) | {site for site in sites if site})
+
+    def remove_site(self, endpoint_name: str, site: str):
+        """Record that all documents for a site were deleted from an endpoint."""
+        entry = self._entries.get(endpoint_name)
+        if entry is None or entry.sites is None:
+            return
+        entry.sites = [s for s in entry.sites if s != site]
+
+    def invalidate(self, endpoint_name: Optional[str] = None):
+        """Forget one endpoint (or all), forcing a fetch on next lookup."""
+        if endpoint_name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(endpoint_name, None)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "ttl": self.ttl,
+            "fetches": self.fetches,
+            "fetch_errors": self.fetch_errors,
+            "endpoints": {
+                name: {
+                    "sites_count": len(entry.sites) if entry.sites is not None else None,
+                    "age": round(now - entry.fetched_at, 1)
+                }
+                for name, entry in self._entries.items()
+            }
+        }
+
+
+_catalog: Optional[SiteCatalog] = None
+
+
+def get_site_catalog() -> SiteCatalog:
+    """Return the process-wide site catalog, creating it from the environment on first use."""
+    global _catalog
+    if _catalog is None:
+        try:
+            ttl = float(os.getenv("NLWEB_SITE_CATALOG_TTL", DEFAULT_TTL_SECONDS))
+        except ValueError:
+            ttl = DEFAULT_TTL_SECONDS
+        _catalog = SiteCatalog(ttl=ttl)
+        logger.log_with_context(LogLevel.INFO, "Site catalog initialized", {"ttl": ttl})
+    return _catalog
@@ -1,9 +1,17 @@
-import httpx
+import asyncio
 import json
+import os
+import time
 from config.config import CONFIG, RetrievalProviderConfig
 from typing import Any, Dict, List, Optional, Tuple, Union
 from utils import snowflake
 
+DEFAULT_SITES_TTL = 300.0
+
+# Per-service cache of get_unique_sites results: service name -> (expiry, sites)
+_sites_cache: Dict[str, Tuple[float, List[str]]] = {}
+_sites_in_flight: Dict[str, "asyncio.Future"] = {}
+
 class SnowflakeCortexSearchClient:
     """
     Adapts the Snowflake Cortex Search API to the VectorDBClientInterface.
@@ -27,9 +35,22 @@ class SnowflakeCortexSearchClient:
     async def search_by_url(self, url: str, **kwargs) -> Optional[List[str]]:
         return await search(query="a", url=url, top_n=1, cfg=self._cfg)
 
+    async def search_by_urls(self, urls: List[str], **kwargs) -> Dict[str, List[str]]:
+        """
+        Retrieve several documents by URL, one query per 1000 URLs (the service's result limit).
+        """
+        urls = list(dict.fromkeys(urls))
+        batches = [urls[i:i + 1000] for i in range(0, len(urls), 1000)]
+        responses = await asyncio.gather(*(search(query="a", url=batch, top_n=len(batch), cfg=self._cfg) for batch in batches))
+        return {row[0]: row for rows in responses for row in rows}
+
     async def search_all_sites(self, query: str, num_results: int = 50, **kwargs) -> List[List[str]]:
         return await search(query, top_n=num_results, cfg=self._cfg)
     
+    async def close(self):
+        """Close the pooled Snowflake HTTP clients."""
+        await snowflake.close_http_clients()
+
     async def get_sites(self, **kwargs) -> List[str]:
         """
         Get a list of unique site names from the Snowflake Cortex Search Service.
@@ -54,51 +75,53 @@ def get_cortex_search_service(cfg: RetrievalProviderConfig) -> Tuple[str,str,str
         raise snowflake.ConfigurationError(f"Invalid SNOWFLAKE_CORTEX_SEARCH_SERVICE, expected format:<database>.<schema>.<service>, got {index_name}")
     return (parts[0], parts[1], parts[2])
 
-async def search(query: str, site: str|List[str]|None=None, url: str|None=None, top_n: int=10, cfg: RetrievalProviderConfig|None=None) -> dict:
+async def search(query: str, site: str|List[str]|None=None, url: str|List[str]|None=None, top_n: int=10, cfg: RetrievalProviderConfig|None=None) -> dict:
     """
     Send a search request to a Cortex Search Service which has the columns
-    URL and SCHEMA.
+    URL and SCHEMA. `url` may be a list to match any of several URLs.
 
     See: https://docs.snowflake.com/developer-guide/snowflake-rest-api/reference/cortex-search-service
     """
 
     # Filtering language:
     # https://docs.snowflake.com/en/user-guide/snowflake-cortex/cortex-search/query-cortex-search-service#filter-syntax
+    url_filter = None
+    if isinstance(url, list):
+        url_filter = {"@or": [{"@eq": {"url": u}} for u in url]}
+    elif url:
+        url_filter = {"@eq": {"url": url}}
+
     filter = None
-    if url and not site:
-        filter = {"@eq": {"url": url}}
-    elif not url and site:
+    if url_filter and not site:
+        filter = url_filter
+    elif not url_filter and site:
         filter = {"@eq": {"site": site}}
-    elif url and site:
+    elif url_filter and site:
         filter = {
             "@and": [
-                {"@eq": {"url": url}},
+                url_filter,
                 {"@eq": {"site": site}},
             ]
         }
 
     (database, schema, service) = get_cortex_search_service(cfg)
-    async with httpx.AsyncClient() as client:
-        response =  await client.post(
-            snowflake.get_account_url(cfg) + f"/api/v2/databases/{database}/schemas/{schema}/cortex-search-services/{service}:query",
-            json={
-                "query": query,
-                "limit": max(1, min(top_n, 1000)),
-                "columns": ["url", "site", "schema_json"],
-                "filter": filter,
-            },
-            headers={
-                    "Authorization": f"Bearer {snowflake.get_pat(cfg)}",
-                    "Content-Type": "application/json",
-                    "Accept": "application/json",
-            },
-            timeout=60,
-        )
-        if response.status_code == 400:
-            raise Exception(response.json())
-        response.raise_for_status()
-        results = response.json().get("results", [])
-        return list(map(_process_result, results))
+    client = snowflake.get_http_client(cfg)
+    response =  await client.post(
+        snowflake.get_account_url(cfg) + f"/api/v2/databases/{database}/schemas/{schema}/cortex-search-services/{service}:query",
+        json={
+            "query": query,
+            "limit": max(1, min(top_n, 1000)),
+            "columns": ["url", "site", "schema_json"],
+            "filter": filter,
+        },
+        headers=snowflake.get_headers(cfg),
+        timeout=60,
+    )
+    if response.status_code == 400:
+        raise Exception(response.json())
+    response.raise_for_status()
+    results = response.json().get("results", [])
+    return list(map(_process_result, results))
 
 def _process_result(r: Dict[str, str]) -> List[str]:
     url = r.get("url", "")
@@ -117,6 +140,10 @@ async def get_unique_sites(cfg: RetrievalProviderConfig) -> List[str]:
     """
     Get unique site values from the Snowflake Cortex Search Service using CORTEX_SEARCH_DATA_SCAN.
     
+    Results are cached per service for NLWEB_SNOWFLAKE_SITES_TTL seconds
+    (default 300, 0 disables the cache), and concurrent callers share one
+    in-flight scan.
+    
     Args:
         cfg: The Snowflake configuration
         
@@ -128,28 +155,46 @@ async def get_unique_sites(cfg: RetrievalProviderConfig) -> List[str]:
     
     # Get the service configuration
     (database, schema, service) = get_cortex_search_service(cfg)
+    service_name = f"{database}.{schema}.{service}"
     
+    try:
+        ttl = float(os.getenv("NLWEB_SNOWFLAKE_SITES_TTL", DEFAULT_SITES_TTL))
+    except ValueError:
+        ttl = DEFAULT_SITES_TTL
+    if ttl <= 0:
+        return await _scan_unique_sites(cfg, service_name)
+    
+    cached = _sites_cache.get(service_name)
+    if cached is not None and cached[0] > time.monotonic():
+        return list(cached[1])
+    
+    task = _sites_in_flight.get(service_name)
+    if task is None:
+        task = asyncio.ensure_future(_scan_unique_sites(cfg, service_name))
+        _sites_in_flight[service_name] = task
+        task.add_done_callback(lambda _: _sites_in_flight.pop(service_name, None))
+    sites = await asyncio.shield(task)
+    _sites_cache[service_name] = (time.monotonic() + ttl, sites)
+    return list(sites)
+
+async def _scan_unique_sites(cfg: RetrievalProviderConfig, service_name: str) -> List[str]:
     # Use CORTEX_SEARCH_DATA_SCAN as recommended by sfc-gh-ashankar
-    query = f"SELECT DISTINCT site FROM TABLE(CORTEX_SEARCH_DATA_SCAN(SERVICE_NAME=>'{database}.{schema}.{service}')) ORDER BY site"
+    query = f"SELECT DISTINCT site FROM TABLE(CORTEX_SEARCH_DATA_SCAN(SERVICE_NAME=>'{service_name}')) ORDER BY site"
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            snowflake.get_account_url(cfg) + "/api/v2/statements",
-            json={
-                "statement": query,
-                "timeout": 60,
-            },
-            headers={
-                "Authorization": f"Bearer {snowflake.get_pat(cfg)}",
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-            },
-            timeout=60,
-        )
-        
-        if response.status_code == 400:
-            raise Exception(response.json())
-        response.raise_for_status()
-        
-        # Use concise list comprehension as recommended by sfc-gh-ashankar
-        return [x[0] for x in response.json().get("data", [])]
+    client = snowflake.get_http_client(cfg)
+    response = await client.post(
+        snowflake.get_account_url(cfg) + "/api/v2/statements",
+        json={
+            "statement": query,
+            "timeout": 60,
+        },
+        headers=snowflake.get_headers(cfg),
+        timeout=60,
+    )
+    
+    if response.status_code == 400:
+        raise Exception(response.json())
+    response.raise_for_status()
+    
+    # Use concise list comprehension as recommended by sfc-gh-ashankar
+    return [x[0] for x in response.json().get("data", [])]
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the embedding cache: LRU behavior, single-flight deduplication
+of concurrent misses, and the on-disk tier.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from embedding.embedding_cache import EmbeddingCache, _DiskTier
+
+
+class TestEmbeddingCacheLRU(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = EmbeddingCache(max_size=2)
+        cache.put("p", "m", "a", [1.0])
+        cache.put("p", "m", "b", [2.0])
+        # Touch "a" so "b" becomes the oldest entry
+        self.assertEqual(cache.get("p", "m", "a"), [1.0])
+        cache.put("p", "m", "c", [3.0])
+
+        self.assertIsNone(cache.get("p", "m", "b"))
+        self.assertEqual(cache.get("p", "m", "a"), [1.0])
+        self.assertEqual(cache.get("p", "m", "c"), [3.0])
+
+    def test_keys_are_normalized_and_scoped_by_model(self):
+        cache = EmbeddingCache(max_size=10)
+        cache.put("p", "m", "hello   world", [1.0])
+
+        self.assertEqual(cache.get("p", "m", " hello world\n"), [1.0])
+        self.assertIsNone(cache.get("p", "other", "hello world"))
+
+    def test_returned_lists_are_copies(self):
+        cache = EmbeddingCache(max_size=10)
+        cache.put("p", "m", "a", [1.0, 2.0])
+        cache.get("p", "m", "a").append(3.0)
+
+        self.assertEqual(cache.get("p", "m", "a"), [1.0, 2.0])
+
+
+class TestEmbeddingCacheSingleFlight(unittest.IsolatedAsyncioTestCase):
+
+    async def test_concurrent_misses_share_one_call(self):
+        cache = EmbeddingCache(max_size=10)
+        calls = 0
+        release = asyncio.Event()
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return [0.5, 0.25]
+
+        tasks = [asyncio.create_task(cache.get_or_compute("p", "m", "q", compute)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks)
+
+        self.assertEqual(calls, 1)
+        self.assertEqual(results, [[0.5, 0.25]] * 5)
+        self.assertEqual(cache.stats()["inflight_waits"], 4)
+
+    async def test_waiter_recomputes_when_leading_call_is_cancelled(self):
+        cache = EmbeddingCache(max_size=10)
+        started = asyncio.Event()
+        calls = 0
+
+        async def compute():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                started.set()
+                await asyncio.sleep(3600)
+            return [1.0]
+
+        leader = asyncio.create_task(cache.get_or_compute("p", "m", "q", compute))
+        await started.wait()
+        waiter = asyncio.create_task(cache.get_or_compute("p", "m", "q", compute))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await leader
+        self.assertEqual(await asyncio.wait_for(waiter, 1), [1.0])
+        self.assertEqual(calls, 2)
+
+    async def test_compute_error_reaches_waiters(self):
+        cache = EmbeddingCache(max_size=10)
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            raise RuntimeError("provider down")
+
+        tasks = [asyncio.create_task(cache.get_or_compute("p", "m", "q", compute)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        self.assertIsNone(cache.get("p", "m", "q"))
+
+    async def test_failure_while_storing_does_not_hang_waiters(self):
+        cache = EmbeddingCache(max_size=10)
+        release = asyncio.Event()
+
+        async def compute():
+            await release.wait()
+            return [1.0]
+
+        def failing_put(*args, **kwargs):
+            raise TypeError("cannot store")
+
+        cache.put = failing_put
+        tasks = [asyncio.create_task(cache.get_or_compute("p", "m", "q", compute)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.wait_for(asyncio.gather(*tasks), 1)
+
+        self.assertEqual(results, [[1.0]] * 3)
+
+
+class TestEmbeddingDiskTier(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = self._tmp.name
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip_across_restart(self):
+        cache = EmbeddingCache(max_size=10, disk_dir=self.dir)
+        cache.put("p", "m", "first", [0.5, -1.5, 2.0])
+        cache.put("p", "m", "second", [4.0, 8.0])
+
+        # A new cache over the same directory reloads the index from disk
+        restarted = EmbeddingCache(max_size=10, disk_dir=self.dir)
+        self.assertEqual(restarted.get("p", "m", "first"), [0.5, -1.5, 2.0])
+        self.assertEqual(restarted.get("p", "m", "second"), [4.0, 8.0])
+        self.assertEqual(restarted.stats()["disk_hits"], 2)
+
+    def test_background_writes_are_flushed(self):
+        cache = EmbeddingCache(max_size=10, disk_dir=self.dir)
+        cache.put("p", "m", "q", [1.0, 2.0], background=True)
+        cache.flush()
+
+        self.assertEqual(EmbeddingCache(max_size=10, disk_dir=self.dir).get("p", "m", "q"), [1.0, 2.0])
+
+    def test_interleaved_writers_record_their_own_offsets(self):
+        # Two tiers over the same files stand in for two worker processes
+        first = _DiskTier(self.dir, "p", "m")
+        second = _DiskTier(self.dir, "p", "m")
+        first.put("a", [1.0, 1.0])
+        second.put("b", [2.0, 2.0])
+        first.put("c", [3.0, 3.0])
+
+        reloaded = _DiskTier(self.dir, "p", "m")
+        self.assertEqual(reloaded.get("a"), [1.0, 1.0])
+        self.assertEqual(reloaded.get("b"), [2.0, 2.0])
+        self.assertEqual(reloaded.get("c"), [3.0, 3.0])
+        # Entries written by the other writer are found without a restart
+        self.assertEqual(first.get("b"), [2.0, 2.0])
+        self.assertEqual(second.get("c"), [3.0, 3.0])
+
+    def test_partial_index_line_is_ignored(self):
+        tier = _DiskTier(self.dir, "p", "m")
+        tier.put("a", [1.0])
+        with open(tier.idx_path, "a", encoding="utf-8") as f:
+            f.write("b\t4")
+
+        reloaded = _DiskTier(self.dir, "p", "m")
+        self.assertEqual(reloaded.get("a"), [1.0])
+        self.assertIsNone(reloaded.get("b"))
+
+    def test_size_limit_stops_appends(self):
+        tier = _DiskTier(self.dir, "p", "m", max_bytes=12)
+        tier.put("a", [1.0, 2.0])
+        tier.put("b", [3.0, 4.0])
+
+        self.assertEqual(tier.get("a"), [1.0, 2.0])
+        self.assertIsNone(tier.get("b"))
+        self.assertEqual(os.path.getsize(tier.vec_path), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
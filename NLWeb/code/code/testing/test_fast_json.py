@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Unit tests for fast_json: whichever backend is installed, output and error
+behavior match the standard library for the cases the request path relies on.
+"""
+
+import json
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils import fast_json
+
+
+class TestFastJson(unittest.TestCase):
+
+    def test_round_trip(self):
+        obj = {"url": "https://example.com/a/b", "score": 0.25, "tags": ["x", None, True], "n": 3}
+        self.assertEqual(fast_json.loads(fast_json.dumps(obj)), obj)
+        self.assertEqual(fast_json.loads(fast_json.dumps_bytes(obj)), obj)
+
+    def test_output_is_compact_utf8(self):
+        text = fast_json.dumps({"name": "café", "path": "a/b"})
+        self.assertEqual(json.loads(text), {"name": "café", "path": "a/b"})
+        self.assertNotIn(" ", text)
+        self.assertIn("café", text)
+        self.assertIn("a/b", text)
+        self.assertEqual(fast_json.dumps_bytes({"name": "café"}), '{"name":"café"}'.encode("utf-8"))
+
+    def test_loads_accepts_bytes(self):
+        self.assertEqual(fast_json.loads(b'{"a": [1, 2]}'), {"a": [1, 2]})
+        self.assertEqual(fast_json.loads(bytearray(b'[1]')), [1])
+
+    def test_large_integers_fall_back_to_stdlib(self):
+        big = 2 ** 80
+        self.assertEqual(fast_json.loads(fast_json.dumps({"v": big})), {"v": big})
+        self.assertEqual(fast_json.loads(str(big)), big)
+
+    def test_invalid_input_raises_json_decode_error(self):
+        with self.assertRaises(json.JSONDecodeError):
+            fast_json.loads("{not json")
+
+    def test_unserializable_raises_type_error(self):
+        with self.assertRaises(TypeError):
+            fast_json.dumps({"v": object()})
+        with self.assertRaises(TypeError):
+            fast_json.dumps_bytes({"v": object()})
+
+    def test_backend_is_reported(self):
+        self.assertIn(fast_json.BACKEND, ("orjson", "ujson", "json"))
+
+
+if __name__ == "__main__":
+    unittest.main()
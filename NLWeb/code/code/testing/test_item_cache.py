@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the per-URL item cache used by search_by_urls: endpoint
+scoping, TTL, eviction and per-site invalidation.
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from retrieval.item_cache import ItemCache
+
+
+def row(url, site="a"):
+    return [url, '{"@type": "Recipe"}', f"Name of {url}", site]
+
+
+class TestItemCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ItemCache(ttl=60, max_entries=10)
+
+    def test_get_many_returns_hits_only(self):
+        self.cache.put_many("ep1", [row("u1"), row("u2")], self.cache.generation)
+        found = self.cache.get_many("ep1", ["u1", "u2", "u3"])
+
+        self.assertEqual(found, {"u1": row("u1"), "u2": row("u2")})
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_rows_are_scoped_by_endpoint(self):
+        self.cache.put_many("ep1", [row("u1")], self.cache.generation)
+        self.assertEqual(self.cache.get_many("ep2", ["u1"]), {})
+
+    def test_extra_columns_are_not_stored(self):
+        self.cache.put_many("ep1", [row("u1") + [0.9]], self.cache.generation)
+        self.assertEqual(self.cache.get_many("ep1", ["u1"])["u1"], row("u1"))
+
+    def test_entries_expire(self):
+        with mock.patch("retrieval.item_cache.time.monotonic", return_value=1000.0):
+            self.cache.put_many("ep1", [row("u1")], self.cache.generation)
+        with mock.patch("retrieval.item_cache.time.monotonic", return_value=1061.0):
+            self.assertEqual(self.cache.get_many("ep1", ["u1"]), {})
+
+    def test_oldest_entries_are_evicted(self):
+        cache = ItemCache(ttl=60, max_entries=2)
+        cache.put_many("ep1", [row("u1"), row("u2"), row("u3")], cache.generation)
+        self.assertEqual(sorted(cache.get_many("ep1", ["u1", "u2", "u3"])), ["u2", "u3"])
+
+    def test_invalidation_is_per_site(self):
+        self.cache.put_many("ep1", [row("u1", "a"), row("u2", "b")], self.cache.generation)
+        self.cache.invalidate_sites(["a"])
+
+        self.assertEqual(list(self.cache.get_many("ep1", ["u1", "u2"])), ["u2"])
+
+    def test_rows_fetched_across_an_invalidation_are_not_stored(self):
+        generation = self.cache.generation
+        self.cache.invalidate_sites(["a"])
+        self.cache.put_many("ep1", [row("u1")], generation)
+
+        self.assertEqual(self.cache.get_many("ep1", ["u1"]), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the micro-batcher: coalescing by key, size- and window-based
+flushes, and error propagation to every caller in a batch.
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from retrieval.micro_batcher import MicroBatcher
+
+
+class TestMicroBatcher(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.batches = []
+
+    async def run_batch(self, key, items):
+        self.batches.append((key, list(items)))
+        return [f"{key}:{item}" for item in items]
+
+    async def test_concurrent_submissions_share_a_batch(self):
+        batcher = MicroBatcher("test-share", self.run_batch, max_batch_size=8, window=0.01)
+        results = await asyncio.gather(*(batcher.submit("k", i) for i in range(3)))
+
+        self.assertEqual(results, ["k:0", "k:1", "k:2"])
+        self.assertEqual(self.batches, [("k", [0, 1, 2])])
+
+    async def test_different_keys_are_not_mixed(self):
+        batcher = MicroBatcher("test-keys", self.run_batch, max_batch_size=8, window=0.01)
+        results = await asyncio.gather(batcher.submit("a", 1), batcher.submit("b", 2), batcher.submit("a", 3))
+
+        self.assertEqual(results, ["a:1", "b:2", "a:3"])
+        self.assertEqual(sorted(self.batches), [("a", [1, 3]), ("b", [2])])
+
+    async def test_full_batch_flushes_without_waiting_for_the_window(self):
+        batcher = MicroBatcher("test-full", self.run_batch, max_batch_size=2, window=3600)
+        results = await asyncio.wait_for(asyncio.gather(batcher.submit("k", 1), batcher.submit("k", 2)), 1)
+
+        self.assertEqual(results, ["k:1", "k:2"])
+        self.assertEqual(batcher.stats()["largest_batch"], 2)
+
+    async def test_runner_error_reaches_every_caller(self):
+        async def failing(key, items):
+            raise RuntimeError("backend down")
+
+        batcher = MicroBatcher("test-error", failing, max_batch_size=8, window=0.01)
+        results = await asyncio.gather(batcher.submit("k", 1), batcher.submit("k", 2), return_exceptions=True)
+
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+
+    async def test_wrong_result_count_is_an_error(self):
+        async def short(key, items):
+            return items[:1]
+
+        batcher = MicroBatcher("test-short", short, max_batch_size=8, window=0.01)
+        results = await asyncio.gather(batcher.submit("k", 1), batcher.submit("k", 2), return_exceptions=True)
+
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+
+    async def test_cancelled_caller_is_dropped_from_the_batch(self):
+        batcher = MicroBatcher("test-cancel", self.run_batch, max_batch_size=8, window=0.01)
+        gone = asyncio.create_task(batcher.submit("k", 1))
+        stays = asyncio.create_task(batcher.submit("k", 2))
+        await asyncio.sleep(0)
+        gone.cancel()
+
+        self.assertEqual(await stays, "k:2")
+        self.assertEqual(self.batches, [("k", [2])])
+
+    def test_batch_size_of_one_disables_batching(self):
+        self.assertFalse(MicroBatcher("test-disabled", self.run_batch, max_batch_size=1).enabled)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the buffered response writer: coalescing of small writes,
+chunked framing, and what happens to pending data on end and cancel.
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from webserver import response_writer
+from webserver.response_writer import ResponseWriter
+
+HEAD = b"HTTP/1.1 200 OK\r\n\r\n"
+
+
+class FakeTransport:
+
+    def __init__(self):
+        self.buffered = 0
+
+    def get_write_buffer_size(self):
+        return self.buffered
+
+
+class FakeStreamWriter:
+    """Records writes instead of sending them."""
+
+    def __init__(self):
+        self.writes = []
+        self.drains = 0
+        self.closing = False
+        self.transport = FakeTransport()
+
+    def write(self, data):
+        self.writes.append(data)
+
+    def is_closing(self):
+        return self.closing
+
+    async def drain(self):
+        self.drains += 1
+
+
+class TestResponseWriter(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.stream = FakeStreamWriter()
+
+    async def test_small_writes_are_coalesced_into_one_chunk(self):
+        writer = ResponseWriter(self.stream, chunked=True, head=HEAD)
+        with mock.patch.object(response_writer, "FLUSH_WINDOW", 0.01):
+            await writer.send(b"data: 1\n\n")
+            await writer.send(b"data: 2\n\n")
+            self.assertEqual(self.stream.writes, [])
+            await asyncio.sleep(0.05)
+
+        self.assertEqual(self.stream.writes, [HEAD + b"12\r\ndata: 1\n\ndata: 2\n\n\r\n"])
+
+    async def test_end_flushes_pending_data_and_terminates(self):
+        writer = ResponseWriter(self.stream, chunked=True, head=HEAD)
+        await writer.send(b"abc")
+        await writer.send(b"def", end_response=True)
+
+        self.assertEqual(self.stream.writes, [HEAD + b"6\r\nabcdef\r\n0\r\n\r\n"])
+        self.assertTrue(writer.ended)
+        # Writes after the end are ignored
+        await writer.send(b"late")
+        self.assertEqual(len(self.stream.writes), 1)
+
+    async def test_size_threshold_flushes_immediately(self):
+        writer = ResponseWriter(self.stream, chunked=True)
+        with mock.patch.object(response_writer, "FLUSH_BYTES", 4):
+            await writer.send(b"abcd")
+
+        self.assertEqual(self.stream.writes, [b"4\r\nabcd\r\n"])
+
+    async def test_unchunked_body_is_written_as_is(self):
+        writer = ResponseWriter(self.stream, chunked=False, head=HEAD)
+        await writer.send(b"abc")
+        await writer.finish()
+
+        self.assertEqual(self.stream.writes, [HEAD + b"abc"])
+        self.assertEqual(self.stream.drains, 1)
+
+    async def test_flush_sends_headers_without_body(self):
+        writer = ResponseWriter(self.stream, chunked=True, head=HEAD)
+        writer.flush()
+
+        self.assertEqual(self.stream.writes, [HEAD])
+
+    async def test_cancel_drops_pending_data(self):
+        writer = ResponseWriter(self.stream, chunked=True, head=HEAD)
+        with mock.patch.object(response_writer, "FLUSH_WINDOW", 0.01):
+            await writer.send(b"abc")
+            writer.cancel()
+            await asyncio.sleep(0.05)
+
+        self.assertEqual(self.stream.writes, [])
+        self.assertTrue(writer.ended)
+
+    async def test_closed_connection_raises(self):
+        writer = ResponseWriter(self.stream, chunked=True)
+        self.stream.closing = True
+        with self.assertRaises(ConnectionResetError):
+            await writer.send(b"abc")
+
+    async def test_drains_only_above_high_water(self):
+        writer = ResponseWriter(self.stream, chunked=True)
+        with mock.patch.object(response_writer, "HIGH_WATER", 100):
+            await writer.send(b"a")
+            self.assertEqual(self.stream.drains, 0)
+            self.stream.transport.buffered = 101
+            await writer.send(b"b")
+        self.assertEqual(self.stream.drains, 1)
+        writer.cancel()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the aggregated search result cache: keying, TTL and LRU
+eviction, and per-site invalidation racing in-flight searches.
+"""
+
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from retrieval.result_cache import ResultCache
+
+ROWS = [["https://a.example/1", "{}", "One", "a"]]
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = ResultCache(ttl=60, max_entries=10)
+
+    def key(self, query="pasta", site="a", **kwargs):
+        return self.cache.make_key(query, site, 10, ["ep1"], **kwargs)
+
+    def test_keys_normalize_query_and_sites(self):
+        self.assertEqual(self.key("  pasta   recipes "), self.key("pasta recipes"))
+        self.assertEqual(self.key(site=["b", "a", "a"]), self.key(site=["a", "b"]))
+        self.assertNotEqual(self.key(), self.key(site="b"))
+        self.assertNotEqual(self.key(), self.key(query_params={"x": 1}))
+
+    def test_unkeyable_arguments_return_none(self):
+        self.assertIsNone(self.key(handler=object()))
+
+    def test_hit_returns_copy(self):
+        self.cache.put(self.key(), ROWS, self.cache.generation)
+        rows = self.cache.get(self.key())
+        rows[0][2] = "changed"
+
+        self.assertEqual(self.cache.get(self.key()), ROWS)
+        self.assertEqual(self.cache.stats()["hits"], 2)
+
+    def test_entries_expire(self):
+        with mock.patch("retrieval.result_cache.time.monotonic", return_value=1000.0):
+            self.cache.put(self.key(), ROWS, self.cache.generation)
+        with mock.patch("retrieval.result_cache.time.monotonic", return_value=1061.0):
+            self.assertIsNone(self.cache.get(self.key()))
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    def test_least_recently_used_is_evicted(self):
+        cache = ResultCache(ttl=60, max_entries=2)
+        keys = [cache.make_key(q, "a", 10, ["ep1"]) for q in ("one", "two", "three")]
+        cache.put(keys[0], ROWS, cache.generation)
+        cache.put(keys[1], ROWS, cache.generation)
+        cache.get(keys[0])
+        cache.put(keys[2], ROWS, cache.generation)
+
+        self.assertIsNotNone(cache.get(keys[0]))
+        self.assertIsNone(cache.get(keys[1]))
+
+    def test_invalidation_drops_site_and_all_sites_entries(self):
+        self.cache.put(self.key(site="a"), ROWS, self.cache.generation)
+        self.cache.put(self.key(site="b"), ROWS, self.cache.generation)
+        self.cache.put(self.key(site="all"), ROWS, self.cache.generation)
+        self.cache.invalidate_sites(["a"])
+
+        self.assertIsNone(self.cache.get(self.key(site="a")))
+        self.assertIsNone(self.cache.get(self.key(site="all")))
+        self.assertIsNotNone(self.cache.get(self.key(site="b")))
+
+    def test_results_from_before_an_invalidation_are_not_stored(self):
+        generation = self.cache.generation
+        # A write lands while the search is running
+        self.cache.invalidate_sites(["a"])
+        self.cache.put(self.key(), ROWS, generation)
+
+        self.assertIsNone(self.cache.get(self.key()))
+
+    def test_zero_ttl_disables(self):
+        self.assertFalse(ResultCache(ttl=0).enabled)
+        self.assertTrue(self.cache.enabled)
+
+
+if __name__ == "__main__":
+    unittest.main()
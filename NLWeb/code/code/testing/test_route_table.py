@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the web server route table: path matching precedence, method
+handling, and the timing, response cache and concurrency limit middleware.
+"""
+
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from webserver.route_table import (RouteTable, Request, MATCH_PREFIX, MATCH_SUFFIX,
+                                   timing_middleware, response_cache, concurrency_limit)
+
+
+class Recorder:
+    """Collects what a handler sends, standing in for the server's send_response/send_chunk."""
+
+    def __init__(self):
+        self.status = None
+        self.headers = None
+        self.chunks = []
+        self.ended = False
+
+    async def send_response(self, status, headers, end_response=False):
+        self.status, self.headers = status, dict(headers)
+        self.ended = end_response
+
+    async def send_chunk(self, chunk, end_response=False):
+        self.chunks.append(chunk)
+        self.ended = self.ended or end_response
+
+    @property
+    def body(self):
+        return b"".join(c.encode("utf-8") if isinstance(c, str) else c for c in self.chunks)
+
+
+def make_request(method, path, query_params=None, body=None):
+    recorder = Recorder()
+    request = Request(method, path, {}, query_params or {}, body,
+                      recorder.send_response, recorder.send_chunk)
+    return request, recorder
+
+
+def handler_named(name, calls=None):
+    async def handler(request):
+        if calls is not None:
+            calls.append(name)
+        await request.send_response(200, {'Content-Type': 'text/plain', 'X-Route': name})
+        await request.send_chunk(name.encode("utf-8"), end_response=True)
+    return handler
+
+
+def server_like_table():
+    """A table registered the way WebServer registers its routes."""
+    table = RouteTable(middleware=[timing_middleware])
+    table.add("/", handler_named("home"), methods=("GET", "HEAD"))
+    table.add("/html/", handler_named("static"), methods=("GET", "HEAD"), match=MATCH_PREFIX)
+    table.add("/static/", handler_named("static"), methods=("GET", "HEAD"), match=MATCH_PREFIX)
+    table.add(".png", handler_named("static"), methods=("GET", "HEAD"), match=MATCH_SUFFIX, name="*.png")
+    table.add("/stats", handler_named("stats"))
+    table.add("/who", handler_named("who"), methods=("GET", "POST"))
+    table.add("/sites", handler_named("sites"))
+    table.add("/mcp/health", handler_named("mcp_health"))
+    table.add("/mcp", handler_named("mcp"), methods=("GET", "POST"), match=MATCH_PREFIX)
+    table.add("/ask", handler_named("ask"), methods=("GET", "POST"))
+    return table
+
+
+class TestRouteResolution(unittest.TestCase):
+
+    def setUp(self):
+        self.table = server_like_table()
+
+    def resolved_name(self, path):
+        route = self.table.resolve(path)
+        return None if route is None else route.name
+
+    def test_static_paths_are_not_captured_by_api_routes(self):
+        self.assertEqual(self.resolved_name("/static/ask.js"), "/static/")
+        self.assertEqual(self.resolved_name("/static/who.css"), "/static/")
+        self.assertEqual(self.resolved_name("/html/mcp.html"), "/html/")
+
+    def test_exact_routes(self):
+        self.assertEqual(self.resolved_name("/ask"), "/ask")
+        self.assertEqual(self.resolved_name("/who"), "/who")
+        self.assertEqual(self.resolved_name("/"), "/")
+
+    def test_prefixes_match_whole_segments(self):
+        self.assertEqual(self.resolved_name("/mcp"), "/mcp")
+        self.assertEqual(self.resolved_name("/mcp/tools/list"), "/mcp")
+        self.assertIsNone(self.resolved_name("/mcpx"))
+
+    def test_exact_match_wins_over_prefix(self):
+        self.assertEqual(self.resolved_name("/mcp/health"), "/mcp/health")
+
+    def test_suffix_routes(self):
+        self.assertEqual(self.resolved_name("/images/logo.png"), "*.png")
+        # A prefix route is tried before suffix routes
+        self.assertEqual(self.resolved_name("/static/logo.png"), "/static/")
+
+    def test_substrings_no_longer_match(self):
+        self.assertIsNone(self.resolved_name("/askme"))
+        self.assertIsNone(self.resolved_name("/api/who/else"))
+        self.assertIsNone(self.resolved_name("/sitesmap"))
+
+    def test_longest_prefix_wins(self):
+        table = RouteTable()
+        table.add("/a/", handler_named("short"), match=MATCH_PREFIX)
+        table.add("/a/b/", handler_named("long"), match=MATCH_PREFIX)
+        self.assertEqual(table.resolve("/a/b/c").name, "/a/b/")
+        self.assertEqual(table.resolve("/a/c").name, "/a/")
+
+    def test_duplicate_exact_route_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.table.add("/ask", handler_named("again"))
+
+
+class TestDispatch(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.table = server_like_table()
+
+    async def test_dispatches_to_handler(self):
+        request, recorder = make_request("GET", "/static/ask.js")
+        self.assertTrue(await self.table.dispatch(request))
+        self.assertEqual(recorder.headers["X-Route"], "static")
+
+    async def test_unknown_path_is_not_handled(self):
+        request, recorder = make_request("GET", "/mcpx")
+        self.assertFalse(await self.table.dispatch(request))
+        self.assertIsNone(recorder.status)
+
+    async def test_wrong_method_gets_405_with_allow(self):
+        request, recorder = make_request("DELETE", "/ask")
+        self.assertTrue(await self.table.dispatch(request))
+        self.assertEqual(recorder.status, 405)
+        self.assertEqual(recorder.headers["Allow"], "GET, OPTIONS, POST")
+        self.assertTrue(recorder.ended)
+
+    async def test_options_gets_204_with_allow(self):
+        request, recorder = make_request("OPTIONS", "/stats")
+        self.assertTrue(await self.table.dispatch(request))
+        self.assertEqual(recorder.status, 204)
+        self.assertEqual(recorder.headers["Allow"], "GET, OPTIONS")
+        self.assertEqual(recorder.chunks, [])
+        self.assertTrue(recorder.ended)
+
+    async def test_methods_are_case_insensitive(self):
+        request, recorder = make_request("post", "/who")
+        await self.table.dispatch(request)
+        self.assertEqual(recorder.status, 200)
+
+    async def test_timing_records_requests_and_errors(self):
+        table = RouteTable(middleware=[timing_middleware])
+
+        async def failing(request):
+            raise RuntimeError("boom")
+
+        table.add("/ok", handler_named("ok"))
+        table.add("/fail", failing)
+        for _ in range(2):
+            await table.dispatch(make_request("GET", "/ok")[0])
+        with self.assertRaises(RuntimeError):
+            await table.dispatch(make_request("GET", "/fail")[0])
+
+        stats = table.stats()
+        self.assertEqual(stats["/ok"]["requests"], 2)
+        self.assertEqual(stats["/ok"]["errors"], 0)
+        self.assertEqual(stats["/fail"]["errors"], 1)
+
+    async def test_middleware_runs_in_order(self):
+        order = []
+
+        def tagging(tag):
+            async def middleware(request, call_next):
+                order.append(f"{tag}:before")
+                await call_next(request)
+                order.append(f"{tag}:after")
+            return middleware
+
+        table = RouteTable(middleware=[tagging("global")])
+        table.add("/x", handler_named("x", order), middleware=[tagging("route")])
+        await table.dispatch(make_request("GET", "/x")[0])
+
+        self.assertEqual(order, ["global:before", "route:before", "x", "route:after", "global:after"])
+
+
+class TestResponseCache(unittest.IsolatedAsyncioTestCase):
+
+    def table_with_cache(self, ttl, calls, status=200):
+        async def handler(request):
+            calls.append(request.path)
+            await request.send_response(status, {'Content-Type': 'application/json', 'X-Count': str(len(calls))})
+            await request.send_chunk('{"part": 1,', end_response=False)
+            await request.send_chunk(b' "part2": 2}', end_response=True)
+
+        table = RouteTable()
+        table.add("/cached", handler, middleware=[response_cache(ttl)])
+        return table
+
+    async def test_hit_replays_status_headers_and_body(self):
+        calls = []
+        table = self.table_with_cache(60, calls)
+        first_request, first = make_request("GET", "/cached", {"q": ["a"]})
+        await table.dispatch(first_request)
+        second_request, second = make_request("GET", "/cached", {"q": ["a"]})
+        await table.dispatch(second_request)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(second.status, first.status)
+        self.assertEqual(second.headers, first.headers)
+        self.assertEqual(second.body, first.body)
+        self.assertTrue(second.ended)
+
+    async def test_query_parameters_are_part_of_the_key(self):
+        calls = []
+        table = self.table_with_cache(60, calls)
+        await table.dispatch(make_request("GET", "/cached", {"q": ["a"]})[0])
+        await table.dispatch(make_request("GET", "/cached", {"q": ["b"]})[0])
+        self.assertEqual(len(calls), 2)
+
+    async def test_entries_expire(self):
+        calls = []
+        table = self.table_with_cache(10, calls)
+        with mock.patch("webserver.route_table.time.monotonic", return_value=1000.0):
+            await table.dispatch(make_request("GET", "/cached")[0])
+        with mock.patch("webserver.route_table.time.monotonic", return_value=1011.0):
+            await table.dispatch(make_request("GET", "/cached")[0])
+        self.assertEqual(len(calls), 2)
+
+    async def test_errors_are_not_cached(self):
+        calls = []
+        table = self.table_with_cache(60, calls, status=500)
+        await table.dispatch(make_request("GET", "/cached")[0])
+        await table.dispatch(make_request("GET", "/cached")[0])
+        self.assertEqual(len(calls), 2)
+
+    async def test_requests_with_a_body_bypass_the_cache(self):
+        calls = []
+        table = self.table_with_cache(60, calls)
+        await table.dispatch(make_request("GET", "/cached", body=b"x")[0])
+        await table.dispatch(make_request("GET", "/cached", body=b"x")[0])
+        self.assertEqual(len(calls), 2)
+
+    async def test_zero_ttl_disables_caching(self):
+        calls = []
+        table = self.table_with_cache(0, calls)
+        await table.dispatch(make_request("GET", "/cached")[0])
+        await table.dispatch(make_request("GET", "/cached")[0])
+        self.assertEqual(len(calls), 2)
+
+
+class TestConcurrencyLimit(unittest.IsolatedAsyncioTestCase):
+
+    async def test_limits_concurrent_handlers(self):
+        running = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            await request.send_response(200, {})
+
+        table = RouteTable()
+        table.add("/limited", handler, middleware=[concurrency_limit(2)])
+        await asyncio.gather(*(table.dispatch(make_request("GET", "/limited")[0]) for _ in range(6)))
+
+        self.assertEqual(peak, 2)
+
+    async def test_zero_means_unlimited(self):
+        running = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        table = RouteTable()
+        table.add("/unlimited", handler, middleware=[concurrency_limit(0)])
+        await asyncio.gather(*(table.dispatch(make_request("GET", "/unlimited")[0]) for _ in range(6)))
+
+        self.assertEqual(peak, 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Unit tests for response framing on persistent connections: responses that
+must not carry a body (HEAD, 204, 304) leave the connection usable for the
+next pipelined request.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from webserver import static_file_handler
+from webserver.WebServer import handle_client, fulfill_request as route_request
+
+BODY = b"0123456789"
+
+
+async def fulfill_request(method, path, headers, query_params, body, send_response, send_chunk):
+    """Test handler that sends a body no matter the method or status."""
+    if path == "/static":
+        await send_response(200, {'Content-Type': 'text/plain', 'Content-Length': str(len(BODY))})
+        await send_chunk(BODY, end_response=True)
+    elif path == "/single":
+        await send_response(200, {'Content-Type': 'text/plain'})
+        await send_chunk(BODY, end_response=True)
+    elif path == "/stream":
+        await send_response(200, {'Content-Type': 'text/plain'})
+        await send_chunk(BODY[:5])
+        await send_chunk(BODY[5:])
+    elif path == "/events":
+        await send_response(200, {'Content-Type': 'text/event-stream'})
+        await send_chunk("data: 1\n\n")
+    elif path == "/no-content":
+        await send_response(204, {'Content-Type': 'text/plain'})
+        await send_chunk(BODY, end_response=True)
+    elif path == "/not-modified":
+        await send_response(304, {'Content-Type': 'text/plain', 'Content-Length': str(len(BODY))})
+        await send_chunk(BODY, end_response=True)
+
+
+async def read_response(reader):
+    """Read one response, using its framing headers to find where the body ends."""
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    # Leftover body bytes from the previous response would show up here
+    if not lines[0].startswith("HTTP/1.1 "):
+        raise AssertionError(f"Response does not start with a status line: {lines[0]!r}")
+    status = int(lines[0].split()[1])
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    return status, headers
+
+
+async def read_body(reader, headers):
+    if headers.get('transfer-encoding') == 'chunked':
+        body = b""
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            data = await reader.readexactly(size + 2)
+            if size == 0:
+                return body
+            body += data[:-2]
+    return await reader.readexactly(int(headers.get('content-length', 0)))
+
+
+class TestBodylessResponses(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = await asyncio.start_server(
+            lambda r, w: handle_client(r, w, fulfill_request), '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def exchange(self, first_request: bytes):
+        """Send a request and a pipelined GET, returning both parsed responses."""
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        try:
+            writer.write(first_request + b"GET /single HTTP/1.1\r\nHost: test\r\n\r\n")
+            await writer.drain()
+            first = await asyncio.wait_for(read_response(reader), 5)
+            second = await asyncio.wait_for(read_response(reader), 5)
+            second_body = await asyncio.wait_for(read_body(reader, second[1]), 5)
+            return first, second, second_body
+        finally:
+            writer.close()
+
+    async def assert_pipelined_get_intact(self, first_request: bytes, expected_status: int):
+        (status, headers), (next_status, next_headers), next_body = await self.exchange(first_request)
+        self.assertEqual(status, expected_status)
+        self.assertEqual(headers.get('connection'), 'keep-alive')
+        self.assertEqual(next_status, 200)
+        self.assertEqual(next_body, BODY)
+        return headers
+
+    async def test_head_with_content_length_then_get(self):
+        headers = await self.assert_pipelined_get_intact(b"HEAD /static HTTP/1.1\r\nHost: test\r\n\r\n", 200)
+        # HEAD keeps the headers a GET would get
+        self.assertEqual(headers.get('content-length'), str(len(BODY)))
+
+    async def test_head_single_chunk_then_get(self):
+        headers = await self.assert_pipelined_get_intact(b"HEAD /single HTTP/1.1\r\nHost: test\r\n\r\n", 200)
+        self.assertEqual(headers.get('content-length'), str(len(BODY)))
+
+    async def test_head_streamed_then_get(self):
+        headers = await self.assert_pipelined_get_intact(b"HEAD /stream HTTP/1.1\r\nHost: test\r\n\r\n", 200)
+        self.assertEqual(headers.get('transfer-encoding'), 'chunked')
+
+    async def test_head_event_stream_then_get(self):
+        await self.assert_pipelined_get_intact(b"HEAD /events HTTP/1.1\r\nHost: test\r\n\r\n", 200)
+
+    async def test_no_content_then_get(self):
+        headers = await self.assert_pipelined_get_intact(b"GET /no-content HTTP/1.1\r\nHost: test\r\n\r\n", 204)
+        self.assertNotIn('content-length', headers)
+        self.assertNotIn('transfer-encoding', headers)
+
+    async def test_not_modified_then_get(self):
+        headers = await self.assert_pipelined_get_intact(b"GET /not-modified HTTP/1.1\r\nHost: test\r\n\r\n", 304)
+        self.assertNotIn('transfer-encoding', headers)
+
+    async def test_get_still_has_body(self):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        try:
+            writer.write(b"GET /stream HTTP/1.1\r\nHost: test\r\n\r\n")
+            await writer.drain()
+            status, headers = await asyncio.wait_for(read_response(reader), 5)
+            body = await asyncio.wait_for(read_body(reader, headers), 5)
+        finally:
+            writer.close()
+        self.assertEqual(status, 200)
+        self.assertEqual(headers.get('transfer-encoding'), 'chunked')
+        self.assertEqual(body, BODY)
+
+
+class TestRoutedHeadRequests(unittest.IsolatedAsyncioTestCase):
+    """HEAD on the server's own GET/HEAD routes keeps the headers and drops the body."""
+
+    async def asyncSetUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self._tmp.name, "static"))
+        with open(os.path.join(self._tmp.name, "static", "ask.js"), "wb") as f:
+            f.write(BODY)
+        self._root = mock.patch.object(static_file_handler, "APP_ROOT", self._tmp.name)
+        self._root.start()
+        self.server = await asyncio.start_server(
+            lambda r, w: handle_client(r, w, route_request), '127.0.0.1', 0)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self):
+        self.server.close()
+        await self.server.wait_closed()
+        self._root.stop()
+        self._tmp.cleanup()
+
+    async def test_head_static_file_then_get(self):
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        try:
+            writer.write(b"HEAD /static/ask.js HTTP/1.1\r\nHost: test\r\n\r\n"
+                         b"GET /static/ask.js HTTP/1.1\r\nHost: test\r\n\r\n")
+            await writer.drain()
+            status, headers = await asyncio.wait_for(read_response(reader), 5)
+            next_status, next_headers = await asyncio.wait_for(read_response(reader), 5)
+            next_body = await asyncio.wait_for(read_body(reader, next_headers), 5)
+        finally:
+            writer.close()
+        self.assertEqual(status, 200)
+        self.assertEqual(headers.get('content-type'), 'application/javascript')
+        self.assertEqual(headers.get('content-length'), str(len(BODY)))
+        self.assertEqual(next_status, 200)
+        self.assertEqual(next_body, BODY)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -28,7 +28,7 @@ from tools.db_load_utils import (
 )
 
 # Import vector database client directly
-from retrieval.retriever import get_vector_db_client, upload_documents, delete_documents_by_site
+from retrieval.retriever import get_vector_db_client, upload_documents, delete_documents_by_site, bulk_load
 
 # Import RSS to Schema converter
 import tools.rss2schema as rss2schema
@@ -1129,6 +1129,9 @@ async def main():
     if args.file_path is None and not args.only_delete:
         parser.error("file_path is required unless --only-delete is specified")
     
+    # Defer index refreshes on the write endpoint until the whole load is done
+    query_params = {"db": args.database} if args.database else None
+    
     # Handle URL list mode
     if args.url_list:
         is_url_path = await is_url(args.file_path)
@@ -1137,7 +1140,8 @@ async def main():
         else:
             print(f"Processing local URL list file: {args.file_path}")
             
-        await loadUrlListToDB(args.file_path, args.site, args.batch_size, args.delete_site, args.force_recompute, args.database)
+        async with bulk_load(query_params=query_params):
+            await loadUrlListToDB(args.file_path, args.site, args.batch_size, args.delete_site, args.force_recompute, args.database)
         return
     
     # Normal processing mode
@@ -1163,12 +1167,13 @@ async def main():
             print(f"Detected file type: {file_type}, contains embeddings: {'Yes' if has_embeddings else 'No'}")
             
             # Process based on whether the file has embeddings
-            if has_embeddings and not args.force_recompute:
-                print("File already contains embeddings, loading directly...")
-                await loadJsonWithEmbeddingsToDB(file_path, args.site, args.batch_size, args.delete_site, args.database)
-            else:
-                print("Computing embeddings for file...")
-                await loadJsonToDB(file_path, args.site, args.batch_size, args.delete_site, args.force_recompute, args.database)
+            async with bulk_load(query_params=query_params):
+                if has_embeddings and not args.force_recompute:
+                    print("File already contains embeddings, loading directly...")
+                    await loadJsonWithEmbeddingsToDB(file_path, args.site, args.batch_size, args.delete_site, args.database)
+                else:
+                    print("Computing embeddings for file...")
+                    await loadJsonToDB(file_path, args.site, args.batch_size, args.delete_site, args.force_recompute, args.database)
         else:
             print(f"Error: File not found at '{file_path}'")
             sys.exit(1)
@@ -0,0 +1,74 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""
+Bring existing Qdrant collections up to the configured schema.
+
+Creates the keyword payload indexes on site and url that new collections get
+automatically, and applies the endpoint's hnsw_config, quantization and
+on-disk settings to the collection.
+"""
+
+import asyncio
+
+from config.config import CONFIG
+from retrieval.qdrant import QdrantVectorClient
+
+
+async def migrate_endpoint(endpoint_name: str, collection_name: str = None):
+    """Migrate one collection of a Qdrant endpoint and print what changed."""
+    client = QdrantVectorClient(endpoint_name)
+    summary = await client.migrate_collection(collection_name)
+
+    print(f"Endpoint '{endpoint_name}', collection '{summary['collection']}':")
+    if summary["indexes_created"]:
+        print(f"  Created payload indexes: {', '.join(summary['indexes_created'])}")
+    else:
+        print("  Payload indexes already present")
+    if summary["updated"]:
+        print(f"  Applied settings: {', '.join(summary['updated'])}")
+    else:
+        print("  No HNSW, quantization or on-disk settings configured")
+    return summary
+
+
+async def main():
+    """
+    Main function for command-line use.
+
+    Example usage:
+        python -m tools.qdrant_migrate
+        python -m tools.qdrant_migrate --database qdrant_local
+        python -m tools.qdrant_migrate --database qdrant_url --collection nlweb_collection
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Create payload indexes and apply index settings to Qdrant collections")
+    parser.add_argument("--database", type=str, default=None,
+                        help="Qdrant endpoint to migrate (default: every enabled Qdrant endpoint)")
+    parser.add_argument("--collection", type=str, default=None,
+                        help="Collection to migrate (default: the endpoint's index_name)")
+
+    args = parser.parse_args()
+
+    if args.database:
+        endpoint_names = [args.database]
+    else:
+        endpoint_names = [
+            name for name, config in CONFIG.retrieval_endpoints.items()
+            if config.db_type == "qdrant" and getattr(config, 'enabled', False)
+        ]
+
+    if not endpoint_names:
+        print("No Qdrant endpoints to migrate")
+        return
+
+    for endpoint_name in endpoint_names:
+        try:
+            await migrate_endpoint(endpoint_name, args.collection)
+        except Exception as e:
+            print(f"Failed to migrate endpoint '{endpoint_name}': {e}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
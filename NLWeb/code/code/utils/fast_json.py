@@ -0,0 +1,112 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""
+JSON encoding and decoding for the request path, backed by orjson or ujson
+when one of them is installed and by the standard library otherwise.
+
+Output is compact JSON text and non-ASCII characters are written as UTF-8
+rather than escaped. Anything the native backend rejects (e.g. integers beyond
+64 bits, NaN literals when decoding) is retried with the standard library, so
+callers see the stdlib behavior for edge cases, including json.JSONDecodeError
+for invalid input.
+
+Configuration (environment variables):
+    NLWEB_JSON_BACKEND: auto (default; orjson, then ujson, then json), orjson, ujson or json
+
+WARNING: This code is under development and may undergo changes in future releases.
+Backwards compatibility is not guaranteed at this time.
+"""
+
+import json
+import os
+from typing import Any, Union
+
+_orjson = None
+_ujson = None
+
+
+def _select_backend(requested: str) -> str:
+    global _orjson, _ujson
+    requested = (requested or "auto").strip().lower()
+    candidates = ["orjson", "ujson"] if requested == "auto" else [requested]
+    for name in candidates:
+        if name == "orjson":
+            try:
+                import orjson
+                _orjson = orjson
+                return "orjson"
+            except ImportError:
+                continue
+        if name == "ujson":
+            try:
+                import ujson
+                _ujson = ujson
+                return "ujson"
+            except ImportError:
+                continue
+    return "json"
+
+
+# Name of the backend in use: "orjson", "ujson" or "json"
+BACKEND = _select_backend(os.getenv("NLWEB_JSON_BACKEND", "auto"))
+
+
+def _stdlib_dumps(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def dumps(obj: Any) -> str:
+    """
+    Serialize obj to a JSON string.
+
+    Raises:
+        TypeError: if obj is not JSON serializable
+    """
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            return _stdlib_dumps(obj)
+    if _ujson is not None:
+        try:
+            return _ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False)
+        except (TypeError, OverflowError):
+            return _stdlib_dumps(obj)
+    return _stdlib_dumps(obj)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """
+    Serialize obj to UTF-8 encoded JSON, skipping the str round-trip with orjson.
+
+    Raises:
+        TypeError: if obj is not JSON serializable
+    """
+    if _orjson is not None:
+        try:
+            return _orjson.dumps(obj, option=_orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return dumps(obj).encode("utf-8")
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    """
+    Deserialize a JSON document.
+
+    Raises:
+        json.JSONDecodeError: if data is not valid JSON
+    """
+    if _orjson is not None:
+        try:
+            return _orjson.loads(data)
+        except ValueError:
+            pass
+    elif _ujson is not None:
+        try:
+            return _ujson.loads(data)
+        except ValueError:
+            pass
+    # Either no native backend, or it rejected the input: let the stdlib decide
+    return json.loads(data)
@@ -1,5 +1,6 @@
 import json
-from typing import Any, Dict, List, Union
+from utils import fast_json
+from typing import Any, Dict, List, Optional, Union
 
 
 # ============= JSON Trimming Functions (from trim.py) =============
@@ -13,7 +14,7 @@ def listify(item):
 def jsonify(obj):
     if isinstance(obj, str):
         try:
-            obj = json.loads(obj)
+            obj = fast_json.loads(obj)
         except json.JSONDecodeError:
             return obj
     return obj
@@ -146,59 +147,57 @@ def _merge_dicts(dict1: Dict[str, Any], dict2: Dict[str, Any]) -> Dict[str, Any]
         - If both values are dicts, recursively merge
         - If both values are lists, concatenate them
         - Otherwise, create array with both values
-    """
-    merged = {}
     
-    # Get all unique keys from both dicts
-    all_keys = set(dict1.keys()) | set(dict2.keys())
+    Neither input is modified; nested values are shared with the inputs
+    unless they had to be merged.
+    """
+    # Start from a shallow copy of dict1 and only visit dict2's keys
+    merged = dict(dict1)
     
-    for key in all_keys:
-        val1 = dict1.get(key)
-        val2 = dict2.get(key)
+    for key, val2 in dict2.items():
+        # Key only exists in dict2
+        if key not in merged:
+            merged[key] = val2
+            continue
         
-        # Case 1: Key only exists in dict1
-        if key in dict1 and key not in dict2:
-            merged[key] = val1
-            
-        # Case 2: Key only exists in dict2
-        elif key not in dict1 and key in dict2:
+        val1 = merged[key]
+        # Both are dicts - recursively merge
+        if isinstance(val1, dict) and isinstance(val2, dict):
+            merged[key] = _merge_dicts(val1, val2)
+        # Both are lists - concatenate
+        elif isinstance(val1, list) and isinstance(val2, list):
+            merged[key] = val1 + val2
+        # Handle None values and identical values by keeping the existing one
+        elif val2 is None or val1 == val2:
+            continue
+        elif val1 is None:
             merged[key] = val2
-            
-        # Case 3: Key exists in both
         else:
-            # Both are dicts - recursively merge
-            if isinstance(val1, dict) and isinstance(val2, dict):
-                merged[key] = _merge_dicts(val1, val2)
-                
-            # Both are lists - concatenate
-            elif isinstance(val1, list) and isinstance(val2, list):
-                merged[key] = val1 + val2
-                
-            # Different types or scalar values - create array
-            else:
-                # Handle None values
-                if val1 is None and val2 is None:
-                    merged[key] = None
-                elif val1 is None:
-                    merged[key] = val2
-                elif val2 is None:
-                    merged[key] = val1
-                # If values are identical, keep single value
-                elif val1 == val2:
-                    merged[key] = val1
-                else:
-                    # Create array with both values
-                    merged[key] = [val1, val2]
+            # Create array with both values
+            merged[key] = [val1, val2]
     
     return merged
 
 
-def merge_json_array(json_array: List[Union[str, Dict]]) -> Dict[str, Any]:
+def _first_dict(obj: Any) -> Dict[str, Any]:
+    """Extract the first dict if obj is an array, and fall back to an empty dict."""
+    if isinstance(obj, list):
+        obj = obj[0] if obj else {}
+    if not isinstance(obj, dict):
+        return {}
+    return obj
+
+
+def merge_json_array(json_array: List[Union[str, Dict]],
+                     parse_cache: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Merge an array of JSON objects into a single object.
     
     Args:
         json_array: List of JSON objects (strings or dicts)
+        parse_cache: Optional dict memoizing parsed JSON strings, shared across
+            calls for one request so each payload is only parsed once. Parsed
+            values are shared, so callers must not modify the merged result.
         
     Returns:
         Single merged dictionary
@@ -206,16 +205,19 @@ def merge_json_array(json_array: List[Union[str, Dict]]) -> Dict[str, Any]:
     if not json_array:
         return {}
     
-    # Start with the first object
-    result = jsonify(json_array[0])
-    if isinstance(result, list):
-        result = result[0] if result else {}
-    if not isinstance(result, dict):
-        result = {}
+    def parse(obj):
+        if parse_cache is None or not isinstance(obj, str):
+            return jsonify(obj)
+        parsed = parse_cache.get(obj)
+        if parsed is None:
+            parsed = jsonify(obj)
+            parse_cache[obj] = parsed
+        return parsed
     
-    # Merge each subsequent object
+    # Start with the first object and merge each subsequent object into it
+    result = _first_dict(parse(json_array[0]))
     for obj in json_array[1:]:
-        result = merge_json_objects(result, obj)
+        result = _merge_dicts(result, _first_dict(parse(obj)))
     
     return result
 
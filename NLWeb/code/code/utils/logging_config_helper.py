@@ -321,6 +321,27 @@ def _get_async_processor():
     return _async_log_processor
 
 
+def _reset_async_processor_after_fork():
+    """The log thread does not survive fork(); give a forked child its own queue and thread"""
+    processor = _async_log_processor
+    if processor is None:
+        return
+    processor.log_queue = queue.Queue(maxsize=processor.log_queue.maxsize)
+    processor.shutdown_event = threading.Event()
+    processor.worker_thread = None
+    processor.start()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_async_processor_after_fork)
+
+
+def shutdown_logging(timeout: float = 5.0):
+    """Write out queued log messages, for processes that exit without running atexit handlers"""
+    if _async_log_processor is not None:
+        _async_log_processor.shutdown(timeout=timeout)
+
+
 class LazyLogger:
     """Lazy logger that defers actual logger creation until first use and writes asynchronously"""
     
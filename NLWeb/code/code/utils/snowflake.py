@@ -1,7 +1,29 @@
-"""Functions for extracting Snowflake connection parameters from configuration."""
+"""Functions for extracting Snowflake connection parameters from configuration,
+and the pooled HTTP client shared by the Snowflake retrieval, LLM and embedding code.
+
+Connection pool limits (environment variables):
+    NLWEB_SNOWFLAKE_MAX_CONNECTIONS: max open connections per account (default 100)
+    NLWEB_SNOWFLAKE_MAX_KEEPALIVE_CONNECTIONS: max idle connections kept open (default 20)
+    NLWEB_SNOWFLAKE_KEEPALIVE_EXPIRY: seconds an idle connection is kept (default 30)
+"""
+
+import asyncio
+import os
+import threading
+from typing import Dict, Tuple
+
+import httpx
 
 from config.config import CONFIG, LLMProviderConfig, EmbeddingProviderConfig, RetrievalProviderConfig
 
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+# One pooled client per account URL, with the event loop it was created on
+_http_clients: Dict[str, Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = {}
+_http_clients_lock = threading.Lock()
+
 class ConfigurationError(RuntimeError):
     """Raised when configuration is missing or invalid"""
     pass
@@ -27,3 +49,59 @@ def get_account_url(cfg: LLMProviderConfig|EmbeddingProviderConfig|RetrievalProv
     if not account_url:
         raise ConfigurationError(f"Unable to determine Snowflake Account URL, is SNOWFLAKE_ACCOUNT_URL set?")
     return account_url
+
+
+def get_headers(cfg: LLMProviderConfig|EmbeddingProviderConfig|RetrievalProviderConfig) -> Dict[str, str]:
+    """
+    Build the JSON request headers, including the PAT bearer token.
+    """
+    return {
+        "Authorization": f"Bearer {get_pat(cfg)}",
+        "Content-Type": "application/json",
+        "Accept": "application/json",
+    }
+
+
+def _env_number(name: str, default, cast):
+    try:
+        return cast(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def get_http_client(cfg: LLMProviderConfig|EmbeddingProviderConfig|RetrievalProviderConfig) -> httpx.AsyncClient:
+    """
+    Return the pooled HTTP client for the account in cfg, creating it on first use.
+
+    Connections are kept alive across calls so only the first request to an
+    account pays for the TLS handshake. A client is bound to the event loop it
+    was created on; a call from a different loop gets a fresh client.
+    """
+    account_url = get_account_url(cfg)
+    loop = asyncio.get_running_loop()
+    with _http_clients_lock:
+        entry = _http_clients.get(account_url)
+        if entry is not None and entry[0] is loop and not entry[1].is_closed:
+            return entry[1]
+        limits = httpx.Limits(
+            max_connections=_env_number("NLWEB_SNOWFLAKE_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS, int),
+            max_keepalive_connections=_env_number("NLWEB_SNOWFLAKE_MAX_KEEPALIVE_CONNECTIONS", DEFAULT_MAX_KEEPALIVE_CONNECTIONS, int),
+            keepalive_expiry=_env_number("NLWEB_SNOWFLAKE_KEEPALIVE_EXPIRY", DEFAULT_KEEPALIVE_EXPIRY, float),
+        )
+        client = httpx.AsyncClient(limits=limits, timeout=60)
+        _http_clients[account_url] = (loop, client)
+        return client
+
+
+async def close_http_clients():
+    """
+    Close the pooled clients created on the running event loop.
+    """
+    loop = asyncio.get_running_loop()
+    with _http_clients_lock:
+        closing = {url: client for url, (client_loop, client) in _http_clients.items() if client_loop is loop}
+        for url in closing:
+            del _http_clients[url]
+    for client in closing.values():
+        if not client.is_closed:
+            await client.aclose()
@@ -8,9 +8,8 @@ WARNING: This code is under development and may undergo changes in future releas
 Backwards compatibility is not guaranteed at this time.
 """
 import time
-import asyncio
 import ssl
-import json
+from utils import fast_json
 from core.baseHandler import NLWebHandler
 from core.generate_answer import GenerateAnswer
 
@@ -25,7 +24,7 @@ class SendChunkWrapper:
             return
         try:
             if isinstance(chunk, dict):
-                message = f"data: {json.dumps(chunk)}\n\n"
+                message = f"data: {fast_json.dumps(chunk)}\n\n"
                 await self.send_chunk(message, end_response)
             else:
                 await self.send_chunk(chunk, end_response)
@@ -44,7 +43,7 @@ class SendChunkWrapper:
             return
             
         try:
-            data_message = f"data: {json.dumps(message)}\n\n"
+            data_message = f"data: {fast_json.dumps(message)}\n\n"
             await self.send_chunk(data_message, end_response)
             if end_response:
                 self.closed = True
@@ -129,7 +128,6 @@ class HandleRequest():
             
         try:
             await self.send_chunk_wrapper.write(message)
-            await asyncio.sleep(0)  # Yield control to allow other tasks to run
         except (ssl.SSLError, BrokenPipeError, ConnectionResetError) as e:
             self.connection_alive = False
             print(f"Connection lost while writing to stream: {str(e)}")
@@ -9,220 +9,450 @@ Backwards compatibility is not guaranteed at this time.
 """
 
 import asyncio
-import json
 import os
+import signal
 import sys
 import time
 import traceback
 import urllib.parse
 from core.whoHandler import WhoHandler
 from core.mcp_handler import handle_mcp_request
+from utils import fast_json
 from utils.utils import get_param
 from webserver.StreamingWrapper import HandleRequest, SendChunkWrapper
 from core.generate_answer import GenerateAnswer
 from webserver.static_file_handler import send_static_file
+from webserver.response_writer import ResponseWriter
+from webserver.route_table import (RouteTable, Request, MATCH_PREFIX, MATCH_SUFFIX,
+                                    timing_middleware, response_cache, concurrency_limit)
+from embedding.embedding_cache import use_worker_disk_dir
+from webserver.prefork import PreforkSupervisor, SHUTDOWN_TIMEOUT, prefork_supported, resolve_worker_count
 from config.config import CONFIG
 from core.baseHandler import NLWebHandler
 from utils.logging_config_helper import get_configured_logger
-from retrieval.retriever import get_vector_db_client
+from retrieval.retriever import get_vector_db_client, get_retrieval_stats, warmup_retrieval_clients, close_retrieval_clients
 
 # Initialize module logger
 logger = get_configured_logger("webserver")
 
+# Persistent connection settings (environment variables):
+#   NLWEB_KEEPALIVE_TIMEOUT: seconds an idle connection waits for its next request (default 15)
+#   NLWEB_MAX_REQUESTS_PER_CONNECTION: requests served before a connection is closed (default 1000)
+DEFAULT_KEEPALIVE_TIMEOUT = 15.0
+DEFAULT_MAX_REQUESTS_PER_CONNECTION = 1000
+
+
+def _env_number(name, default, cast):
+    try:
+        return cast(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+KEEPALIVE_TIMEOUT = _env_number("NLWEB_KEEPALIVE_TIMEOUT", DEFAULT_KEEPALIVE_TIMEOUT, float)
+MAX_REQUESTS_PER_CONNECTION = max(1, _env_number("NLWEB_MAX_REQUESTS_PER_CONNECTION", DEFAULT_MAX_REQUESTS_PER_CONNECTION, int))
+
+# Connection tasks, so a graceful shutdown can close idle connections and wait for busy ones
+_active_connections = set()
+_idle_connections = set()
+_draining = False
+
+
+class BadRequestError(Exception):
+    """Raised when a request is malformed."""
+    pass
+
+
+async def _read_request_body(reader, headers):
+    """
+    Read a request body framed by Content-Length or chunked Transfer-Encoding.
+    
+    Returns:
+        The body bytes, or None if the request has no body
+    """
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        parts = []
+        while True:
+            size_line = await reader.readline()
+            try:
+                size = int(size_line.split(b';', 1)[0].strip(), 16)
+            except ValueError:
+                raise BadRequestError(f"Invalid chunk size line: {size_line[:50]}")
+            if size == 0:
+                # Skip any trailer headers
+                while True:
+                    trailer = await reader.readline()
+                    if trailer in (b'\r\n', b'\n', b''):
+                        break
+                return b''.join(parts)
+            parts.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+    
+    if 'content-length' in headers:
+        try:
+            content_length = int(headers['content-length'])
+        except ValueError:
+            raise BadRequestError(f"Invalid Content-Length: {headers['content-length']}")
+        if content_length < 0:
+            raise BadRequestError(f"Invalid Content-Length: {content_length}")
+        return await reader.readexactly(content_length)
+    
+    return None
+
+
 async def handle_client(reader, writer, fulfill_request):
-    """Handle a client connection by parsing the HTTP request and passing it to fulfill_request."""
-    request_id = f"client_{int(time.time()*1000)}"
+    """
+    Serve HTTP requests on a client connection until it is closed or goes idle.
+    
+    Connections are persistent for HTTP/1.1 clients (and HTTP/1.0 clients that ask
+    for keep-alive) as long as each response is framed by Content-Length or chunked
+    encoding. Pipelined requests queue up in the stream reader and are answered in
+    order. A connection is closed after NLWEB_KEEPALIVE_TIMEOUT idle seconds or
+    NLWEB_MAX_REQUESTS_PER_CONNECTION requests.
+    """
+    connection_id = f"client_{int(time.time()*1000)}"
+    requests_served = 0
+    task = asyncio.current_task()
+    _active_connections.add(task)
+    
+    try:
+        while requests_served < MAX_REQUESTS_PER_CONNECTION:
+            request_id = f"{connection_id}_{requests_served}" if requests_served else connection_id
+            requests_served += 1
+            keep_alive = await _handle_request(
+                reader, writer, fulfill_request, request_id,
+                last_request=requests_served >= MAX_REQUESTS_PER_CONNECTION,
+                requests_left=MAX_REQUESTS_PER_CONNECTION - requests_served
+            )
+            if not keep_alive:
+                break
+    except Exception as e:
+        logger.error(f"[{connection_id}] Critical error handling request: {str(e)}", exc_info=True)
+    finally:
+        # Close the connection in a controlled manner
+        try:
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+            logger.debug(f"[{connection_id}] Connection closed after {requests_served} request(s)")
+        except Exception as e:
+            logger.warning(f"[{connection_id}] Error closing connection: {str(e)}")
+        _active_connections.discard(task)
+
+
+async def _handle_request(reader, writer, fulfill_request, request_id, last_request=False, requests_left=0):
+    """
+    Read one request from the connection, pass it to fulfill_request and frame the response.
+    
+    Returns:
+        True if the connection can be reused for another request
+    """
     connection_alive = True
     
+    # Read the request line, giving up on connections that stay idle
+    task = asyncio.current_task()
+    _idle_connections.add(task)
     try:
-        # Read the request line
-        request_line = await reader.readline()
-        if not request_line:
-            connection_alive = False
-            return
-        
-        # Debug logging to see what we're receiving
-        logger.debug(f"[{request_id}] Raw request bytes: {request_line[:100]}")
+        request_line = await asyncio.wait_for(reader.readline(), KEEPALIVE_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.debug(f"[{request_id}] Idle connection timed out")
+        return False
+    except (ConnectionResetError, BrokenPipeError):
+        return False
+    finally:
+        _idle_connections.discard(task)
+    if not request_line:
+        return False
+    
+    # Debug logging to see what we're receiving
+    logger.debug(f"[{request_id}] Raw request bytes: {request_line[:100]}")
+    
+    try:
+        request_line = request_line.decode('utf-8', errors='replace').rstrip('\r\n')
+    except Exception as decode_error:
+        logger.error(f"[{request_id}] Failed to decode request line: {decode_error}, raw bytes: {request_line[:100]}")
+        writer.write(b"HTTP/1.1 400 Bad Request\r\nConnection: close\r\nContent-Length: 0\r\n\r\n")
+        await writer.drain()
+        return False
+    words = request_line.split()
+    if len(words) < 2:
+        # Bad request
+        logger.warning(f"[{request_id}] Bad request: {request_line}")
+        writer.write(b"HTTP/1.1 400 Bad Request\r\nConnection: close\r\nContent-Length: 0\r\n\r\n")
+        await writer.drain()
+        return False
         
+    method, path = words[0], words[1]
+    version = words[2].upper() if len(words) > 2 else "HTTP/1.0"
+    logger.debug(f"[{request_id}] {method} {path}")
+    
+    # Parse headers
+    headers = {}
+    while True:
         try:
-            request_line = request_line.decode('utf-8', errors='replace').rstrip('\r\n')
-        except Exception as decode_error:
-            logger.error(f"[{request_id}] Failed to decode request line: {decode_error}, raw bytes: {request_line[:100]}")
-            writer.write(b"HTTP/1.1 400 Bad Request\r\n\r\n")
-            await writer.drain()
-            connection_alive = False
-            return
-        words = request_line.split()
-        if len(words) < 2:
-            # Bad request
-            logger.warning(f"[{request_id}] Bad request: {request_line}")
-            writer.write(b"HTTP/1.1 400 Bad Request\r\n\r\n")
-            await writer.drain()
-            connection_alive = False
-            return
+            header_line = await reader.readline()
+            if not header_line or header_line in (b'\r\n', b'\n'):
+                break
             
-        method, path = words[0], words[1]
-        logger.debug(f"[{request_id}] {method} {path}")
-        
-        # Parse headers
-        headers = {}
-        while True:
             try:
-                header_line = await reader.readline()
-                if not header_line or header_line == b'\r\n':
-                    break
+                hdr = header_line.decode('utf-8', errors='replace').rstrip('\r\n')
+            except Exception as decode_error:
+                logger.error(f"[{request_id}] Failed to decode header: {decode_error}, raw bytes: {header_line[:100]}")
+                continue
                 
-                try:
-                    hdr = header_line.decode('utf-8', errors='replace').rstrip('\r\n')
-                except Exception as decode_error:
-                    logger.error(f"[{request_id}] Failed to decode header: {decode_error}, raw bytes: {header_line[:100]}")
-                    continue
-                    
-                if ":" not in hdr:
-                    continue
-                name, value = hdr.split(":", 1)
-                headers[name.strip().lower()] = value.strip()
-            except (ConnectionResetError, BrokenPipeError) as e:
-                connection_alive = False
-                return
-        
-        # Parse query parameters
-        if '?' in path:
-            path, query_string = path.split('?', 1)
+            if ":" not in hdr:
+                continue
+            name, value = hdr.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+        except (ConnectionResetError, BrokenPipeError) as e:
+            return False
+    
+    # HTTP/1.1 connections persist unless the client says otherwise; HTTP/1.0 ones must ask
+    connection_tokens = {token.strip().lower() for token in headers.get('connection', '').split(',')}
+    if version == "HTTP/1.1":
+        keep_alive = 'close' not in connection_tokens
+    else:
+        keep_alive = 'keep-alive' in connection_tokens
+    keep_alive = keep_alive and not last_request and not _draining
+    can_chunk = version == "HTTP/1.1"
+    head_request = method.upper() == "HEAD"
+    
+    # Parse query parameters
+    if '?' in path:
+        path, query_string = path.split('?', 1)
+        query_params = {}
+        try:
+            # Parse query parameters into a dictionary of lists
+            for key, values in urllib.parse.parse_qs(query_string).items():
+                query_params[key] = values
+        except Exception as e:
             query_params = {}
-            try:
-                # Parse query parameters into a dictionary of lists
-                for key, values in urllib.parse.parse_qs(query_string).items():
-                    query_params[key] = values
-            except Exception as e:
-                query_params = {}
+    else:
+        query_params = {}
+    
+    # Read the request body so the next pipelined request starts at the right offset
+    if headers.get('expect', '').lower() == '100-continue':
+        writer.write(b"HTTP/1.1 100 Continue\r\n\r\n")
+    try:
+        body = await _read_request_body(reader, headers)
+        if body is not None:
+            logger.debug(f"[{request_id}] Read body of {len(body)} bytes")
+    except BadRequestError as e:
+        logger.warning(f"[{request_id}] Bad request body: {e}")
+        writer.write(b"HTTP/1.1 400 Bad Request\r\nConnection: close\r\nContent-Length: 0\r\n\r\n")
+        await writer.drain()
+        return False
+    except (asyncio.IncompleteReadError, ConnectionResetError, BrokenPipeError) as e:
+        logger.error(f"[{request_id}] Error reading body: {e}")
+        return False
+    except Exception as e:
+        logger.error(f"[{request_id}] Unexpected error reading body: {e}")
+        return False
+    
+    # Response framing state. The status line and headers are held back until
+    # the first body chunk so a single-chunk response goes out in one write
+    # with a Content-Length; otherwise the body is sent chunked through a
+    # ResponseWriter that coalesces small writes. Responses to HEAD and
+    # 1xx/204/304 responses never carry a body, whatever the handler sends,
+    # so the next response on the connection starts where the client expects.
+    status_line = None
+    out_headers = {}
+    framing = None  # "length", "chunked", "close", "none" or None until decided
+    head_written = False
+    body_writer = None
+    body_allowed = not head_request
+    bodyless_status = False
+    
+    def build_head(content_length=None):
+        nonlocal framing, keep_alive
+        if bodyless_status:
+            # These statuses have no body and no body framing headers
+            framing = "none"
+            for header_name in list(out_headers):
+                if header_name.lower() == 'content-length':
+                    del out_headers[header_name]
+        elif content_length is not None:
+            framing = "length"
+            out_headers['Content-Length'] = str(content_length)
+        elif framing is None:
+            if can_chunk:
+                framing = "chunked"
+            else:
+                # A HEAD response has no body to delimit by closing the connection
+                framing = "none" if head_request else "close"
+        if framing == "chunked":
+            out_headers['Transfer-Encoding'] = 'chunked'
+        elif framing == "close":
+            keep_alive = False
+        if keep_alive:
+            out_headers['Connection'] = 'keep-alive'
+            out_headers['Keep-Alive'] = f"timeout={int(KEEPALIVE_TIMEOUT)}, max={requests_left}"
         else:
-            query_params = {}
-        
-        # Read request body if Content-Length is provided
-        body = None
-        if 'content-length' in headers:
-            try:
-                content_length = int(headers['content-length'])
-                body = await reader.read(content_length)
-                logger.debug(f"[{request_id}] Read body of {len(body) if body else 0} bytes")
-            except (ValueError, ConnectionResetError, BrokenPipeError) as e:
-                logger.error(f"[{request_id}] Error reading body: {e}")
-                connection_alive = False
-                return
-            except Exception as e:
-                logger.error(f"[{request_id}] Unexpected error reading body: {e}")
-                connection_alive = False
-                return
+            out_headers['Connection'] = 'close'
+        lines = [status_line] + [f"{name}: {value}\r\n" for name, value in out_headers.items()]
+        return (''.join(lines) + "\r\n").encode('utf-8')
+    
+    def start_body():
+        nonlocal head_written, body_writer
+        head = build_head()
+        body_writer = ResponseWriter(writer, chunked=(framing == "chunked"), head=head)
+        head_written = True
+    
+    # Create a streaming response handler
+    async def send_response(status_code, response_headers, end_response=False):
+        """Send HTTP status and headers to the client."""
+        nonlocal connection_alive, status_line, out_headers, framing, keep_alive, head_written
+        nonlocal body_allowed, bodyless_status
         
-        # Create a streaming response handler
-        async def send_response(status_code, response_headers, end_response=False):
-            """Send HTTP status and headers to the client."""
-            nonlocal connection_alive
+        if not connection_alive:
+            return
+        if getattr(send_response, 'headers_sent', False):
+            logger.debug(f"[{request_id}] Ignoring repeated response headers")
+            return
             
-            if not connection_alive:
-                return
-                
-            try:
-                status_line = f"HTTP/1.1 {status_code}\r\n"
-                writer.write(status_line.encode('utf-8'))
-                
-                # Add CORS headers if enabled
-                if CONFIG.server.enable_cors and 'origin' in headers:
-                    response_headers['Access-Control-Allow-Origin'] = '*'
-                    response_headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
-                    response_headers['Access-Control-Allow-Headers'] = 'Content-Type'
-                
-                # Send headers
-                for header_name, header_value in response_headers.items():
-                    header_line = f"{header_name}: {header_value}\r\n"
-                    writer.write(header_line.encode('utf-8'))
-                
-                # End headers
-                writer.write(b"\r\n")
-                await writer.drain()   
-                # Signal that we've sent the headers
-                send_response.headers_sent = True
-                send_response.ended = end_response
-            except (ConnectionResetError, BrokenPipeError) as e:
-                connection_alive = False
-            except Exception as e:
-                connection_alive = False
+        try:
+            status_line = f"HTTP/1.1 {status_code}\r\n"
+            status = int(status_code)
+            bodyless_status = 100 <= status < 200 or status in (204, 304)
+            body_allowed = not (head_request or bodyless_status)
+            out_headers = dict(response_headers)
+            
+            # Add CORS headers if enabled
+            if CONFIG.server.enable_cors and 'origin' in headers:
+                out_headers['Access-Control-Allow-Origin'] = '*'
+                out_headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+                out_headers['Access-Control-Allow-Headers'] = 'Content-Type'
+            
+            # Connection management and framing headers are set here, not by handlers
+            for header_name in list(out_headers):
+                lowered = header_name.lower()
+                if lowered == 'connection':
+                    if out_headers[header_name].lower() == 'close':
+                        keep_alive = False
+                    del out_headers[header_name]
+                elif lowered in ('keep-alive', 'transfer-encoding'):
+                    del out_headers[header_name]
+                elif lowered == 'content-length':
+                    framing = "length"
+            
+            if out_headers.get('Content-Type', '').startswith('text/event-stream'):
+                # Event streams are sent chunked (or close-delimited for HTTP/1.0),
+                # and their headers go out immediately so the client can start listening
+                if body_allowed:
+                    start_body()
+                    body_writer.flush()
+                else:
+                    writer.write(build_head())
+                    head_written = True
+                await writer.drain()
+            elif end_response:
+                writer.write(build_head(0))
+                head_written = True
+                await writer.drain()
+            
+            # Signal that we've sent the headers
+            send_response.headers_sent = True
+            send_response.ended = end_response
+        except (ConnectionResetError, BrokenPipeError) as e:
+            connection_alive = False
+        except Exception as e:
+            connection_alive = False
+    
+    # Create a streaming content sender
+    async def send_chunk(chunk, end_response=False):
+        """Send a chunk of data to the client."""
+        nonlocal connection_alive, head_written
         
-        # Create a streaming content sender
-        async def send_chunk(chunk, end_response=False):
-            """Send a chunk of data to the client."""
-            nonlocal connection_alive
+        if not connection_alive:
+            return
             
-            if not connection_alive:
-                return
-                
-            if not hasattr(send_response, 'headers_sent') or not send_response.headers_sent:
-                logger.warning(f"[{request_id}] Headers must be sent before content")
-                return
-                
-            if hasattr(send_response, 'ended') and send_response.ended:
-                logger.warning(f"[{request_id}] Response has already been ended")
-                return
-                
-            try:
-                chunk_size = 0
-                if chunk:
-                    if isinstance(chunk, str):
-                        data = chunk.encode('utf-8')
-                        chunk_size = len(data)
-                        writer.write(data)
-                    else:
-                        chunk_size = len(chunk)
-                        writer.write(chunk)
+        if not hasattr(send_response, 'headers_sent') or not send_response.headers_sent:
+            logger.warning(f"[{request_id}] Headers must be sent before content")
+            return
+            
+        if hasattr(send_response, 'ended') and send_response.ended:
+            logger.warning(f"[{request_id}] Response has already been ended")
+            return
+            
+        try:
+            data = chunk.encode('utf-8') if isinstance(chunk, str) else (chunk or b"")
+            if not body_allowed:
+                # Send the headers a body-carrying response would have, but never the body
+                if not head_written:
+                    writer.write(build_head(len(data) if end_response and framing is None else None))
+                    head_written = True
                     await writer.drain()
-                
                 send_response.ended = end_response
-            except (ConnectionResetError, BrokenPipeError) as e:
-                logger.warning(f"[{request_id}] Connection lost while sending chunk: {str(e)}")
-                connection_alive = False
-            except Exception as e:
-                logger.warning(f"[{request_id}] Error sending chunk: {str(e)}")
-                connection_alive = False
+                return
+            if not head_written:
+                if end_response and framing is None:
+                    # A response sent as one chunk gets a Content-Length
+                    writer.write(build_head(len(data)) + data)
+                    head_written = True
+                    send_response.ended = True
+                    await writer.drain()
+                    return
+                start_body()
+            await body_writer.send(data, end_response)
+            
+            send_response.ended = end_response
+        except (ConnectionResetError, BrokenPipeError) as e:
+            logger.warning(f"[{request_id}] Connection lost while sending chunk: {str(e)}")
+            connection_alive = False
+        except Exception as e:
+            logger.warning(f"[{request_id}] Error sending chunk: {str(e)}")
+            connection_alive = False
+        if not connection_alive and body_writer is not None:
+            body_writer.cancel()
+    
+    # Call the user-provided fulfill_request function with streaming capabilities
+    try:
+        await fulfill_request(
+            method=method,
+            path=urllib.parse.unquote(path),
+            headers=headers,
+            query_params=query_params,
+            body=body,
+            send_response=send_response,
+            send_chunk=send_chunk
+        )
+    except Exception as e:
+        logger.error(f"[{request_id}] Error in fulfill_request: {str(e)}", exc_info=True)
         
-        # Call the user-provided fulfill_request function with streaming capabilities
-        if connection_alive:
+        if connection_alive and not (hasattr(send_response, 'headers_sent') and send_response.headers_sent):
             try:
-                await fulfill_request(
-                    method=method,
-                    path=urllib.parse.unquote(path),
-                    headers=headers,
-                    query_params=query_params,
-                    body=body,
-                    send_response=send_response,
-                    send_chunk=send_chunk
-                )
-            except Exception as e:
-                logger.error(f"[{request_id}] Error in fulfill_request: {str(e)}", exc_info=True)
-                
-                if connection_alive and not (hasattr(send_response, 'headers_sent') and send_response.headers_sent):
-                    try:
-                        # Send a 500 error if headers haven't been sent yet
-                        error_headers = {
-                            'Content-Type': 'text/plain',
-                            'Connection': 'close'
-                        }
-                        await send_response(500, error_headers)
-                        await send_chunk(f"Internal server error: {str(e)}".encode('utf-8'), end_response=True)
-                    except:
-                        pass
-        
-    except Exception as e:
-        logger.error(f"[{request_id}] Critical error handling request: {str(e)}", exc_info=True)
-    finally:
-        # Close the connection in a controlled manner
-        try:
+                # Send a 500 error if headers haven't been sent yet
+                error_headers = {
+                    'Content-Type': 'text/plain',
+                    'Connection': 'close'
+                }
+                await send_response(500, error_headers)
+                await send_chunk(f"Internal server error: {str(e)}".encode('utf-8'), end_response=True)
+            except:
+                pass
+        else:
+            # The response was cut short, so its framing can't be trusted;
+            # send what was produced and close the connection
+            if body_writer is not None:
+                body_writer.flush()
+            return False
+    
+    if not connection_alive or not getattr(send_response, 'headers_sent', False):
+        return False
+    
+    # Finish responses the handler didn't end explicitly, and flush coalesced writes
+    try:
+        if not head_written:
+            writer.write(build_head(0 if framing is None else None))
+            head_written = True
             await writer.drain()
-            writer.close()
-            await writer.wait_closed()
-            logger.debug(f"[{request_id}] Connection closed")
-        except Exception as e:
-            logger.warning(f"[{request_id}] Error closing connection: {str(e)}")
+        elif body_writer is not None:
+            await body_writer.finish()
+        send_response.ended = True
+    except (ConnectionResetError, BrokenPipeError):
+        return False
+    
+    return keep_alive and framing != "close"
 
 def handle_site_parameter(query_params):
     """
@@ -272,10 +502,39 @@ def handle_site_parameter(query_params):
     
     return result_params
 
+async def _drain_connections(server):
+    """
+    Stop accepting connections, close idle ones and give in-flight requests
+    up to NLWEB_WORKER_SHUTDOWN_TIMEOUT seconds to finish.
+    """
+    global _draining
+    _draining = True
+    server.close()
+    
+    for task in list(_idle_connections):
+        task.cancel()
+    busy = [task for task in _active_connections if not task.done()]
+    if busy:
+        logger.info(f"Waiting for {len(busy)} connection(s) to finish")
+        _, pending = await asyncio.wait(busy, timeout=SHUTDOWN_TIMEOUT)
+        for task in pending:
+            task.cancel()
+        if pending:
+            logger.warning(f"Cancelled {len(pending)} connection(s) still running after {SHUTDOWN_TIMEOUT}s")
+            await asyncio.wait(pending)
+
 async def start_server(host=None, port=None, fulfill_request=None, use_https=False, 
-                 ssl_cert_file=None, ssl_key_file=None):
+                 ssl_cert_file=None, ssl_key_file=None, sock=None, reuse_port=False):
     """
     Start the HTTP/HTTPS server with the provided request handler.
+    
+    SIGTERM shuts the server down gracefully: it stops accepting, closes idle
+    connections and lets in-flight requests finish.
+    
+    Args:
+        sock: Already listening socket to serve on instead of binding host and port
+              (used by pre-fork workers sharing one socket)
+        reuse_port: Bind with SO_REUSEPORT so several worker processes can listen on the same port
     """
     import ssl
     
@@ -311,19 +570,201 @@ async def start_server(host=None, port=None, fulfill_request=None, use_https=Fal
             raise ValueError(f"Failed to load SSL certificate: {e}")
     
     # Start server with or without SSL
-    server = await asyncio.start_server(
-        lambda r, w: handle_client(r, w, fulfill_request), 
-        host, 
-        port,
-        ssl=ssl_context
-    )
+    if sock is not None:
+        server = await asyncio.start_server(
+            lambda r, w: handle_client(r, w, fulfill_request),
+            sock=sock,
+            ssl=ssl_context
+        )
+    else:
+        server = await asyncio.start_server(
+            lambda r, w: handle_client(r, w, fulfill_request), 
+            host, 
+            port,
+            ssl=ssl_context,
+            reuse_port=reuse_port or None
+        )
     
     addr = server.sockets[0].getsockname()
     protocol = "HTTPS" if (use_https or ssl_context) else "HTTP"
     url_protocol = "https" if (use_https or ssl_context) else "http"
-    print(f'Serving {protocol} on {addr[0]} port {addr[1]} ({url_protocol}://{addr[0]}:{addr[1]}/) ...')
-    async with server:
-        await server.serve_forever()
+    worker = f" [worker pid {os.getpid()}]" if (sock is not None or reuse_port) else ""
+    print(f'Serving {protocol} on {addr[0]} port {addr[1]} ({url_protocol}://{addr[0]}:{addr[1]}/) ...{worker}')
+    
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    try:
+        loop.add_signal_handler(signal.SIGTERM, stop_event.set)
+    except (NotImplementedError, AttributeError):
+        # No loop signal handlers on Windows; SIGTERM keeps its default behavior
+        pass
+    
+    # Connect to retrieval backends in the background so startup isn't blocked on them
+    warmup_task = asyncio.create_task(warmup_retrieval_clients())
+    try:
+        async with server:
+            await stop_event.wait()
+            await _drain_connections(server)
+    finally:
+        warmup_task.cancel()
+        await close_retrieval_clients()
+
+def _streaming_requested(query_params, default=True):
+    """Read the streaming query parameter."""
+    if "streaming" in query_params:
+        strval = get_param(query_params, "streaming", str, "True" if default else "False")
+        return strval not in ["False", "false", "0"]
+    return default
+
+async def _serve_home(request):
+    # Serve the home page as /static/index.html
+    try:
+        await send_static_file("/static/index.html", request.send_response, request.send_chunk)
+    except FileNotFoundError:
+        await request.send_response(404, {'Content-Type': 'text/plain'})
+        await request.send_chunk("Home page not found".encode('utf-8'), end_response=True)
+
+async def _serve_static(request):
+    await send_static_file(request.path, request.send_response, request.send_chunk)
+
+async def _serve_stats(request):
+    # Retrieval endpoint health and cache statistics, plus per-route timings
+    stats = get_retrieval_stats()
+    stats["routes"] = ROUTES.stats()
+    await request.send_response(200, {'Content-Type': 'application/json'})
+    await request.send_chunk(fast_json.dumps(stats), end_response=True)
+
+async def _handle_who(request):
+    retval = await WhoHandler(request.query_params, None).runQuery()
+    await request.send_response(200, {'Content-Type': 'application/json'})
+    await request.send_chunk(fast_json.dumps(retval), end_response=True)
+
+async def _handle_sites(request):
+    query_params, send_response, send_chunk = request.query_params, request.send_response, request.send_chunk
+    streaming = _streaming_requested(query_params)
+    try:
+        # Create a retriever client
+        retriever = get_vector_db_client(query_params=query_params)
+        
+        # Get the list of sites
+        sites = await retriever.get_sites()
+        
+        # Prepare the response with message-type
+        response_data = {
+            "message-type": "sites",
+            "sites": sites
+        }
+        
+        if streaming:
+            # Set proper headers for server-sent events (SSE)
+            response_headers = {
+                'Content-Type': 'text/event-stream',
+                'Cache-Control': 'no-cache',
+                'Connection': 'keep-alive',
+                'X-Accel-Buffering': 'no'  # Disable proxy buffering
+            }
+            
+            # Send SSE headers
+            await send_response(200, response_headers)
+            
+            # Send the sites data as an SSE event
+            await send_chunk(f"data: {fast_json.dumps(response_data)}\n\n", end_response=True)
+        else:
+            # Non-streaming mode - return as JSON
+            await send_response(200, {'Content-Type': 'application/json'})
+            await send_chunk(fast_json.dumps(response_data), end_response=True)
+    except Exception as e:
+        logger.error(f"Error getting sites: {str(e)}")
+        error_data = {
+            "message-type": "error",
+            "error": f"Failed to get sites: {str(e)}"
+        }
+        if streaming:
+            # Send error as SSE event
+            if not (hasattr(send_response, 'headers_sent') and send_response.headers_sent):
+                response_headers = {
+                    'Content-Type': 'text/event-stream',
+                    'Cache-Control': 'no-cache',
+                    'Connection': 'keep-alive',
+                    'X-Accel-Buffering': 'no'
+                }
+                await send_response(500, response_headers)
+            await send_chunk(f"data: {fast_json.dumps(error_data)}\n\n", end_response=True)
+        else:
+            await send_response(500, {'Content-Type': 'application/json'})
+            await send_chunk(fast_json.dumps(error_data), end_response=True)
+
+async def _mcp_health(request):
+    await request.send_response(200, {'Content-Type': 'application/json'})
+    await request.send_chunk(fast_json.dumps({"status": "ok"}), end_response=True)
+
+async def _handle_mcp(request):
+    # Check if streaming should be used from query parameters
+    use_streaming = _streaming_requested(request.query_params, default=False)
+        
+    # Handle MCP requests with streaming parameter
+    logger.info(f"Routing to MCP handler (streaming={use_streaming})")
+    await handle_mcp_request(request.query_params, request.body, request.send_response, request.send_chunk,
+                             streaming=use_streaming)
+
+async def _handle_ask(request):
+    send_response, send_chunk = request.send_response, request.send_chunk
+    streaming = _streaming_requested(request.query_params)
+    generate_mode = "none"
+    if ("generate_mode" in request.query_params):
+        generate_mode = get_param(request.query_params, "generate_mode", str, "none")
+    
+    # Handle site parameter validation for ask endpoint
+    validated_query_params = handle_site_parameter(request.query_params)
+    
+    if (not streaming):
+        if (generate_mode == "generate"):
+            retval = await GenerateAnswer(validated_query_params, None).runQuery()
+        else:
+            retval = await NLWebHandler(validated_query_params, None).runQuery()
+        await send_response(200, {'Content-Type': 'application/json'})
+        await send_chunk(fast_json.dumps(retval), end_response=True)
+    else:   
+        # Set proper headers for server-sent events (SSE)
+        response_headers = {
+            'Content-Type': 'text/event-stream',
+            'Cache-Control': 'no-cache',
+            'Connection': 'keep-alive',
+            'X-Accel-Buffering': 'no'  # Disable proxy buffering
+        }
+        
+        # Send SSE headers
+        await send_response(200, response_headers)
+        
+        # Send initial keep-alive comment to establish connection
+        await send_chunk(": keep-alive\n\n", end_response=False)
+        
+        # Create wrapper for chunk sending
+        send_chunk_wrapper = SendChunkWrapper(send_chunk)
+        
+        # Handle the request with validated query parameters
+        hr = HandleRequest(request.method, request.path, request.headers, validated_query_params, 
+                           request.body, send_response, send_chunk_wrapper, generate_mode)
+        await hr.do_GET()
+
+# Per-route response caching and concurrency limits (environment variables):
+#   NLWEB_ROUTE_CACHE_TTL: seconds /sites and /who responses are cached (default 0, disabled)
+#   NLWEB_ASK_CONCURRENCY: maximum concurrent /ask requests per process (default 0, unlimited)
+ROUTE_CACHE_TTL = _env_number("NLWEB_ROUTE_CACHE_TTL", 0.0, float)
+ASK_CONCURRENCY = _env_number("NLWEB_ASK_CONCURRENCY", 0, int)
+
+ROUTES = RouteTable(middleware=[timing_middleware])
+ROUTES.add("/", _serve_home, methods=("GET", "HEAD"))
+ROUTES.add("/html/", _serve_static, methods=("GET", "HEAD"), match=MATCH_PREFIX)
+ROUTES.add("/static/", _serve_static, methods=("GET", "HEAD"), match=MATCH_PREFIX)
+ROUTES.add(".png", _serve_static, methods=("GET", "HEAD"), match=MATCH_SUFFIX, name="*.png")
+ROUTES.add("/stats", _serve_stats)
+ROUTES.add("/who", _handle_who, methods=("GET", "POST"), middleware=[response_cache(ROUTE_CACHE_TTL)])
+ROUTES.add("/sites", _handle_sites, middleware=[response_cache(ROUTE_CACHE_TTL)])
+ROUTES.add("/mcp/health", _mcp_health)
+ROUTES.add("/mcp/healthz", _mcp_health)
+ROUTES.add("/mcp", _handle_mcp, methods=("GET", "POST"), match=MATCH_PREFIX)
+ROUTES.add("/ask", _handle_ask, methods=("GET", "POST"), middleware=[concurrency_limit(ASK_CONCURRENCY)])
 
 async def fulfill_request(method, path, headers, query_params, body, send_response, send_chunk):
     '''
@@ -339,139 +780,8 @@ async def fulfill_request(method, path, headers, query_params, body, send_respon
         send_chunk (callable): Function to send response body chunks
     '''
     try:
-        streaming = True
-        generate_mode = "none"
-        if ("streaming" in query_params):
-            strval = get_param(query_params, "streaming", str, "True")
-            streaming = strval not in ["False", "false", "0"]
-
-        if ("generate_mode" in query_params):
-            generate_mode = get_param(query_params, "generate_mode", str, "none")
-           
-        if path == "/" or path == "":
-            # Serve the home page as /static/index.html
-            # First check if the file exists
-            try:
-                await send_static_file("/static/index.html", send_response, send_chunk)
-            except FileNotFoundError:
-                # If new_test.html doesn't exist, send a 404 error
-                await send_response(404, {'Content-Type': 'text/plain'})
-                await send_chunk("Home page not found".encode('utf-8'), end_response=True)
-            return
-        elif (path.find("html/") != -1) or path.find("static/") != -1 or (path.find("png") != -1):
-            await send_static_file(path, send_response, send_chunk)
-            return
-        elif (path.find("who") != -1):
-            retval =  await WhoHandler(query_params, None).runQuery()
-            await send_response(200, {'Content-Type': 'application/json'})
-            await send_chunk(json.dumps(retval), end_response=True)
-            return
-        elif (path.find("sites") != -1):
-            # Handle /sites endpoint
-            try:
-                # Create a retriever client
-                retriever = get_vector_db_client(query_params=query_params)
-                
-                # Get the list of sites
-                sites = await retriever.get_sites()
-                
-                # Prepare the response with message-type
-                response_data = {
-                    "message-type": "sites",
-                    "sites": sites
-                }
-                
-                if streaming:
-                    # Set proper headers for server-sent events (SSE)
-                    response_headers = {
-                        'Content-Type': 'text/event-stream',
-                        'Cache-Control': 'no-cache',
-                        'Connection': 'keep-alive',
-                        'X-Accel-Buffering': 'no'  # Disable proxy buffering
-                    }
-                    
-                    # Send SSE headers
-                    await send_response(200, response_headers)
-                    
-                    # Send the sites data as an SSE event
-                    await send_chunk(f"data: {json.dumps(response_data)}\n\n", end_response=True)
-                else:
-                    # Non-streaming mode - return as JSON
-                    await send_response(200, {'Content-Type': 'application/json'})
-                    await send_chunk(json.dumps(response_data), end_response=True)
-            except Exception as e:
-                logger.error(f"Error getting sites: {str(e)}")
-                error_data = {
-                    "message-type": "error",
-                    "error": f"Failed to get sites: {str(e)}"
-                }
-                if streaming:
-                    # Send error as SSE event
-                    if not (hasattr(send_response, 'headers_sent') and send_response.headers_sent):
-                        response_headers = {
-                            'Content-Type': 'text/event-stream',
-                            'Cache-Control': 'no-cache',
-                            'Connection': 'keep-alive',
-                            'X-Accel-Buffering': 'no'
-                        }
-                        await send_response(500, response_headers)
-                    await send_chunk(f"data: {json.dumps(error_data)}\n\n", end_response=True)
-                else:
-                    await send_response(500, {'Content-Type': 'application/json'})
-                    await send_chunk(json.dumps(error_data), end_response=True)
-            return
-        elif (path.find("mcp") != -1):
-            # Handle MCP health check
-            if path == "/mcp/health" or path == "/mcp/healthz":
-                await send_response(200, {'Content-Type': 'application/json'})
-                await send_chunk(json.dumps({"status": "ok"}), end_response=True)
-                return
-
-            # Check if streaming should be used from query parameters
-            use_streaming = False
-            if ("streaming" in query_params):
-                strval = get_param(query_params, "streaming", str, "False")
-                use_streaming = strval not in ["False", "false", "0"]
-                
-            # Handle MCP requests with streaming parameter
-            logger.info(f"Routing to MCP handler (streaming={use_streaming})")
-            await handle_mcp_request(query_params, body, send_response, send_chunk, streaming=use_streaming)
-            return
-        elif (path.find("ask") != -1):
-            # Handle site parameter validation for ask endpoint
-            validated_query_params = handle_site_parameter(query_params)
-            
-            if (not streaming):
-                if (generate_mode == "generate"):
-                    retval = await GenerateAnswer(validated_query_params, None).runQuery()
-                else:
-                    retval = await NLWebHandler(validated_query_params, None).runQuery()
-                await send_response(200, {'Content-Type': 'application/json'})
-                await send_chunk(json.dumps(retval), end_response=True)
-                return
-            else:   
-                # Set proper headers for server-sent events (SSE)
-                response_headers = {
-                    'Content-Type': 'text/event-stream',
-                    'Cache-Control': 'no-cache',
-                    'Connection': 'keep-alive',
-                    'X-Accel-Buffering': 'no'  # Disable proxy buffering
-                }
-                
-                # Send SSE headers
-                await send_response(200, response_headers)
-                
-                # Send initial keep-alive comment to establish connection
-                await send_chunk(": keep-alive\n\n", end_response=False)
-                
-                # Create wrapper for chunk sending
-                send_chunk_wrapper = SendChunkWrapper(send_chunk)
-                
-                # Handle the request with validated query parameters
-                hr = HandleRequest(method, path, headers, validated_query_params, 
-                                   body, send_response, send_chunk_wrapper, generate_mode)
-                await hr.do_GET()
-        else:
+        request = Request(method, path or "/", headers, query_params, body, send_response, send_chunk)
+        if not await ROUTES.dispatch(request):
             # Default handler for unknown paths
             logger.warning(f"No handler found for path: {path}")
             await send_response(404, {'Content-Type': 'text/plain'})
@@ -485,6 +795,38 @@ def close_logs():
     # This function is no longer needed with the new logging system
     pass
 
+def init_components():
+    """Initialize the router, LLM providers and retrieval clients in this process."""
+    # Initialize router
+    import core.router as router
+    router.init()
+    
+    # Initialize LLM providers
+    import llm.llm as llm
+    llm.init()
+    
+    # Initialize retrieval clients
+    import retrieval.retriever as retriever
+    retriever.init()
+
+def run_event_loop(main):
+    """
+    Run a coroutine to completion on uvloop when it is installed, asyncio's default loop otherwise.
+    
+    Set NLWEB_UVLOOP=0 to keep the default loop.
+    """
+    if os.getenv("NLWEB_UVLOOP", "1").strip().lower() not in ("0", "false", "no", "off"):
+        try:
+            import uvloop
+        except ImportError:
+            uvloop = None
+        if uvloop is not None:
+            if hasattr(asyncio, "Runner"):
+                with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                    return runner.run(main)
+            uvloop.install()
+    return asyncio.run(main)
+
 # Azure Web App specific: Check for the PORT environment variable
 def get_port():
     """Get the port to listen on, using config or environment."""
@@ -508,6 +850,8 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="NLWeb Server")
     parser.add_argument('--mode', choices=['development', 'production', 'testing'], 
                        help='Override the application mode from config')
+    parser.add_argument('--workers', type=int, default=None,
+                       help='Number of worker processes (default: NLWEB_WORKERS or 1, 0 for one per CPU)')
     parser.add_argument('command', nargs='?', help='Optional command (e.g., https)')
     args = parser.parse_args()
     
@@ -516,17 +860,14 @@ if __name__ == "__main__":
         CONFIG.set_mode(args.mode)
         print(f"Mode overridden to: {args.mode}")
     
-    # Initialize router
-    import core.router as router
-    router.init()
+    num_workers = resolve_worker_count(args.workers)
+    if num_workers > 1 and not prefork_supported():
+        print("Multiple workers need os.fork(), which this platform lacks; running a single process")
+        num_workers = 1
     
-    # Initialize LLM providers
-    import llm.llm as llm
-    llm.init()
-    
-    # Initialize retrieval clients
-    import retrieval.retriever as retriever
-    retriever.init()
+    # Workers initialize after the fork so no clients, threads or sockets are shared between them
+    if num_workers == 1:
+        init_components()
     
     try:
         port = get_port()
@@ -558,17 +899,27 @@ if __name__ == "__main__":
                 ssl_cert_file = CONFIG.get_ssl_cert_path()
                 ssl_key_file = CONFIG.get_ssl_key_path()
                 
-            asyncio.run(start_server(
+            server_args = dict(
                 fulfill_request=fulfill_request,
                 use_https=True,
                 ssl_cert_file=ssl_cert_file,
                 ssl_key_file=ssl_key_file,
                 port=port
-            ))
+            )
         else:
             # Use the detected port
             print(f"Starting HTTP server on port {port}")
-            asyncio.run(start_server(port=port, fulfill_request=fulfill_request))
+            server_args = dict(port=port, fulfill_request=fulfill_request)
+        
+        if num_workers > 1:
+            def run_worker(number, sock):
+                use_worker_disk_dir(number)
+                init_components()
+                run_event_loop(start_server(sock=sock, reuse_port=sock is None, **server_args))
+            
+            sys.exit(PreforkSupervisor(run_worker, num_workers, host=CONFIG.server.host, port=port).run())
+        else:
+            run_event_loop(start_server(**server_args))
     finally:
         # Make sure to close the log file when the application exits
         close_logs()
@@ -0,0 +1,286 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""
+Pre-fork worker supervisor for the web server.
+
+The parent process forks a number of workers that each run their own asyncio
+loop and accept connections on the same port, either through SO_REUSEPORT
+(every worker binds its own socket and the kernel balances between them) or,
+where that is unavailable, through one listening socket created before the fork
+and inherited by all workers. The parent does no request handling; it restarts
+workers that die and relays signals:
+
+    SIGTERM / SIGINT: stop all workers gracefully and exit
+    SIGHUP: graceful restart - start a fresh set of workers, then drain the old ones
+
+Configuration (environment variables):
+    NLWEB_WORKERS: number of worker processes (default 1, 0 uses one per CPU)
+    NLWEB_WORKER_SHUTDOWN_TIMEOUT: seconds a stopping worker waits for in-flight requests (default 30)
+
+State shared between workers: the embedding cache's disk tier
+(NLWEB_EMBEDDING_CACHE_DIR) is used by every worker at once. Appends are
+serialized with flock, so workers share one directory; on filesystems that
+don't honor flock, set NLWEB_EMBEDDING_CACHE_PER_WORKER=1 to give each worker
+its own subdirectory. Everything else (clients, in-memory caches) is per worker.
+
+WARNING: This code is under development and may undergo changes in future releases.
+Backwards compatibility is not guaranteed at this time.
+"""
+
+import os
+import signal
+import socket
+import time
+from typing import Callable, Dict, Optional
+
+from utils.logging_config_helper import get_configured_logger, shutdown_logging
+
+logger = get_configured_logger("prefork")
+
+DEFAULT_SHUTDOWN_TIMEOUT = 30.0
+
+# A worker that exits sooner than this after starting counts as a crash loop
+MIN_WORKER_LIFETIME = 1.0
+MAX_RESPAWN_DELAY = 30.0
+POLL_INTERVAL = 0.2
+
+WorkerMain = Callable[[int, Optional[socket.socket]], None]
+
+
+def _env_number(name, default, cast):
+    try:
+        return cast(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+SHUTDOWN_TIMEOUT = max(0.0, _env_number("NLWEB_WORKER_SHUTDOWN_TIMEOUT", DEFAULT_SHUTDOWN_TIMEOUT, float))
+
+
+def resolve_worker_count(requested: Optional[int] = None) -> int:
+    """
+    Work out how many worker processes to run.
+
+    Args:
+        requested: Count from the command line; falls back to NLWEB_WORKERS when None
+
+    Returns:
+        Worker count; 0 or a negative value means one per CPU
+    """
+    if requested is None:
+        requested = _env_number("NLWEB_WORKERS", 1, int)
+    if requested <= 0:
+        requested = os.cpu_count() or 1
+    return requested
+
+
+def prefork_supported() -> bool:
+    """Whether this platform can fork worker processes."""
+    return hasattr(os, "fork")
+
+
+def reuse_port_supported() -> bool:
+    """Whether the kernel can balance connections between sockets bound to the same port."""
+    if not hasattr(socket, "SO_REUSEPORT"):
+        return False
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+            probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        return True
+    except OSError:
+        return False
+
+
+def create_listening_socket(host: Optional[str], port: int, backlog: int = 1024) -> socket.socket:
+    """
+    Create a bound, listening TCP socket to be inherited by forked workers.
+
+    Args:
+        host: Interface to bind; None or empty binds all interfaces
+        port: Port to bind
+        backlog: Listen queue length
+
+    Returns:
+        Non-blocking listening socket
+    """
+    info = socket.getaddrinfo(host or None, port, type=socket.SOCK_STREAM, flags=socket.AI_PASSIVE)
+    family, socktype, proto, _, address = info[0]
+    sock = socket.socket(family, socktype, proto)
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(address)
+        sock.listen(backlog)
+        sock.setblocking(False)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class PreforkSupervisor:
+    """
+    Forks and supervises worker processes serving the same port.
+
+    Args:
+        worker_main: Runs the server in a worker; called with the worker number and the
+                     shared listening socket, or None when workers bind with SO_REUSEPORT.
+                     It is expected to initialize its own clients after the fork.
+        num_workers: Number of workers to keep running
+        host: Interface to listen on (only used for a shared socket)
+        port: Port to listen on (only used for a shared socket)
+    """
+
+    def __init__(self, worker_main: WorkerMain, num_workers: int, host: Optional[str] = None, port: int = 0):
+        self.worker_main = worker_main
+        self.num_workers = max(1, num_workers)
+        self.host = host
+        self.port = port
+        self.sock: Optional[socket.socket] = None
+        # pid -> (worker number, generation, start time)
+        self.workers: Dict[int, tuple] = {}
+        self.generation = 0
+        self._stopping = False
+        self._restart_requested = False
+        self._respawn_delay: Dict[int, float] = {}
+        self._respawn_at: Dict[int, float] = {}
+
+    def run(self) -> int:
+        """
+        Start the workers and supervise them until asked to stop.
+
+        Returns:
+            Process exit code
+        """
+        if not reuse_port_supported():
+            self.sock = create_listening_socket(self.host, self.port)
+            logger.info(f"SO_REUSEPORT unavailable, workers share one listening socket on port {self.port}")
+
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, self._on_restart)
+
+        print(f"Starting {self.num_workers} worker processes (supervisor pid {os.getpid()})")
+        for number in range(self.num_workers):
+            self._spawn(number)
+
+        try:
+            while not self._stopping:
+                if self._restart_requested:
+                    self._restart_requested = False
+                    self._rolling_restart()
+                self._reap()
+                self._respawn_due()
+                time.sleep(POLL_INTERVAL)
+        finally:
+            self._stop_all()
+            if self.sock is not None:
+                self.sock.close()
+        return 0
+
+    def _on_stop(self, signum, frame):
+        self._stopping = True
+
+    def _on_restart(self, signum, frame):
+        self._restart_requested = True
+
+    def _spawn(self, number: int):
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker(number)
+        self.workers[pid] = (number, self.generation, time.monotonic())
+        logger.info(f"Started worker {number} (pid {pid}, generation {self.generation})")
+
+    def _run_worker(self, number: int):
+        # Reset the supervisor's handlers; the server installs its own shutdown handling
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        # Ctrl-C reaches the whole process group; let the supervisor coordinate the shutdown
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        if hasattr(signal, "SIGHUP"):
+            signal.signal(signal.SIGHUP, signal.SIG_DFL)
+
+        exit_code = 0
+        try:
+            self.worker_main(number, self.sock)
+        except BaseException as e:
+            if not isinstance(e, SystemExit):
+                logger.exception(f"Worker {number} (pid {os.getpid()}) failed: {e}")
+                exit_code = 1
+            elif isinstance(e.code, int):
+                exit_code = e.code
+        finally:
+            # Never return into the supervisor loop from a child process
+            shutdown_logging()
+            os._exit(exit_code)
+
+    def _reap(self):
+        while self.workers:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.workers.clear()
+                return
+            if pid == 0:
+                return
+            entry = self.workers.pop(pid, None)
+            if entry is None:
+                continue
+            number, generation, started = entry
+            if generation != self.generation or self._stopping:
+                logger.info(f"Worker {number} (pid {pid}) stopped")
+                continue
+
+            exit_code = os.waitstatus_to_exitcode(status) if hasattr(os, "waitstatus_to_exitcode") else status
+            logger.warning(f"Worker {number} (pid {pid}) exited unexpectedly with status {exit_code}, restarting")
+            # Back off when a worker keeps dying right after it starts
+            if time.monotonic() - started < MIN_WORKER_LIFETIME:
+                delay = min(MAX_RESPAWN_DELAY, max(MIN_WORKER_LIFETIME, self._respawn_delay.get(number, 0) * 2))
+            else:
+                delay = 0.0
+            self._respawn_delay[number] = delay
+            self._respawn_at[number] = time.monotonic() + delay
+
+    def _respawn_due(self):
+        now = time.monotonic()
+        for number, due in list(self._respawn_at.items()):
+            if due <= now:
+                del self._respawn_at[number]
+                self._spawn(number)
+
+    def _rolling_restart(self):
+        """Replace every worker: the new generation starts accepting before the old one drains."""
+        old = [pid for pid, (_, generation, _) in self.workers.items() if generation == self.generation]
+        self.generation += 1
+        self._respawn_at.clear()
+        self._respawn_delay.clear()
+        logger.info(f"Graceful restart: starting generation {self.generation}")
+        for number in range(self.num_workers):
+            self._spawn(number)
+        for pid in old:
+            self._signal(pid, signal.SIGTERM)
+
+    def _stop_all(self):
+        self._stopping = True
+        for pid in list(self.workers):
+            self._signal(pid, signal.SIGTERM)
+
+        # Workers finish in-flight requests within their own timeout; allow a little extra
+        deadline = time.monotonic() + SHUTDOWN_TIMEOUT + 5
+        while self.workers and time.monotonic() < deadline:
+            self._reap()
+            time.sleep(POLL_INTERVAL)
+        for pid in list(self.workers):
+            logger.warning(f"Worker pid {pid} did not stop in time, killing it")
+            self._signal(pid, signal.SIGKILL)
+            try:
+                os.waitpid(pid, 0)
+            except ChildProcessError:
+                pass
+        self.workers.clear()
+
+    def _signal(self, pid: int, signum: int):
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
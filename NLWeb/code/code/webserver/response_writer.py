@@ -0,0 +1,131 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""
+Buffered writer for streamed response bodies.
+
+Streaming handlers emit many small messages (one SSE event per result). Writing
+and draining each one separately costs a syscall and an event loop round-trip
+per message, so this writer collects them and flushes once the flush window
+has passed or enough bytes are pending, framing each flush as one HTTP chunk.
+It only waits for the socket to drain when the transport's buffer is above a
+high-water mark.
+
+Configuration (environment variables):
+    NLWEB_STREAM_FLUSH_WINDOW: seconds a message may wait to be coalesced (default 0.01, 0 flushes every write)
+    NLWEB_STREAM_FLUSH_BYTES: pending bytes that trigger an immediate flush (default 16384)
+    NLWEB_STREAM_HIGH_WATER: transport buffer size above which writes wait for a drain (default 65536)
+
+WARNING: This code is under development and may undergo changes in future releases.
+Backwards compatibility is not guaranteed at this time.
+"""
+
+import asyncio
+import os
+from typing import List, Optional
+
+DEFAULT_FLUSH_WINDOW = 0.01
+DEFAULT_FLUSH_BYTES = 16384
+DEFAULT_HIGH_WATER = 65536
+
+
+def _env_number(name, default, cast):
+    try:
+        return cast(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+FLUSH_WINDOW = max(0.0, _env_number("NLWEB_STREAM_FLUSH_WINDOW", DEFAULT_FLUSH_WINDOW, float))
+FLUSH_BYTES = max(1, _env_number("NLWEB_STREAM_FLUSH_BYTES", DEFAULT_FLUSH_BYTES, int))
+HIGH_WATER = max(0, _env_number("NLWEB_STREAM_HIGH_WATER", DEFAULT_HIGH_WATER, int))
+
+
+class ResponseWriter:
+    """
+    Coalesces body writes for one response and frames them.
+
+    Args:
+        writer: asyncio StreamWriter of the connection
+        chunked: Whether to frame flushes with chunked transfer encoding
+        head: Status line and headers, sent with the first flush
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter, chunked: bool, head: bytes = b""):
+        self.writer = writer
+        self.chunked = chunked
+        self.ended = False
+        self._head = head
+        self._pending: List[bytes] = []
+        self._pending_size = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def send(self, data: bytes, end_response: bool = False):
+        """
+        Queue body data, flushing when the window closes, the size threshold is
+        reached or the response ends.
+
+        Raises:
+            ConnectionResetError: if the client has gone away
+        """
+        if self.ended:
+            return
+        if self.writer.is_closing():
+            raise ConnectionResetError("Connection closed by client")
+        if data:
+            self._pending.append(data)
+            self._pending_size += len(data)
+
+        if end_response:
+            self._flush(end_response=True)
+        elif self._pending_size >= FLUSH_BYTES or FLUSH_WINDOW == 0:
+            self._flush()
+        elif self._timer is None and self._pending:
+            self._timer = asyncio.get_running_loop().call_later(FLUSH_WINDOW, self._flush)
+
+        # Only apply backpressure once the transport has a real backlog
+        transport = self.writer.transport
+        if transport is not None and transport.get_write_buffer_size() > HIGH_WATER:
+            await self.writer.drain()
+
+    def flush(self):
+        """Write out the headers and any pending data now."""
+        if not self.ended:
+            self._flush()
+
+    async def finish(self):
+        """End the response: flush pending data, send the last chunk and drain."""
+        if not self.ended:
+            self._flush(end_response=True)
+        await self.writer.drain()
+
+    def cancel(self):
+        """Drop pending data without writing it, e.g. when the connection is lost."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending = []
+        self._pending_size = 0
+        self.ended = True
+
+    def _flush(self, end_response: bool = False):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        data = b"".join(self._pending)
+        self._pending = []
+        self._pending_size = 0
+
+        if self.chunked:
+            out = b"%x\r\n%s\r\n" % (len(data), data) if data else b""
+            if end_response:
+                out += b"0\r\n\r\n"
+        else:
+            out = data
+        if self._head:
+            out = self._head + out
+            self._head = b""
+        if end_response:
+            self.ended = True
+        if out and not self.writer.is_closing():
+            self.writer.write(out)
@@ -0,0 +1,291 @@
+# Copyright (c) 2025 Microsoft Corporation.
+# Licensed under the MIT License
+
+"""
+Route table for the web server.
+
+Routes are matched on the request path by exact match first, then by the
+longest matching prefix, then by suffix (e.g. a file extension). Prefixes are
+segment aware: "/mcp" matches "/mcp" and "/mcp/health" but not "/mcpx", while
+a prefix ending in "/" such as "/static/" matches anything below it. Each route
+lists the methods it accepts and an optional chain of middleware, composed once
+when the route is added.
+
+Middleware has the signature `async def middleware(request, call_next)` and is
+used for cross-cutting concerns such as timing, response caching and
+concurrency limits.
+
+WARNING: This code is under development and may undergo changes in future releases.
+Backwards compatibility is not guaranteed at this time.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+MATCH_EXACT = "exact"
+MATCH_PREFIX = "prefix"
+MATCH_SUFFIX = "suffix"
+
+
+@dataclass
+class Request:
+    """One HTTP request as seen by route handlers and middleware."""
+    method: str
+    path: str
+    headers: Dict[str, str]
+    query_params: Dict[str, List[str]]
+    body: Optional[bytes]
+    send_response: Callable
+    send_chunk: Callable
+    route: Optional["Route"] = None
+
+
+Handler = Callable[[Request], Awaitable[None]]
+Middleware = Callable[[Request, Handler], Awaitable[None]]
+
+
+def _bind(middleware: Middleware, call_next: Handler) -> Handler:
+    async def call(request: Request):
+        await middleware(request, call_next)
+    return call
+
+
+class Route:
+    """
+    A handler registered for a path pattern.
+
+    Args:
+        pattern: Path, path prefix or path suffix to match
+        handler: Coroutine function called with the Request
+        methods: HTTP methods the route accepts
+        match: MATCH_EXACT, MATCH_PREFIX or MATCH_SUFFIX
+        middleware: Middleware wrapped around the handler, outermost first
+        name: Name used in stats; defaults to the pattern
+    """
+
+    def __init__(self, pattern: str, handler: Handler, methods: Sequence[str] = ("GET",),
+                 match: str = MATCH_EXACT, middleware: Sequence[Middleware] = (), name: Optional[str] = None):
+        if match not in (MATCH_EXACT, MATCH_PREFIX, MATCH_SUFFIX):
+            raise ValueError(f"Unknown match type: {match}")
+        self.pattern = pattern
+        self.handler = handler
+        self.methods = frozenset(method.upper() for method in methods)
+        self.match = match
+        self.name = name or pattern
+        self.allow = ", ".join(sorted(self.methods | {"OPTIONS"}))
+        self.stats = {"requests": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0}
+
+        call = handler
+        for mw in reversed(list(middleware)):
+            call = _bind(mw, call)
+        self._call = call
+
+    def matches(self, path: str) -> bool:
+        if self.match == MATCH_EXACT:
+            return path == self.pattern
+        if self.match == MATCH_SUFFIX:
+            return path.endswith(self.pattern)
+        if self.pattern.endswith("/"):
+            return path.startswith(self.pattern)
+        return path == self.pattern or path.startswith(self.pattern + "/")
+
+    async def __call__(self, request: Request):
+        await self._call(request)
+
+
+class RouteTable:
+    """
+    Dispatches requests to routes.
+
+    Args:
+        middleware: Middleware applied to every route, outside the route's own middleware
+    """
+
+    def __init__(self, middleware: Sequence[Middleware] = ()):
+        self.middleware = list(middleware)
+        self._exact: Dict[str, Route] = {}
+        self._prefixes: List[Route] = []
+        self._suffixes: List[Route] = []
+
+    def add(self, pattern: str, handler: Handler, methods: Sequence[str] = ("GET",),
+            match: str = MATCH_EXACT, middleware: Sequence[Middleware] = (), name: Optional[str] = None) -> Route:
+        """
+        Register a route. Arguments are as for Route.
+
+        Returns:
+            The new Route
+        """
+        route = Route(pattern, handler, methods, match, self.middleware + list(middleware), name)
+        if match == MATCH_EXACT:
+            if pattern in self._exact:
+                raise ValueError(f"Route already registered: {pattern}")
+            self._exact[pattern] = route
+        elif match == MATCH_PREFIX:
+            self._prefixes.append(route)
+            # Longest prefix wins
+            self._prefixes.sort(key=lambda r: len(r.pattern), reverse=True)
+        else:
+            self._suffixes.append(route)
+            self._suffixes.sort(key=lambda r: len(r.pattern), reverse=True)
+        return route
+
+    def resolve(self, path: str) -> Optional[Route]:
+        """Find the route for a path, or None."""
+        route = self._exact.get(path)
+        if route is not None:
+            return route
+        for route in self._prefixes:
+            if route.matches(path):
+                return route
+        for route in self._suffixes:
+            if route.matches(path):
+                return route
+        return None
+
+    async def dispatch(self, request: Request) -> bool:
+        """
+        Route a request. Methods a route does not accept get 405, and OPTIONS
+        (e.g. a CORS preflight) gets 204 with the allowed methods.
+
+        Returns:
+            False if no route matches the path, True otherwise
+        """
+        route = self.resolve(request.path)
+        if route is None:
+            return False
+        request.route = route
+
+        method = request.method.upper()
+        if method not in route.methods:
+            if method == "OPTIONS":
+                await request.send_response(204, {'Allow': route.allow}, end_response=True)
+            else:
+                await request.send_response(405, {'Content-Type': 'text/plain', 'Allow': route.allow})
+                await request.send_chunk(f"Method {request.method} not allowed".encode('utf-8'), end_response=True)
+            return True
+
+        await route(request)
+        return True
+
+    def routes(self) -> List[Route]:
+        return list(self._exact.values()) + self._prefixes + self._suffixes
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-route request counts, errors and latency recorded by timing_middleware."""
+        result = {}
+        for route in self.routes():
+            stats = route.stats
+            if not stats["requests"]:
+                continue
+            result[route.name] = {
+                "requests": stats["requests"],
+                "errors": stats["errors"],
+                "avg_ms": round(stats["total_ms"] / stats["requests"], 2),
+                "max_ms": round(stats["max_ms"], 2),
+            }
+        return result
+
+
+async def timing_middleware(request: Request, call_next: Handler):
+    """Record request count, errors and handler latency on the route."""
+    start = time.perf_counter()
+    failed = False
+    try:
+        await call_next(request)
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        stats = request.route.stats
+        stats["requests"] += 1
+        stats["total_ms"] += elapsed_ms
+        if elapsed_ms > stats["max_ms"]:
+            stats["max_ms"] = elapsed_ms
+        if failed:
+            stats["errors"] += 1
+
+
+def response_cache(ttl: float, max_entries: int = 256) -> Middleware:
+    """
+    Cache complete 200 responses to requests without a body, keyed by method,
+    path and query parameters.
+
+    Args:
+        ttl: Seconds a response stays cached; 0 or less disables caching
+        max_entries: Maximum number of cached responses, least recently used evicted first
+
+    Returns:
+        Middleware
+    """
+    entries: "OrderedDict[Tuple, Tuple[float, int, Dict[str, str], List[Any]]]" = OrderedDict()
+
+    async def middleware(request: Request, call_next: Handler):
+        if ttl <= 0 or request.body:
+            await call_next(request)
+            return
+
+        key = (request.method, request.path,
+               tuple(sorted((k, tuple(v) if isinstance(v, list) else v) for k, v in request.query_params.items())))
+        cached = entries.get(key)
+        if cached is not None:
+            expires, status, headers, chunks = cached
+            if expires > time.monotonic():
+                entries.move_to_end(key)
+                await request.send_response(status, dict(headers))
+                for i, chunk in enumerate(chunks):
+                    await request.send_chunk(chunk, end_response=i == len(chunks) - 1)
+                return
+            del entries[key]
+
+        response = {"status": None, "headers": None, "chunks": [], "ended": False}
+        send_response, send_chunk = request.send_response, request.send_chunk
+
+        async def capture_response(status, headers, end_response=False):
+            if response["status"] is None:
+                response["status"], response["headers"] = status, dict(headers)
+            await send_response(status, headers, end_response=end_response)
+
+        async def capture_chunk(chunk, end_response=False):
+            response["chunks"].append(chunk)
+            response["ended"] = response["ended"] or end_response
+            await send_chunk(chunk, end_response=end_response)
+
+        request.send_response, request.send_chunk = capture_response, capture_chunk
+        try:
+            await call_next(request)
+        finally:
+            request.send_response, request.send_chunk = send_response, send_chunk
+
+        if response["status"] == 200 and response["ended"]:
+            entries[key] = (time.monotonic() + ttl, 200, response["headers"], response["chunks"])
+            entries.move_to_end(key)
+            while len(entries) > max_entries:
+                entries.popitem(last=False)
+
+    return middleware
+
+
+def concurrency_limit(limit: int) -> Middleware:
+    """
+    Limit how many requests run the route at once; further requests wait their turn.
+
+    Args:
+        limit: Maximum concurrent requests; 0 or less means unlimited
+
+    Returns:
+        Middleware
+    """
+    semaphore = asyncio.Semaphore(limit) if limit > 0 else None
+
+    async def middleware(request: Request, call_next: Handler):
+        if semaphore is None:
+            await call_next(request)
+            return
+        async with semaphore:
+            await call_next(request)
+
+    return middleware